@@ -1,10 +1,57 @@
+from django.conf import settings
 from django.contrib import admin
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+from import_export.admin import ImportExportModelAdmin
+from import_export.formats.base_formats import CSV, JSON, XLSX
 
-from .models import Package, Hotel
+from search.admin import SearchVectorAdminMixin
+
+from .imports import queue_import
+from .models import Hotel, ImportJob, Package
+from .pagination import EstimatedCountPaginator
+from .resources import HotelResource, PackageResource
+
+
+class EstimatedCountAdminMixin:
+    """Estimated counts on large changelists, and no second COUNT(*) of the unfiltered table."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class BackgroundImportMixin:
+    """Hands uploads over IMPORT_BACKGROUND_BYTES to a worker, skipping the in-request dry run."""
+
+    # XLSX needs openpyxl; leave it off the form rather than fail when it is missing.
+    formats = [input_format for input_format in (CSV, XLSX, JSON) if input_format.is_available()]
+
+    def import_action(self, request, **kwargs):
+        if request.method == "POST" and self.has_import_permission(request):
+            form = self.create_import_form(request)
+            if form.is_valid() and form.cleaned_data["import_file"].size > settings.IMPORT_BACKGROUND_BYTES:
+                return self.queue_import_job(request, form)
+        return super().import_action(request, **kwargs)
+
+    def queue_import_job(self, request, form):
+        import_file = form.cleaned_data["import_file"]
+        input_format = self.get_import_formats()[int(form.cleaned_data["format"])]
+        job = queue_import(
+            self.model._meta.model_name,
+            import_file.name,
+            input_format.__name__.lower(),
+            b"".join(import_file.chunks()),
+            user=request.user,
+        )
+        self.message_user(request, f"{import_file.name} is being imported in the background.")
+        return HttpResponseRedirect(reverse("admin:adminside_importjob_change", args=[job.pk]))
 
 
 @admin.register(Package)
-class PackageAdmin(admin.ModelAdmin):
+class PackageAdmin(
+    EstimatedCountAdminMixin, BackgroundImportMixin, SearchVectorAdminMixin, ImportExportModelAdmin
+):
+    resource_classes = [PackageResource]
     list_display = ("title", "slug", "category", "location", "price", "active", "created_at")
     list_filter = ("category", "active", "created_at")
     search_fields = ("title", "location", "category", "slug")
@@ -12,8 +59,36 @@ class PackageAdmin(admin.ModelAdmin):
 
 
 @admin.register(Hotel)
-class HotelAdmin(admin.ModelAdmin):
+class HotelAdmin(
+    EstimatedCountAdminMixin, BackgroundImportMixin, SearchVectorAdminMixin, ImportExportModelAdmin
+):
+    resource_classes = [HotelResource]
     list_display = ("name", "slug", "location", "rating", "price_per_night", "active", "created_at")
     list_filter = ("rating", "active", "created_at")
     search_fields = ("name", "location", "slug")
     prepopulated_fields = {"slug": ("name",)}
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ("file_name", "resource", "status", "progress_display", "created_by", "created_at")
+    list_filter = ("status", "resource", "created_at")
+    search_fields = ("file_name",)
+    readonly_fields = (
+        "resource", "file_name", "input_format", "status", "progress_display", "new_rows",
+        "updated_rows", "skipped_rows", "errors", "created_by", "created_at", "started_at",
+        "finished_at",
+    )
+    exclude = ("total_rows", "processed_rows")
+
+    @admin.display(description="Progress")
+    def progress_display(self, obj):
+        if not obj.total_rows:
+            return "-"
+        return f"{obj.progress} / {obj.total_rows} rows ({obj.progress * 100 // obj.total_rows}%)"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
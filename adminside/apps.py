@@ -5,3 +5,6 @@ class AdminsideConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'adminside'
     verbose_name = "Travel Content"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+
+def listing_version_key(name):
+    return f"listing-version:{name}"
+
+
+def get_listing_version(name):
+    key = listing_version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+async def aget_listing_version(name):
+    key = listing_version_key(name)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, 1, None)
+        version = await cache.aget(key, 1)
+    return version
+
+
+def bump_listing_version(name):
+    key = listing_version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+        return 2
+
+
+def listing_cache_context(name):
+    return {
+        "listing_version": get_listing_version(name),
+        "listing_cache_timeout": getattr(settings, "LISTING_CACHE_TIMEOUT", 300),
+    }
+
+
+async def alisting_cache_context(name):
+    return {
+        "listing_version": await aget_listing_version(name),
+        "listing_cache_timeout": getattr(settings, "LISTING_CACHE_TIMEOUT", 300),
+    }
+
+
+async def aload_listing_page(page, fragment_name, *vary_on):
+    """
+    Fetch a KeysetPage with the async ORM, unless the template fragment that
+    renders it is already cached (then the page is never evaluated).
+    """
+    key = make_template_fragment_key(fragment_name, [*vary_on, page.cache_key])
+    if not await cache.ahas_key(key):
+        await page.aload()
+    return page
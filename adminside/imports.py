@@ -0,0 +1,138 @@
+"""
+Background catalogue imports.
+
+The uploaded file is read lazily and handed to the resource in datasets of
+``IMPORT_BATCH_SIZE`` rows, so slug lookups and model instances stay bounded
+by the batch rather than the file. Every batch runs inside one outer
+transaction: an error anywhere rolls the whole file back.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+
+import tablib
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ImportJob, import_progress_key
+from .resources import RESOURCES
+
+MAX_REPORTED_ERRORS = 50
+PROGRESS_TIMEOUT = 60 * 60 * 24
+
+
+class ImportFailed(Exception):
+    pass
+
+
+def read_rows(data, input_format):
+    """Header row plus a lazy iterator over the remaining rows."""
+    if input_format == "csv":
+        reader = csv.reader(io.StringIO(bytes(data).decode("utf-8-sig")))
+        return next(reader, []), reader
+    if input_format == "xlsx":
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        return list(next(rows, ())), rows
+    if input_format == "json":
+        records = json.loads(bytes(data))
+        headers = list(records[0]) if records else []
+        return headers, ([record.get(header) for header in headers] for record in records)
+    raise ImportFailed(f"Unsupported import format: {input_format}")
+
+
+def count_rows(data, input_format):
+    _, rows = read_rows(data, input_format)
+    return sum(1 for row in rows if any(value not in (None, "") for value in row))
+
+
+def iter_datasets(data, input_format, size):
+    headers, rows = read_rows(data, input_format)
+    width = len(headers)
+    rows = (
+        (list(row) + [None] * width)[:width]
+        for row in rows
+        if any(value not in (None, "") for value in row)
+    )
+    while batch := list(islice(rows, size)):
+        yield tablib.Dataset(*batch, headers=headers)
+
+
+def result_errors(result, offset):
+    # Bulk writes fail per batch, not per row, and land in base_errors.
+    errors = [f"{error.error.__class__.__name__}: {error.error}" for error in result.base_errors]
+    errors += [
+        f"Row {number + offset}: {error.error}"
+        for number, row_errors in result.row_errors()
+        for error in row_errors
+    ]
+    errors += [
+        f"Row {row.number + offset}: {'; '.join(row.error.messages)}" for row in result.invalid_rows
+    ]
+    return errors
+
+
+def report_progress(job, processed):
+    cache.set(import_progress_key(job.pk), processed, PROGRESS_TIMEOUT)
+
+
+def run_import(job, batch_size=None):
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    resource = RESOURCES[job.resource]()
+    totals = {"new": 0, "update": 0, "skip": 0}
+
+    job.status = "running"
+    job.started_at = timezone.now()
+    job.total_rows = count_rows(job.data, job.input_format)
+    job.save(update_fields=["status", "started_at", "total_rows"])
+
+    processed = 0
+    try:
+        with transaction.atomic():
+            for dataset in iter_datasets(job.data, job.input_format, batch_size):
+                result = resource.import_data(dataset, dry_run=False, user=job.created_by)
+                errors = result_errors(result, processed)
+                if errors:
+                    raise ImportFailed(*errors[:MAX_REPORTED_ERRORS])
+                for key in totals:
+                    totals[key] += result.totals[key]
+                processed += len(dataset)
+                report_progress(job, processed)
+    except Exception as exc:
+        job.status = "failed"
+        if isinstance(exc, ImportFailed):
+            job.errors = list(exc.args)
+        else:
+            job.errors = [f"{exc.__class__.__name__}: {exc}"]
+        job.processed_rows = 0
+    else:
+        job.status = "done"
+        job.processed_rows = processed
+        job.new_rows = totals["new"]
+        job.updated_rows = totals["update"]
+        job.skipped_rows = totals["skip"]
+        job.data = b""
+    job.finished_at = timezone.now()
+    job.save()
+    cache.delete(import_progress_key(job.pk))
+    return job.status == "done"
+
+
+def queue_import(resource, file_name, input_format, data, user=None):
+    from .tasks import run_import_job
+
+    job = ImportJob.objects.create(
+        resource=resource,
+        file_name=file_name,
+        input_format=input_format,
+        data=data,
+        created_by=user,
+    )
+    transaction.on_commit(lambda: run_import_job.delay(job.pk))
+    return job
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from adminside.models import Package
+from adminside.richtext import recompile_rich_text
+from blog.models import Category, Post
+
+RICH_TEXT_MODELS = (Package, Category, Post)
+
+
+class Command(BaseCommand):
+    help = "Rebuild stored rich-text HTML whose source or pipeline version changed"
+
+    def handle(self, *args, **options):
+        for model in RICH_TEXT_MODELS:
+            count = recompile_rich_text(model.objects.all(), model.RICH_TEXT_FIELDS)
+            self.stdout.write(self.style.SUCCESS(f"{model._meta.label}: recompiled {count} row(s)."))
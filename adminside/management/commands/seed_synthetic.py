@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from adminside import synthetic
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert a deterministic synthetic catalogue for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--packages", type=int, default=0)
+        parser.add_argument("--hotels", type=int, default=0)
+        parser.add_argument("--posts", type=int, default=0)
+        parser.add_argument("--categories", type=int, default=12, help="Blog categories used by --posts")
+        parser.add_argument("--tags", type=int, default=200, help="Tag pool used by --posts")
+        parser.add_argument("--tags-per-post", type=int, default=3)
+        parser.add_argument(
+            "--inquiries",
+            type=int,
+            default=0,
+            help="Inquiries spread evenly over the contact, MICE, student and NGO models",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--clear", action="store_true", help="Delete existing synthetic rows first")
+
+    def handle(self, *args, **options):
+        seed = options["seed"]
+        batch_size = options["batch_size"]
+
+        if options["clear"]:
+            self.stdout.write(f"Deleted {synthetic.clear_synthetic()} synthetic row(s).")
+
+        steps = [
+            ("packages", lambda count: synthetic.seed_packages(count, seed, batch_size)),
+            ("hotels", lambda count: synthetic.seed_hotels(count, seed, batch_size)),
+            (
+                "posts",
+                lambda count: synthetic.seed_posts(
+                    count,
+                    seed,
+                    batch_size,
+                    categories=options["categories"],
+                    tags=options["tags"],
+                    tags_per_post=options["tags_per_post"],
+                ),
+            ),
+            ("inquiries", lambda count: synthetic.seed_inquiries(count, seed, batch_size)),
+        ]
+        for name, seed_rows in steps:
+            count = options[name]
+            if not count:
+                continue
+            started = time.perf_counter()
+            created = seed_rows(count)
+            elapsed = time.perf_counter() - started
+            rate = created / elapsed if elapsed else 0
+            self.stdout.write(
+                self.style.SUCCESS(f"{name}: created {created} of {count} in {elapsed:.1f}s ({rate:.0f}/s)")
+            )
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from .pagecache import (
+    apply_cache_headers,
+    get_cached_page,
+    get_policy,
+    is_anonymous_request,
+    is_cacheable_response,
+    page_cache_key,
+    store_page,
+)
+
+
+class PageCacheMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        policy = get_policy(request)
+        if policy is None:
+            return response
+
+        key = getattr(request, "_page_cache_key", None)
+        if key and request.method == "GET" and is_cacheable_response(response):
+            store_page(key, response)
+        return apply_cache_headers(response, policy)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        policy = get_policy(request)
+        if policy is None or not settings.PAGE_CACHE_ENABLED or not is_anonymous_request(request):
+            return None
+
+        key = page_cache_key(request, policy)
+        response = get_cached_page(key)
+        if response is None:
+            request._page_cache_key = key
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-18 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminside', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['active', '-created_at', '-id'], name='hotel_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='package',
+            index=models.Index(fields=['active', '-created_at', '-id'], name='package_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.14 on 2026-10-18 11:48
+
+import operator
+from functools import reduce
+
+import django.contrib.postgres.search
+import search.indexes
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Func, TextField, Value
+
+
+def search_vector(weights):
+    # Frozen copy of search.services.build_search_vector as of this migration.
+    vectors = [
+        SearchVector(
+            Func(F(field), Value('<[^>]*>'), Value(' '), Value('g'), function='regexp_replace', output_field=TextField()),
+            weight=weight,
+            config='english',
+        )
+        for field, weight in weights.items()
+    ]
+    return reduce(operator.add, vectors)
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    alias = schema_editor.connection.alias
+    Package = apps.get_model('adminside', 'Package')
+    Hotel = apps.get_model('adminside', 'Hotel')
+    Package.objects.using(alias).update(
+        search_vector=search_vector(
+            {'title': 'A', 'location': 'B', 'category': 'B', 'description': 'C'}
+        )
+    )
+    Hotel.objects.using(alias).update(
+        search_vector=search_vector({'name': 'A', 'location': 'B'})
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminside', '0002_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hotel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=search.indexes.SearchVectorIndex(fields=['search_vector'], name='hotel_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='package',
+            index=search.indexes.SearchVectorIndex(fields=['search_vector'], name='package_search_idx'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:20
+
+import html
+import re
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# Frozen copy of adminside.text.make_excerpt as of this migration.
+EXCERPT_WORDS = 30
+WHITESPACE_RE = re.compile(r'\s+')
+BLOCK_BOUNDARY_RE = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6]|/tr|/blockquote)\b[^>]*>', re.IGNORECASE)
+
+
+def make_excerpt(rich_html):
+    if not rich_html:
+        return ''
+    text = strip_tags(BLOCK_BOUNDARY_RE.sub(' ', rich_html))
+    text = WHITESPACE_RE.sub(' ', html.unescape(text)).strip()
+    return Truncator(text).words(EXCERPT_WORDS, truncate='…')
+
+
+def backfill_plain_excerpts(apps, schema_editor):
+    Package = apps.get_model('adminside', 'Package')
+    packages = Package.objects.using(schema_editor.connection.alias).only('pk', 'description')
+    batch = []
+    for package in packages.iterator(chunk_size=500):
+        package.plain_excerpt = make_excerpt(package.description)
+        batch.append(package)
+        if len(batch) >= 500:
+            Package.objects.bulk_update(batch, ['plain_excerpt'])
+            batch = []
+    Package.objects.bulk_update(batch, ['plain_excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminside', '0003_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='package',
+            name='plain_excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_plain_excerpts, migrations.RunPython.noop),
+    ]
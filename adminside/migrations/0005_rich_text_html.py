@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+from adminside.richtext import recompile_rich_text
+
+
+def compile_descriptions(apps, schema_editor):
+    Package = apps.get_model('adminside', 'Package')
+    recompile_rich_text(
+        Package.objects.using(schema_editor.connection.alias),
+        {'description': 'description_html'},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminside', '0004_plain_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='package',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='rich_text_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(compile_descriptions, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,20 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.core.cache import cache
 from django.db import models
 from django.utils.text import slugify
 from django_ckeditor_5.fields import CKEditor5Field
 
+from search.indexes import SearchVectorIndex
+
+from .richtext import compile_rich_text_fields
+from .text import make_excerpt
+
 
 class Package(models.Model):
+    SEARCH_WEIGHTS = {"title": "A", "location": "B", "category": "B", "description": "C"}
+    RICH_TEXT_FIELDS = {"description": "description_html"}
+
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True)
     duration = models.CharField(max_length=100, blank=True, default="")
@@ -12,18 +23,28 @@ class Package(models.Model):
     category = models.CharField(max_length=100, blank=True, default="")
     image_url = models.URLField(blank=True, default="")
     description = CKEditor5Field(config_name="default", blank=True, default="")
+    plain_excerpt = models.TextField(blank=True, default="", editable=False)
+    description_html = models.TextField(blank=True, default="", editable=False)
+    rich_text_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     features = models.JSONField(default=list, blank=True)
     itinerary = models.JSONField(default=list, blank=True)
     active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["active", "-created_at", "-id"], name="package_active_created_idx"),
+            SearchVectorIndex(fields=["search_vector"], name="package_search_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)[:220]
+        self.plain_excerpt = make_excerpt(self.description)
+        compile_rich_text_fields(self)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -31,6 +52,8 @@ class Package(models.Model):
 
 
 class Hotel(models.Model):
+    SEARCH_WEIGHTS = {"name": "A", "location": "B"}
+
     name = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True)
     rating = models.PositiveSmallIntegerField(default=0)
@@ -41,9 +64,14 @@ class Hotel(models.Model):
     active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["active", "-created_at", "-id"], name="hotel_active_created_idx"),
+            SearchVectorIndex(fields=["search_vector"], name="hotel_search_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -52,3 +80,52 @@ class Hotel(models.Model):
 
     def __str__(self):
         return self.name
+
+
+IMPORT_STATUS = (
+    ("pending", "Pending"),
+    ("running", "Running"),
+    ("done", "Done"),
+    ("failed", "Failed"),
+)
+
+
+def import_progress_key(job_id):
+    return f"import-job:{job_id}:progress"
+
+
+class ImportJob(models.Model):
+    """A catalogue upload too large to import inside the admin request."""
+
+    resource = models.CharField(max_length=50)
+    file_name = models.CharField(max_length=255)
+    input_format = models.CharField(max_length=10)
+    # Kept in the database so the worker does not need the web service's disk.
+    data = models.BinaryField(editable=False)
+    status = models.CharField(choices=IMPORT_STATUS, max_length=20, default="pending")
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    new_rows = models.PositiveIntegerField(default=0)
+    updated_rows = models.PositiveIntegerField(default=0)
+    skipped_rows = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def progress(self):
+        # The import runs in one transaction, so while it does the row is stale
+        # and the worker reports through the cache instead.
+        if self.status == "running":
+            return cache.get(import_progress_key(self.pk), self.processed_rows)
+        return self.processed_rows
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
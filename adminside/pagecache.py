@@ -0,0 +1,119 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .cache import get_listing_version
+
+# Per-view HTTP caching policy, keyed by URL name. "depends" lists the content
+# versions (see adminside.cache) that invalidate the stored page, and "params"
+# the only query parameters that change what the view renders; anything else
+# (utm_* tags and the like) is ignored so it shares the cached copy.
+PAGE_POLICIES = {
+    "home": {
+        "max_age": 60,
+        "s_maxage": 300,
+        "stale_while_revalidate": 60,
+        "depends": ("posts",),
+        "params": (),
+    },
+    "about": {
+        "max_age": 300,
+        "s_maxage": 3600,
+        "stale_while_revalidate": 300,
+        "depends": (),
+        "params": (),
+    },
+    "packages": {
+        "max_age": 60,
+        "s_maxage": 300,
+        "stale_while_revalidate": 60,
+        "depends": ("packages",),
+        "params": ("after", "before"),
+    },
+    "package-detail": {
+        "max_age": 60,
+        "s_maxage": 300,
+        "stale_while_revalidate": 60,
+        "depends": ("packages",),
+        "params": (),
+    },
+    "hotels": {
+        "max_age": 60,
+        "s_maxage": 300,
+        "stale_while_revalidate": 60,
+        "depends": ("hotels",),
+        "params": ("after", "before"),
+    },
+}
+
+PAGE_VARY = ("Accept-Encoding",)
+
+
+def get_policy(request):
+    match = request.resolver_match
+    if match is None:
+        return None
+    return PAGE_POLICIES.get(match.url_name)
+
+
+def is_anonymous_request(request):
+    return (
+        request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def is_cacheable_response(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not response.has_header("Vary")
+    )
+
+
+def page_cache_key(request, policy):
+    params = sorted(
+        (name, value)
+        for name in policy["params"]
+        for value in request.GET.getlist(name)
+    )
+    versions = [f"{name}={get_listing_version(name)}" for name in policy["depends"]]
+    raw = "|".join([settings.PAGE_CACHE_BUILD, request.path, repr(params), *versions])
+    return f"page:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def get_cached_page(key):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    response["X-Page-Cache"] = "hit"
+    return response
+
+
+def store_page(key, response):
+    cache.set(
+        key,
+        {"content": response.content, "content_type": response["Content-Type"]},
+        settings.PAGE_CACHE_TIMEOUT,
+    )
+    response["X-Page-Cache"] = "miss"
+
+
+def apply_cache_headers(response, policy):
+    if response.cookies or response.status_code != 200:
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=policy["max_age"],
+        s_maxage=policy["s_maxage"],
+        stale_while_revalidate=policy["stale_while_revalidate"],
+    )
+    patch_vary_headers(response, PAGE_VARY)
+    return response
@@ -0,0 +1,179 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+def encode_cursor_value(position, pk):
+    raw = f"{position.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def encode_cursor(obj, field):
+    return encode_cursor_value(getattr(obj, field), obj.pk)
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, pk = base64.urlsafe_b64decode(padded.encode()).decode().rsplit("|", 1)
+        position = parse_datetime(value)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if position is None:
+        return None
+    return position, pk
+
+
+class KeysetPage:
+    def __init__(self, queryset, per_page, after=None, before=None, field="created_at"):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.after = decode_cursor(after)
+        self.before = None if self.after else decode_cursor(before)
+
+    @property
+    def cache_key(self):
+        if self.after:
+            return f"after:{encode_cursor_value(*self.after)}"
+        if self.before:
+            return f"before:{encode_cursor_value(*self.before)}"
+        return "first"
+
+    def _window_queryset(self):
+        field = self.field
+        if self.before:
+            position, pk = self.before
+            queryset = self.queryset.filter(
+                Q(**{f"{field}__gt": position}) | Q(**{field: position, "pk__gt": pk})
+            ).order_by(field, "pk")
+            return queryset[: self.per_page + 1]
+
+        queryset = self.queryset
+        if self.after:
+            position, pk = self.after
+            queryset = queryset.filter(
+                Q(**{f"{field}__lt": position}) | Q(**{field: position, "pk__lt": pk})
+            )
+        return queryset.order_by(f"-{field}", "-pk")[: self.per_page + 1]
+
+    def _build_window(self, rows):
+        if self.before:
+            return list(reversed(rows[: self.per_page])), True, len(rows) > self.per_page
+        return rows[: self.per_page], len(rows) > self.per_page, self.after is not None
+
+    @cached_property
+    def _window(self):
+        return self._build_window(list(self._window_queryset()))
+
+    async def aload(self):
+        """Fetch the window with the async ORM; the sync properties then reuse it."""
+        if "_window" not in self.__dict__:
+            self._window = self._build_window([row async for row in self._window_queryset()])
+        return self
+
+    @property
+    def object_list(self):
+        return self._window[0]
+
+    @property
+    def has_next(self):
+        return self._window[1] and bool(self.object_list)
+
+    @property
+    def has_previous(self):
+        return self._window[2] and bool(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return ""
+        return encode_cursor(self.object_list[-1], self.field)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return ""
+        return encode_cursor(self.object_list[0], self.field)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def estimate_count(queryset):
+    """
+    The PostgreSQL planner's row estimate for ``queryset``: pg_class.reltuples
+    for a whole table, the EXPLAIN plan's rows once filters apply. None on
+    other databases, where there is no cheap estimate to use.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    if not queryset.query.where and not queryset.query.distinct:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # -1 until the table has been vacuumed or analyzed once.
+        if row and row[0] >= 0:
+            return row[0]
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's estimate once it passes
+    ADMIN_EXACT_COUNT_LIMIT, instead of running COUNT(*) over a large table.
+
+    An estimate can be short of the real count, so page numbers past the
+    estimated last page are still served rather than rejected.
+    """
+
+    @cached_property
+    def estimated(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < settings.ADMIN_EXACT_COUNT_LIMIT:
+            return None
+        return estimate
+
+    @cached_property
+    def count(self):
+        if self.estimated is not None:
+            return self.estimated
+        return super().count
+
+    def validate_number(self, number):
+        if self.estimated is None:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        if self.estimated is None:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
@@ -0,0 +1,137 @@
+"""
+Import/export resources for the catalogue.
+
+Rows are upserted on ``slug``: one ``slug__in`` query resolves every row of a
+dataset, and new and changed rows are written with ``bulk_create`` and
+``bulk_update`` in ``IMPORT_BATCH_SIZE`` batches. Bulk writes skip ``save()``
+and the post_save receivers, so the derived columns are filled in
+``before_save_instance`` and the search vector, image and listing-cache
+refreshes run once per dataset in ``after_import``.
+"""
+
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.text import slugify
+from import_export import fields, resources, widgets
+from import_export.instance_loaders import CachedInstanceLoader
+
+from images.services import register_image
+from search.services import build_search_vector, uses_postgres_search
+
+from .cache import bump_listing_version
+from .models import Hotel, Package
+from .richtext import compile_rich_text_fields
+from .text import make_excerpt
+
+
+class ListWidget(widgets.Widget):
+    """JSON lists, or plain comma-separated values as suppliers tend to send them."""
+
+    def clean(self, value, row=None, **kwargs):
+        if isinstance(value, list):
+            return value
+        if value is None or not str(value).strip():
+            return []
+        try:
+            parsed = json.loads(value)
+        except json.JSONDecodeError:
+            return [item.strip() for item in str(value).split(",") if item.strip()]
+        return parsed if isinstance(parsed, list) else [parsed]
+
+    def render(self, value, obj=None, **kwargs):
+        return json.dumps(value or [])
+
+
+class CatalogueResource(resources.ModelResource):
+    title_field = None
+    listing = None
+    # Columns bulk_update must write although they are not imported.
+    derived_fields = ("updated_at",)
+
+    def before_import(self, dataset, **kwargs):
+        # Rows without a slug get the one save() would give them, so that the
+        # instance loader can match them against existing rows.
+        if not len(dataset):
+            return
+        blank = [""] * len(dataset)
+        titles = dataset[self.title_field] if self.title_field in dataset.headers else blank
+        slugs = dataset["slug"] if "slug" in dataset.headers else blank
+        slugs = [
+            str(slug).strip() if slug else slugify(title or "")[:220]
+            for slug, title in zip(slugs, titles)
+        ]
+        if "slug" in dataset.headers:
+            del dataset["slug"]
+        dataset.append_col(slugs, header="slug")
+
+    def before_save_instance(self, instance, row, **kwargs):
+        if not instance.slug:
+            instance.slug = slugify(getattr(instance, self.title_field))[:220]
+        instance.updated_at = timezone.now()
+
+    def get_bulk_update_fields(self):
+        return [*super().get_bulk_update_fields(), *self.derived_fields]
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        if kwargs.get("dry_run") or not len(dataset):
+            return
+
+        model = self._meta.model
+        imported = model.objects.filter(slug__in=dataset["slug"])
+        if uses_postgres_search():
+            imported.update(search_vector=build_search_vector(model.SEARCH_WEIGHTS))
+        for url in set(imported.exclude(image_url="").values_list("image_url", flat=True)):
+            register_image(url, listings=[self.listing])
+        bump_listing_version(self.listing)
+
+    class Meta:
+        import_id_fields = ("slug",)
+        instance_loader_class = CachedInstanceLoader
+        use_bulk = True
+        batch_size = settings.IMPORT_BATCH_SIZE
+        chunk_size = settings.IMPORT_BATCH_SIZE
+        skip_unchanged = True
+        use_transactions = True
+
+
+class PackageResource(CatalogueResource):
+    title_field = "title"
+    listing = "packages"
+    derived_fields = ("plain_excerpt", "description_html", "rich_text_hash", "updated_at")
+
+    features = fields.Field(attribute="features", column_name="features", widget=ListWidget())
+    itinerary = fields.Field(attribute="itinerary", column_name="itinerary", widget=ListWidget())
+
+    def before_save_instance(self, instance, row, **kwargs):
+        super().before_save_instance(instance, row, **kwargs)
+        instance.plain_excerpt = make_excerpt(instance.description)
+        compile_rich_text_fields(instance)
+
+    class Meta(CatalogueResource.Meta):
+        model = Package
+        fields = (
+            "slug", "title", "duration", "price", "location", "category", "image_url",
+            "description", "features", "itinerary", "active",
+        )
+        export_order = fields
+
+
+class HotelResource(CatalogueResource):
+    title_field = "name"
+    listing = "hotels"
+
+    amenities = fields.Field(attribute="amenities", column_name="amenities", widget=ListWidget())
+
+    class Meta(CatalogueResource.Meta):
+        model = Hotel
+        fields = ("slug", "name", "rating", "price_per_night", "location", "image_url", "amenities", "active")
+        export_order = fields
+
+
+RESOURCES = {
+    "package": PackageResource,
+    "hotel": HotelResource,
+}
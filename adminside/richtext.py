@@ -0,0 +1,223 @@
+import hashlib
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+from django.core.files.images import get_image_dimensions
+from django.core.files.storage import default_storage
+
+# Bump when the output of compile_rich_text changes so stored HTML is rebuilt.
+RICH_TEXT_VERSION = 1
+
+ALLOWED_TAGS = {
+    "a", "b", "blockquote", "br", "code", "em", "figcaption", "figure", "h2", "h3", "h4",
+    "hr", "i", "img", "li", "ol", "p", "pre", "s", "span", "strong", "sub", "sup", "table",
+    "tbody", "td", "th", "thead", "tr", "u", "ul",
+}
+VOID_TAGS = {"br", "hr", "img"}
+# Dropped together with everything inside them.
+DROP_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "noscript", "template"}
+ALLOWED_ATTRS = {
+    "a": {"href", "title", "target", "rel"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "figure": {"class"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan", "scope"},
+    "ol": {"start"},
+}
+URL_ATTRS = {"href", "src"}
+ALLOWED_SCHEMES = {"", "http", "https", "mailto", "tel"}
+CLASS_RE = re.compile(r"^[\w\s-]*$")
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be"}
+VIMEO_HOSTS = {"vimeo.com", "www.vimeo.com", "player.vimeo.com"}
+
+
+def is_safe_url(url):
+    return urlsplit(url.strip()).scheme.lower() in ALLOWED_SCHEMES
+
+
+def youtube_video_id(url):
+    parts = urlsplit(url)
+    if parts.hostname not in YOUTUBE_HOSTS:
+        return None
+    if parts.hostname == "youtu.be":
+        return parts.path.strip("/") or None
+    if parts.path.startswith(("/embed/", "/shorts/")):
+        return parts.path.split("/")[2] or None
+    return parse_qs(parts.query).get("v", [None])[0]
+
+
+def vimeo_video_id(url):
+    parts = urlsplit(url)
+    if parts.hostname not in VIMEO_HOSTS:
+        return None
+    video_id = parts.path.rstrip("/").rsplit("/", 1)[-1]
+    return video_id if video_id.isdigit() else None
+
+
+def media_facade(url):
+    """Click-to-load placeholder for a CKEditor media embed; see base.html."""
+    if not is_safe_url(url):
+        return ""
+    href = escape(url)
+
+    video_id = youtube_video_id(url)
+    if video_id:
+        video_id = escape(video_id)
+        return (
+            f'<a class="video-facade" href="{href}" '
+            f'data-embed="https://www.youtube-nocookie.com/embed/{video_id}?autoplay=1">'
+            f'<img src="https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" alt="Play video" '
+            f'width="480" height="360" loading="lazy" decoding="async"></a>'
+        )
+
+    video_id = vimeo_video_id(url)
+    if video_id:
+        return (
+            f'<a class="video-facade" href="{href}" '
+            f'data-embed="https://player.vimeo.com/video/{video_id}?autoplay=1">Play video</a>'
+        )
+
+    return f'<a href="{href}" rel="noopener" target="_blank">{href}</a>'
+
+
+def stored_image_dimensions(src):
+    if not src.startswith(settings.MEDIA_URL):
+        return None
+    name = src[len(settings.MEDIA_URL):]
+    try:
+        with default_storage.open(name) as image:
+            width, height = get_image_dimensions(image)
+    except (OSError, ValueError):
+        return None
+    if not width or not height:
+        return None
+    return width, height
+
+
+class RichTextCompiler(HTMLParser):
+    """Re-serializes editor HTML through an allowlist, one token at a time."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping:
+            return
+        if tag == "oembed":
+            self.output.append(media_facade(dict(attrs).get("url") or ""))
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+
+        attrs = self.clean_attrs(tag, attrs)
+        rendered = "".join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+        self.output.append(f"<{tag}{rendered}>")
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.output.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.output.append(escape(data, quote=False))
+
+    def clean_attrs(self, tag, attrs):
+        allowed = ALLOWED_ATTRS.get(tag, set())
+        cleaned = {}
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRS and not is_safe_url(value):
+                continue
+            if name == "class" and not CLASS_RE.match(value):
+                continue
+            cleaned[name] = value
+
+        if tag == "a" and cleaned.get("target") == "_blank":
+            cleaned["rel"] = "noopener noreferrer"
+        if tag == "img":
+            if "src" not in cleaned:
+                return {}
+            cleaned.setdefault("alt", "")
+            if "width" not in cleaned or "height" not in cleaned:
+                dimensions = stored_image_dimensions(cleaned["src"])
+                if dimensions:
+                    cleaned["width"], cleaned["height"] = (str(value) for value in dimensions)
+            cleaned["loading"] = "lazy"
+            cleaned["decoding"] = "async"
+        return cleaned
+
+    def compile(self, rich_html):
+        self.feed(rich_html)
+        self.close()
+        while self.open_tags:
+            self.output.append(f"</{self.open_tags.pop()}>")
+        return "".join(self.output)
+
+
+def compile_rich_text(rich_html):
+    if not rich_html:
+        return ""
+    return RichTextCompiler().compile(rich_html)
+
+
+def rich_text_hash(*sources):
+    digest = hashlib.sha256(f"v{RICH_TEXT_VERSION}".encode())
+    for source in sources:
+        digest.update(b"\0")
+        digest.update((source or "").encode())
+    return digest.hexdigest()
+
+
+def compile_rich_text_fields(instance, fields=None):
+    """
+    Fill the companion columns named in RICH_TEXT_FIELDS, skipping the work
+    when the sources (and pipeline version) match the stored hash.
+    """
+    fields = fields or instance.RICH_TEXT_FIELDS
+    content_hash = rich_text_hash(*(getattr(instance, source) for source in fields))
+    if content_hash == instance.rich_text_hash:
+        return False
+    for source, target in fields.items():
+        setattr(instance, target, compile_rich_text(getattr(instance, source)))
+    instance.rich_text_hash = content_hash
+    return True
+
+
+def recompile_rich_text(queryset, fields, batch_size=500):
+    """Bulk variant for backfills; also works with historical migration models."""
+    model = queryset.model
+    update_fields = [*fields.values(), "rich_text_hash"]
+    changed = []
+    total = 0
+    for instance in queryset.only("pk", "rich_text_hash", *fields).iterator(chunk_size=batch_size):
+        if compile_rich_text_fields(instance, fields):
+            changed.append(instance)
+        if len(changed) >= batch_size:
+            model.objects.using(queryset.db).bulk_update(changed, update_fields)
+            total += len(changed)
+            changed = []
+    model.objects.using(queryset.db).bulk_update(changed, update_fields)
+    return total + len(changed)
@@ -0,0 +1,314 @@
+"""
+Deterministic synthetic catalogues for load testing.
+
+Row ``i`` of every kind is generated from ``Random(f"{seed}:{kind}:{i}")``
+alone, so a run at a larger scale adds exactly the rows a fresh run would
+have, and two machines seeded alike hold the same content. Rows go in with
+``bulk_create``, which skips ``save()`` and signals; the derived columns
+(slug, excerpt, compiled HTML, search vector) are filled in here instead.
+"""
+
+import hashlib
+import random
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import Tag, TaggedItem
+
+from blog.models import Category, Post
+from search.services import build_search_vector, uses_postgres_search
+from users.inbox import index_inquiries, inquiry_kind
+from users.models import ContactInquiry, InquiryIndex, MICEInquiry, NGOTravelInquiry, StudentTravelInquiry
+
+from .cache import bump_listing_version
+from .models import Hotel, Package
+from .richtext import compile_rich_text_fields
+from .text import make_excerpt
+
+PREFIX = "synthetic"
+EMAIL_DOMAIN = "synthetic.example"
+
+PLACES = [
+    "Maasai Mara", "Amboseli", "Tsavo East", "Tsavo West", "Samburu", "Lake Nakuru",
+    "Diani Beach", "Watamu", "Lamu", "Malindi", "Nairobi", "Naivasha", "Mount Kenya",
+    "Serengeti", "Zanzibar", "Ngorongoro", "Kilimanjaro", "Bwindi", "Kigali", "Laikipia",
+]
+CATEGORIES = ["Safari", "Beach", "Expedition", "Culture", "Honeymoon", "Family", "Adventure"]
+AMENITIES = [
+    "Pool", "Spa", "Free WiFi", "Restaurant", "Bar", "Gym", "Beach Access", "Airport Shuttle",
+    "Game Drives", "Kids Club", "Conference Room", "Room Service",
+]
+FEATURES = [
+    "Professional Guide", "Daily Game Drives", "Luxury Tented Camp", "Cultural Visit",
+    "Hot Air Balloon", "Bush Dinner", "Park Fees Included", "Airport Transfers",
+]
+IMAGE_URLS = [
+    "https://images.unsplash.com/photo-1516426122078-c23e76319801?auto=format&fit=crop&q=80&w=1200",
+    "https://images.unsplash.com/photo-1547471080-7cc2caa01a7e?auto=format&fit=crop&q=80&w=1200",
+    "https://images.unsplash.com/photo-1533035353720-f1c6a75cd8ab?auto=format&fit=crop&q=80&w=1200",
+    "https://images.unsplash.com/photo-1523805009345-7448845a9e53?auto=format&fit=crop&q=80&w=1200",
+]
+WORDS = (
+    "savannah migration river crossing lodge sunrise plains wildlife guide camp elephant "
+    "lion leopard cheetah rhino buffalo zebra giraffe flamingo baobab acacia coast reef "
+    "dhow spice island culture village market mountain crater lake valley escarpment"
+).split()
+INQUIRY_MODELS = [ContactInquiry, MICEInquiry, StudentTravelInquiry, NGOTravelInquiry]
+
+
+def row_random(seed, kind, index):
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def sentence(rng, words):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraphs(rng, count, words=40):
+    return "".join(f"<p>{sentence(rng, words)}</p>" for _ in range(count))
+
+
+def synthetic_slug(kind, index):
+    return f"{PREFIX}-{kind}-{index:07d}"
+
+
+def build_package(seed, index):
+    rng = row_random(seed, "package", index)
+    place = rng.choice(PLACES)
+    days = rng.randint(2, 14)
+    package = Package(
+        title=f"{days}-Day {place} {rng.choice(CATEGORIES)} #{index}",
+        slug=synthetic_slug("package", index),
+        duration=f"{days} Days / {days - 1} Nights",
+        price=rng.randrange(300, 9000, 50),
+        location=f"{place}, Kenya",
+        category=rng.choice(CATEGORIES),
+        image_url=rng.choice(IMAGE_URLS),
+        description=paragraphs(rng, rng.randint(2, 6)),
+        features=rng.sample(FEATURES, 4),
+        itinerary=[
+            {"day": day, "title": sentence(rng, 3), "description": sentence(rng, 20)}
+            for day in range(1, min(days, 5) + 1)
+        ],
+    )
+    package.plain_excerpt = make_excerpt(package.description)
+    compile_rich_text_fields(package)
+    return package
+
+
+def build_hotel(seed, index):
+    rng = row_random(seed, "hotel", index)
+    return Hotel(
+        name=f"{rng.choice(PLACES)} {rng.choice(['Lodge', 'Camp', 'Resort', 'Suites'])} #{index}",
+        slug=synthetic_slug("hotel", index),
+        rating=rng.randint(2, 5),
+        price_per_night=rng.randrange(40, 1500, 10),
+        location=rng.choice(PLACES),
+        image_url=rng.choice(IMAGE_URLS),
+        amenities=rng.sample(AMENITIES, 4),
+    )
+
+
+def build_category(seed, index):
+    rng = row_random(seed, "category", index)
+    category = Category(
+        title=f"{CATEGORIES[index % len(CATEGORIES)]} {index}",
+        slug=synthetic_slug("category", index),
+        description=paragraphs(rng, 1),
+    )
+    compile_rich_text_fields(category)
+    return category
+
+
+def build_post(seed, index, category_ids):
+    rng = row_random(seed, "post", index)
+    slug = synthetic_slug("post", index)
+    post = Post(
+        title=f"{sentence(rng, 6)[:-1]} #{index}",
+        slug=slug,
+        pid=hashlib.md5(slug.encode()).hexdigest()[:22],
+        excerpt=paragraphs(rng, 1, 25),
+        content=paragraphs(rng, rng.randint(4, 12), 60),
+        category_id=rng.choice(category_ids) if category_ids else None,
+        status="published" if rng.random() < 0.9 else "draft",
+        views=rng.randint(0, 5000),
+    )
+    post.plain_excerpt = make_excerpt(post.excerpt or post.content)
+    compile_rich_text_fields(post)
+    return post
+
+
+def build_inquiry(seed, index):
+    rng = row_random(seed, "inquiry", index)
+    model = INQUIRY_MODELS[index % len(INQUIRY_MODELS)]
+    name = f"Guest {index}"
+    email = f"guest{index}@{EMAIL_DOMAIN}"
+    phone = f"07{rng.randint(10000000, 99999999)}"
+    if model is ContactInquiry:
+        return ContactInquiry(
+            full_name=name,
+            email=email,
+            phone=phone,
+            subject=rng.choice(CATEGORIES),
+            message=sentence(rng, 30),
+            privacy_consent=True,
+            is_resolved=rng.random() < 0.6,
+        )
+    if model is MICEInquiry:
+        return MICEInquiry(
+            company_name=f"Company {index}",
+            contact_person=name,
+            email=email,
+            phone_number=phone,
+            event_type=rng.choice(["Conference", "Retreat", "Incentive", "Exhibition"]),
+            attendees=rng.randint(10, 500),
+            event_details=sentence(rng, 30),
+        )
+    if model is StudentTravelInquiry:
+        return StudentTravelInquiry(
+            school_name=f"School {index}",
+            contact_person=name,
+            email=email,
+            phone_number=phone,
+            program_stage=rng.choice(["Primary", "Secondary", "University"]),
+            number_of_students=rng.randint(5, 120),
+            travel_details=sentence(rng, 30),
+        )
+    return NGOTravelInquiry(
+        organization_name=f"Organization {index}",
+        contact_person=name,
+        email=email,
+        phone_number=phone,
+        organization_type=rng.choice(["Health", "Education", "Conservation", "Relief"]),
+        travel_purpose=sentence(rng, 12),
+        number_of_travelers=rng.randint(1, 40),
+        travel_details=sentence(rng, 30),
+        sustainability_requirements=rng.random() < 0.5,
+    )
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def existing_slugs(model, kind):
+    return set(
+        model.objects.filter(slug__startswith=f"{PREFIX}-{kind}-").values_list("slug", flat=True)
+    )
+
+
+def missing_indexes(model, kind, count):
+    existing = existing_slugs(model, kind)
+    return [index for index in range(count) if synthetic_slug(kind, index) not in existing]
+
+
+def create_rows(model, rows, batch_size):
+    created = []
+    for batch in batched(rows, batch_size):
+        created += model.objects.bulk_create(batch)
+    return created
+
+
+def refresh_search_vectors(model, kind):
+    if not uses_postgres_search():
+        return
+    model.objects.filter(slug__startswith=f"{PREFIX}-{kind}-", search_vector=None).update(
+        search_vector=build_search_vector(model.SEARCH_WEIGHTS)
+    )
+
+
+def seed_packages(count, seed=0, batch_size=1000):
+    rows = (build_package(seed, index) for index in missing_indexes(Package, "package", count))
+    created = create_rows(Package, rows, batch_size)
+    refresh_search_vectors(Package, "package")
+    bump_listing_version("packages")
+    return len(created)
+
+
+def seed_hotels(count, seed=0, batch_size=1000):
+    rows = (build_hotel(seed, index) for index in missing_indexes(Hotel, "hotel", count))
+    created = create_rows(Hotel, rows, batch_size)
+    refresh_search_vectors(Hotel, "hotel")
+    bump_listing_version("hotels")
+    return len(created)
+
+
+def seed_tags(count):
+    Tag.objects.bulk_create(
+        [Tag(name=f"{PREFIX} {index}", slug=f"{PREFIX}-{index}") for index in range(count)],
+        ignore_conflicts=True,
+    )
+    return list(
+        Tag.objects.filter(slug__startswith=f"{PREFIX}-").order_by("pk").values_list("pk", flat=True)
+    )[:count]
+
+
+def seed_posts(count, seed=0, batch_size=1000, categories=12, tags=200, tags_per_post=3):
+    create_rows(
+        Category,
+        (build_category(seed, index) for index in missing_indexes(Category, "category", categories)),
+        batch_size,
+    )
+    category_ids = list(
+        Category.objects.filter(slug__startswith=f"{PREFIX}-category-").values_list("pk", flat=True)
+    )
+    tag_ids = seed_tags(tags) if tags else []
+    content_type = ContentType.objects.get_for_model(Post)
+
+    created = 0
+    indexes = missing_indexes(Post, "post", count)
+    for batch in batched(indexes, batch_size):
+        posts = Post.objects.bulk_create([build_post(seed, index, category_ids) for index in batch])
+        created += len(posts)
+        if tag_ids:
+            tagged = []
+            for index, post in zip(batch, posts):
+                rng = row_random(seed, "post-tags", index)
+                for tag_id in rng.sample(tag_ids, min(tags_per_post, len(tag_ids))):
+                    tagged.append(TaggedItem(tag_id=tag_id, content_type=content_type, object_id=post.pk))
+            TaggedItem.objects.bulk_create(tagged, batch_size=batch_size)
+
+    refresh_search_vectors(Post, "post")
+    bump_listing_version("posts")
+    return created
+
+
+def create_inquiries(model, rows):
+    # bulk_create skips the post_save receiver that keeps the inbox index in step.
+    return index_inquiries(model, model.objects.bulk_create(rows))
+
+
+def seed_inquiries(count, seed=0, batch_size=1000):
+    """Inquiries have no natural key, so only the shortfall against ``count`` is added."""
+    existing = sum(
+        model.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").count() for model in INQUIRY_MODELS
+    )
+    created = 0
+    by_model = {}
+    for index in range(existing, count):
+        inquiry = build_inquiry(seed, index)
+        by_model.setdefault(type(inquiry), []).append(inquiry)
+        if len(by_model[type(inquiry)]) >= batch_size:
+            created += create_inquiries(type(inquiry), by_model.pop(type(inquiry)))
+    for model, rows in by_model.items():
+        created += create_inquiries(model, rows)
+    return created
+
+
+def clear_synthetic():
+    deleted = 0
+    for model, kind in ((Package, "package"), (Hotel, "hotel"), (Post, "post"), (Category, "category")):
+        deleted += model.objects.filter(slug__startswith=f"{PREFIX}-{kind}-").delete()[0]
+    deleted += Tag.objects.filter(slug__startswith=f"{PREFIX}-").delete()[0]
+    for model in INQUIRY_MODELS:
+        inquiries = model.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}")
+        InquiryIndex.objects.filter(inquiry_type=inquiry_kind(model), object_id__in=inquiries.values("pk")).delete()
+        # delete() would load every row to send post_delete, and the receiver
+        # only unindexes what is already gone; nothing references inquiries.
+        deleted += inquiries._raw_delete(inquiries.db)
+    for listing in ("packages", "hotels", "posts"):
+        bump_listing_version(listing)
+    return deleted
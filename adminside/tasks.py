@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from .imports import run_import
+from .models import ImportJob
+
+
+@shared_task
+def run_import_job(job_id):
+    # A redelivered message must not import the same file twice.
+    job = ImportJob.objects.filter(pk=job_id, status="pending").first()
+    if job is None:
+        return False
+    return run_import(job)
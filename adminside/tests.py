@@ -0,0 +1,382 @@
+from io import StringIO
+from unittest import mock
+
+import tablib
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import Category, Post
+from users.models import ContactInquiry, InquiryIndex, NGOTravelInquiry
+
+from .imports import run_import
+from .models import Hotel, ImportJob, Package
+from .pagination import EstimatedCountPaginator
+from .resources import HotelResource, PackageResource
+from .synthetic import clear_synthetic
+from .richtext import compile_rich_text, recompile_rich_text
+
+
+class ListingCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.package = Package.objects.create(title="Mara Safari", location="Maasai Mara", price=1000)
+        self.hotel = Hotel.objects.create(name="Mara Lodge", location="Maasai Mara", rating=5)
+
+    def test_package_grid_is_served_from_cache(self):
+        self.client.get(reverse("packages"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("packages"))
+
+        self.assertContains(response, "Mara Safari")
+
+    def test_package_save_invalidates_grid(self):
+        self.client.get(reverse("packages"))
+
+        self.package.title = "Amboseli Safari"
+        self.package.save()
+
+        response = self.client.get(reverse("packages"))
+        self.assertContains(response, "Amboseli Safari")
+        self.assertNotContains(response, "Mara Safari")
+
+    def test_hotel_delete_invalidates_grid(self):
+        self.client.get(reverse("hotels"))
+
+        self.hotel.delete()
+
+        response = self.client.get(reverse("hotels"))
+        self.assertNotContains(response, "Mara Lodge")
+        self.assertContains(response, "No hotels yet.")
+
+    async def test_listing_views_run_on_the_async_orm(self):
+        for name, text in (("packages", "Mara Safari"), ("hotels", "Mara Lodge")):
+            response = await self.async_client.get(reverse(name))
+
+            self.assertContains(response, text)
+            self.assertTrue(response.context[name].__dict__.get("_window"))
+
+
+@override_settings(LISTING_PAGE_SIZE=2)
+class ListingPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(5):
+            Package.objects.create(title=f"Package {index}", slug=f"package-{index}")
+
+    def test_pages_walk_forward_and_back(self):
+        first = self.client.get(reverse("packages")).context["packages"]
+        self.assertEqual([pkg.title for pkg in first], ["Package 4", "Package 3"])
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+        second = self.client.get(reverse("packages"), {"after": first.next_cursor}).context["packages"]
+        self.assertEqual([pkg.title for pkg in second], ["Package 2", "Package 1"])
+
+        third = self.client.get(reverse("packages"), {"after": second.next_cursor}).context["packages"]
+        self.assertEqual([pkg.title for pkg in third], ["Package 0"])
+        self.assertFalse(third.has_next)
+
+        back = self.client.get(reverse("packages"), {"before": third.previous_cursor}).context["packages"]
+        self.assertEqual([pkg.title for pkg in back], ["Package 2", "Package 1"])
+        self.assertTrue(back.has_previous)
+        self.assertTrue(back.has_next)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        page = self.client.get(reverse("packages"), {"after": "not-a-cursor"}).context["packages"]
+
+        self.assertEqual([pkg.title for pkg in page], ["Package 4", "Package 3"])
+
+    def test_listing_skips_large_fields(self):
+        page = self.client.get(reverse("packages")).context["packages"]
+
+        deferred = page.object_list[0].get_deferred_fields()
+        self.assertIn("description", deferred)
+        self.assertIn("features", deferred)
+        self.assertIn("itinerary", deferred)
+
+
+class HomeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_home_lists_trending_posts(self):
+        Post.objects.create(title="Trending safari story", content="<p>x</p>", status="published", trending=True)
+        Post.objects.create(title="Quiet story", content="<p>x</p>", status="published")
+
+        response = self.client.get(reverse("home"))
+
+        self.assertContains(response, "Trending safari story")
+        self.assertNotContains(response, "Quiet story")
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.package = Package.objects.create(title="Mara Safari", location="Maasai Mara", price=1000)
+
+    def test_anonymous_page_is_served_from_cache(self):
+        first = self.client.get(reverse("packages"))
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse("packages"))
+
+        self.assertEqual(first["X-Page-Cache"], "miss")
+        self.assertEqual(second["X-Page-Cache"], "hit")
+        self.assertEqual(first.content, second.content)
+
+    def test_content_write_invalidates_page(self):
+        self.client.get(reverse("package-detail", args=[self.package.slug]))
+
+        self.package.title = "Amboseli Safari"
+        self.package.save()
+
+        response = self.client.get(reverse("package-detail", args=[self.package.slug]))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "Amboseli Safari")
+
+    def test_ignored_query_params_share_cached_page(self):
+        self.client.get(reverse("home"))
+
+        response = self.client.get(reverse("home"), {"utm_source": "newsletter"})
+        self.assertEqual(response["X-Page-Cache"], "hit")
+
+    def test_session_cookie_bypasses_cache(self):
+        self.client.get(reverse("about"))
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "abc"
+
+        response = self.client.get(reverse("about"))
+        self.assertNotIn("X-Page-Cache", response)
+
+    def test_policy_sets_cache_headers(self):
+        response = self.client.get(reverse("hotels"))
+
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("s-maxage=300", response["Cache-Control"])
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_pages_without_policy_are_untouched(self):
+        response = self.client.get(reverse("contact"))
+
+        self.assertNotIn("X-Page-Cache", response)
+        self.assertNotIn("public", response.get("Cache-Control", ""))
+
+
+class PlainExcerptTests(TestCase):
+    def test_excerpt_is_plain_text_within_word_budget(self):
+        package = Package.objects.create(
+            title="Mara Safari",
+            description="<p>Sunrise&nbsp;game drives &amp; <strong>sundowners</strong></p><p>Day two</p>",
+        )
+
+        self.assertEqual(package.plain_excerpt, "Sunrise game drives & sundowners Day two")
+
+        with self.settings(EXCERPT_WORDS=3):
+            package.save()
+        self.assertEqual(package.plain_excerpt, "Sunrise game drives…")
+
+
+class RichTextTests(TestCase):
+    def test_description_is_sanitized_on_save(self):
+        package = Package.objects.create(
+            title="Mara Safari",
+            description=(
+                '<p onclick="steal()">Big cats<script>alert(1)</script></p>'
+                '<a href="javascript:alert(1)">bad</a><a href="https://example.com" target="_blank">ok</a>'
+            ),
+        )
+
+        self.assertEqual(
+            package.description_html,
+            '<p>Big cats</p><a>bad</a>'
+            '<a href="https://example.com" target="_blank" rel="noopener noreferrer">ok</a>',
+        )
+
+    def test_images_are_lazy_and_embeds_become_facades(self):
+        html = compile_rich_text(
+            '<img src="https://example.com/a.jpg" width="800" height="600">'
+            '<figure class="media"><oembed url="https://youtu.be/abc123"></oembed></figure>'
+        )
+
+        self.assertIn('<img src="https://example.com/a.jpg" width="800" height="600" alt="" loading="lazy"', html)
+        self.assertIn('data-embed="https://www.youtube-nocookie.com/embed/abc123?autoplay=1"', html)
+        self.assertNotIn("oembed", html)
+
+    def test_unchanged_source_is_not_recompiled(self):
+        package = Package.objects.create(title="Mara Safari", description="<p>Hello</p>")
+
+        with mock.patch("adminside.richtext.compile_rich_text") as compile_mock:
+            package.price = 10
+            package.save()
+        compile_mock.assert_not_called()
+
+        self.assertEqual(recompile_rich_text(Package.objects.all(), Package.RICH_TEXT_FIELDS), 0)
+
+    def test_detail_renders_stored_html(self):
+        package = Package.objects.create(title="Mara Safari", description="<p>Hello<script>x</script></p>")
+
+        response = self.client.get(reverse("package-detail", args=[package.slug]))
+
+        self.assertContains(response, "<p>Hello</p>", html=False)
+        self.assertNotContains(response, "<script>x</script>")
+
+
+class SeedSyntheticTests(TestCase):
+    def seed(self, **options):
+        call_command("seed_synthetic", stdout=StringIO(), batch_size=7, **options)
+
+    def test_catalogue_is_bulk_inserted_with_derived_columns(self):
+        self.seed(packages=20, hotels=10, posts=15, categories=3, tags=5, inquiries=12)
+
+        self.assertEqual(Package.objects.count(), 20)
+        self.assertEqual(Hotel.objects.count(), 10)
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(ContactInquiry.objects.count(), 3)
+        self.assertEqual(NGOTravelInquiry.objects.count(), 3)
+
+        package = Package.objects.get(slug="synthetic-package-0000003")
+        self.assertTrue(package.plain_excerpt)
+        self.assertTrue(package.description_html.startswith("<p>"))
+        post = Post.objects.get(slug="synthetic-post-0000004")
+        self.assertEqual(post.tags.count(), 3)
+        self.assertTrue(post.content_html)
+
+    def test_rows_are_deterministic_and_reruns_only_add_the_shortfall(self):
+        self.seed(packages=5, inquiries=4)
+        first = Package.objects.get(slug="synthetic-package-0000002")
+
+        self.seed(packages=8, inquiries=6)
+
+        self.assertEqual(Package.objects.count(), 8)
+        self.assertEqual(Package.objects.get(slug="synthetic-package-0000002").title, first.title)
+        self.assertEqual(ContactInquiry.objects.count() + NGOTravelInquiry.objects.count(), 3)
+
+        Package.objects.all().delete()
+        self.seed(packages=3)
+        self.assertEqual(Package.objects.get(slug="synthetic-package-0000002").title, first.title)
+
+    def test_clear_deletes_inquiries_and_inbox_rows_without_per_row_queries(self):
+        ContactInquiry.objects.create(full_name="Real", email="real@example.com", subject="S", message="M")
+        self.seed(inquiries=8)
+        with CaptureQueriesContext(connection) as few:
+            clear_synthetic()
+        self.seed(inquiries=40)
+        with CaptureQueriesContext(connection) as many:
+            clear_synthetic()
+
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(list(ContactInquiry.objects.values_list("email", flat=True)), ["real@example.com"])
+        self.assertEqual(list(InquiryIndex.objects.values_list("email", flat=True)), ["real@example.com"])
+
+
+class CatalogueImportTests(TestCase):
+    PACKAGE_CSV = (
+        "slug,title,price,description,features\n"
+        ",Great Migration Safari,1200,<p>Herds <script>x</script>crossing</p>,\"Guide, Park Fees\"\n"
+        "amboseli-classic,Amboseli Classic,900,<p>Elephants</p>,[]\n"
+        ",Diani Beach Escape,abc,<p>Sand</p>,[]\n"
+    )
+
+    def test_rows_are_upserted_on_slug_in_bulk(self):
+        Hotel.objects.create(name="Old Name", slug="mara-camp", rating=2)
+        dataset = tablib.Dataset(
+            ["mara-camp", "Mara Camp", 4, "Pool, Spa"],
+            ["", "Lamu House", 3, '["Beach Access"]'],
+            headers=["slug", "name", "rating", "amenities"],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            result = HotelResource().import_data(dataset)
+
+        statements = [query["sql"].split()[0] for query in queries if "SAVEPOINT" not in query["sql"]]
+        # One slug lookup for the whole dataset, one write per batch, one image lookup.
+        self.assertEqual(statements, ["SELECT", "INSERT", "UPDATE", "SELECT"])
+
+        self.assertFalse(result.has_errors())
+        self.assertEqual((result.totals["new"], result.totals["update"]), (1, 1))
+        self.assertEqual(Hotel.objects.get(slug="mara-camp").amenities, ["Pool", "Spa"])
+        self.assertEqual(Hotel.objects.get(slug="lamu-house").amenities, ["Beach Access"])
+
+    def test_bulk_writes_fill_derived_columns(self):
+        dataset = tablib.Dataset().load(self.PACKAGE_CSV.rsplit("\n", 2)[0], format="csv")
+
+        PackageResource().import_data(dataset)
+
+        package = Package.objects.get(slug="great-migration-safari")
+        self.assertEqual(package.features, ["Guide", "Park Fees"])
+        self.assertEqual(package.plain_excerpt, "Herds xcrossing")
+        self.assertEqual(package.description_html, "<p>Herds crossing</p>")
+
+    @override_settings(IMPORT_BACKGROUND_BYTES=10)
+    def test_large_upload_is_imported_by_a_background_job(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(user)
+        upload = SimpleUploadedFile("hotels.csv", b"name,rating\nMara Camp,4\nLamu House,3\n")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("admin:adminside_hotel_import"), {"import_file": upload, "format": "0"}
+            )
+
+        job = ImportJob.objects.get()
+        self.assertRedirects(
+            response,
+            reverse("admin:adminside_importjob_change", args=[job.pk]),
+            fetch_redirect_response=False,
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, "done")
+        self.assertEqual((job.total_rows, job.processed_rows, job.new_rows), (2, 2, 2))
+        self.assertEqual(set(Hotel.objects.values_list("slug", flat=True)), {"mara-camp", "lamu-house"})
+
+    def test_failed_batch_rolls_back_the_whole_file(self):
+        job = ImportJob.objects.create(
+            resource="package", file_name="packages.csv", input_format="csv",
+            data=self.PACKAGE_CSV.encode(),
+        )
+
+        self.assertFalse(run_import(job, batch_size=2))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.total_rows, 3)
+        self.assertTrue(job.errors[0].startswith("Row 3:"), job.errors)
+        self.assertFalse(Package.objects.exists())
+
+
+@override_settings(ADMIN_EXACT_COUNT_LIMIT=100)
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        Hotel.objects.bulk_create(Hotel(name=f"Hotel {i}", slug=f"hotel-{i}") for i in range(5))
+
+    def test_exact_count_below_the_limit(self):
+        with mock.patch("adminside.pagination.estimate_count", return_value=40):
+            paginator = EstimatedCountPaginator(Hotel.objects.order_by("pk"), 2)
+            self.assertEqual(paginator.count, 5)
+
+    def test_estimate_above_the_limit_skips_count_and_keeps_later_pages(self):
+        with mock.patch("adminside.pagination.estimate_count", return_value=150):
+            paginator = EstimatedCountPaginator(Hotel.objects.order_by("pk"), 2)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(paginator.num_pages, 75)
+            self.assertEqual(len(queries), 0)
+            self.assertEqual([hotel.name for hotel in paginator.page(3)], ["Hotel 4"])
+            self.assertEqual(list(paginator.page(80)), [])
+
+    def test_changelists_do_not_count_the_full_table(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(user)
+
+        with mock.patch("adminside.pagination.estimate_count", return_value=150):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("admin:adminside_hotel_changelist"), {"q": "Hotel"})
+
+        self.assertEqual(response.context["cl"].result_count, 150)
+        self.assertFalse([query for query in queries if "COUNT(" in query["sql"]])
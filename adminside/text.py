@@ -0,0 +1,22 @@
+import html
+import re
+
+from django.conf import settings
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+WHITESPACE_RE = re.compile(r"\s+")
+# Block-level boundaries that would otherwise glue words together once tags are stripped.
+BLOCK_BOUNDARY_RE = re.compile(r"<\s*(br|/p|/div|/li|/h[1-6]|/tr|/blockquote)\b[^>]*>", re.IGNORECASE)
+
+
+def plain_text(rich_html):
+    if not rich_html:
+        return ""
+    text = strip_tags(BLOCK_BOUNDARY_RE.sub(" ", rich_html))
+    return WHITESPACE_RE.sub(" ", html.unescape(text)).strip()
+
+
+def make_excerpt(rich_html, words=None):
+    words = words or settings.EXCERPT_WORDS
+    return Truncator(plain_text(rich_html)).words(words, truncate="…")
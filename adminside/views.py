@@ -1,25 +1,77 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.shortcuts import get_object_or_404, render
 
+from blog.models import Post
+
+from .cache import aload_listing_page, alisting_cache_context, listing_cache_context
 from .models import Hotel, Package
+from .pagination import KeysetPage
+
+PACKAGE_LISTING_FIELDS = (
+    "title",
+    "slug",
+    "price",
+    "location",
+    "category",
+    "image_url",
+    "plain_excerpt",
+    "created_at",
+)
+HOTEL_LISTING_FIELDS = (
+    "name",
+    "slug",
+    "rating",
+    "price_per_night",
+    "location",
+    "image_url",
+    "amenities",
+    "created_at",
+)
+
+
+async def arender(request, template_name, context=None):
+    # Context processors, {% cache %} and template tags still run sync-only code.
+    return await sync_to_async(render)(request, template_name, context)
+
+
+def listing_page(request, queryset):
+    return KeysetPage(
+        queryset,
+        settings.LISTING_PAGE_SIZE,
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+    )
 
 
 def home(request):
-    return render(request, 'pages/index.html')
+    trending_posts = (
+        Post.objects.filter(status="published", trending=True)
+        .select_related("category")
+        .only("title", "slug", "image", "created", "category__title", "category__slug")
+        .order_by("-created")[: settings.TRENDING_POSTS_COUNT]
+    )
+    context = {"trending_posts": trending_posts, **listing_cache_context("posts")}
+    return render(request, 'pages/index.html', context)
 
 
-def packages(request):
-    package_list = Package.objects.filter(active=True).order_by("-created_at")
-    return render(request, 'pages/packages.html', {"packages": package_list})
+async def packages(request):
+    package_list = Package.objects.filter(active=True).only(*PACKAGE_LISTING_FIELDS)
+    context = {"packages": listing_page(request, package_list), **await alisting_cache_context("packages")}
+    await aload_listing_page(context["packages"], "package_grid", context["listing_version"])
+    return await arender(request, 'pages/packages.html', context)
 
 
 def package_detail(request, slug):
-    package = get_object_or_404(Package, slug=slug, active=True)
+    package = get_object_or_404(Package.objects.defer("description", "search_vector"), slug=slug, active=True)
     return render(request, 'pages/package-detail.html', {"package": package})
 
 
-def hotels(request):
-    hotel_list = Hotel.objects.filter(active=True).order_by("-created_at")
-    return render(request, 'pages/hotels.html', {"hotels": hotel_list})
+async def hotels(request):
+    hotel_list = Hotel.objects.filter(active=True).only(*HOTEL_LISTING_FIELDS)
+    context = {"hotels": listing_page(request, hotel_list), **await alisting_cache_context("hotels")}
+    await aload_listing_page(context["hotels"], "hotel_grid", context["listing_version"])
+    return await arender(request, 'pages/hotels.html', context)
 
 
 def about(request):
@@ -0,0 +1,98 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from adminside.cache import get_listing_version
+
+from .serializers import requested_fields
+
+
+def compute_etag(data):
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(",", ":"))
+    return f'"{hashlib.md5(payload.encode()).hexdigest()}"'
+
+
+class CachedReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only viewset whose serialized payloads are cached under the listing
+    version of the underlying content, and which answers conditional GETs from
+    that cache without touching the database.
+    """
+
+    listing = None
+    updated_field = None
+    # Serializer field name -> model column that can be skipped when not requested.
+    deferrable_fields = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = requested_fields(self.request)
+        if fields is not None:
+            deferred = [column for field, column in self.deferrable_fields.items() if field not in fields]
+            if deferred:
+                queryset = queryset.defer(*deferred)
+        return queryset
+
+    def get_object(self):
+        obj = super().get_object()
+        self.served_objects = [obj]
+        return obj
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.served_objects = list(page or [])
+        return page
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+    def response_cache_key(self, request):
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return f"api:{self.basename}:{get_listing_version(self.listing)}:{path}"
+
+    def last_modified(self):
+        # A list also changes when rows are deleted or deactivated, which no
+        # remaining row's timestamp reflects; lists revalidate on the ETag alone.
+        if not self.updated_field or self.action != "retrieve":
+            return None
+        timestamps = [getattr(obj, self.updated_field) for obj in getattr(self, "served_objects", [])]
+        if not timestamps:
+            return None
+        return int(max(timestamps).timestamp())
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        key = self.response_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            entry = {
+                "data": response.data,
+                "etag": compute_etag(response.data),
+                "last_modified": self.last_modified(),
+            }
+            cache.set(key, entry, settings.API_CACHE_TIMEOUT)
+
+        response = Response(entry["data"])
+        response["ETag"] = entry["etag"]
+        if entry["last_modified"] is not None:
+            response["Last-Modified"] = http_date(entry["last_modified"])
+        patch_cache_control(response, public=True, max_age=settings.API_CACHE_MAX_AGE)
+        patch_vary_headers(response, ("Accept",))
+        return get_conditional_response(
+            request,
+            etag=entry["etag"],
+            last_modified=entry["last_modified"],
+            response=response,
+        )
@@ -0,0 +1,20 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CataloguePagination(CursorPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+    def get_page_size(self, request):
+        self.page_size = settings.LISTING_PAGE_SIZE
+        return super().get_page_size(request)
+
+
+class BlogPagination(CataloguePagination):
+    ordering = ("-created", "-id")
+
+
+class CategoryPagination(CataloguePagination):
+    ordering = ("title", "id")
@@ -0,0 +1,99 @@
+from rest_framework import serializers
+
+from adminside.models import Hotel, Package
+from blog.models import Category, Post
+
+
+def requested_fields(request):
+    if request is None:
+        return None
+    fields = request.query_params.get("fields")
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(",") if field.strip()}
+
+
+class SparseFieldsetMixin:
+    """Drops every field not listed in ?fields=a,b (unknown names are ignored)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get("request"))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class PackageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    description = serializers.CharField(source="description_html", read_only=True)
+
+    class Meta:
+        model = Package
+        fields = (
+            "id",
+            "title",
+            "slug",
+            "duration",
+            "price",
+            "location",
+            "category",
+            "image_url",
+            "plain_excerpt",
+            "description",
+            "features",
+            "itinerary",
+            "created_at",
+            "updated_at",
+        )
+
+
+class HotelSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Hotel
+        fields = (
+            "id",
+            "name",
+            "slug",
+            "rating",
+            "price_per_night",
+            "location",
+            "image_url",
+            "amenities",
+            "created_at",
+            "updated_at",
+        )
+
+
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    description = serializers.CharField(source="description_html", read_only=True)
+
+    class Meta:
+        model = Category
+        fields = ("id", "title", "slug", "description", "created")
+
+
+class PostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    category = serializers.SlugRelatedField(slug_field="slug", read_only=True)
+    excerpt = serializers.CharField(source="excerpt_html", read_only=True)
+    content = serializers.CharField(source="content_html", read_only=True)
+    tags = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Post
+        fields = (
+            "id",
+            "title",
+            "slug",
+            "image",
+            "plain_excerpt",
+            "excerpt",
+            "content",
+            "category",
+            "tags",
+            "views",
+            "created",
+            "updated",
+        )
+
+    def get_tags(self, post):
+        return [tag.name for tag in post.tags.all()]
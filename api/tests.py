@@ -0,0 +1,98 @@
+import time
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from adminside.models import Hotel, Package
+from blog.models import Category, Post
+
+
+class CatalogueApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(3):
+            Package.objects.create(
+                title=f"Safari {index}",
+                location="Maasai Mara",
+                description="<p>Long description</p>",
+                itinerary=[{"day": 1}],
+            )
+        Package.objects.create(title="Hidden", active=False)
+
+    def test_list_is_cursor_paginated(self):
+        with self.settings(LISTING_PAGE_SIZE=2):
+            first = self.client.get(reverse("api-package-list")).json()
+            second = self.client.get(first["next"]).json()
+
+        self.assertEqual([item["title"] for item in first["results"]], ["Safari 2", "Safari 1"])
+        self.assertEqual([item["title"] for item in second["results"]], ["Safari 0"])
+        self.assertIsNone(second["next"])
+
+    def test_sparse_fieldsets_skip_rich_fields(self):
+        response = self.client.get(reverse("api-package-list"), {"fields": "title,slug"})
+
+        self.assertEqual(set(response.json()["results"][0]), {"title", "slug"})
+
+    def test_detail_uses_slug(self):
+        package = Package.objects.get(title="Safari 1")
+
+        response = self.client.get(reverse("api-package-detail", args=[package.slug]))
+
+        self.assertEqual(response.json()["itinerary"], [{"day": 1}])
+        self.assertEqual(
+            self.client.get(reverse("api-package-detail", args=["hidden"])).status_code, 404
+        )
+
+    def test_conditional_get_returns_not_modified_from_cache(self):
+        url = reverse("api-package-detail", args=[Package.objects.get(title="Safari 0").slug])
+        response = self.client.get(url)
+        self.assertTrue(response["ETag"])
+        self.assertTrue(response["Last-Modified"])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+        not_modified = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_write_invalidates_cached_response(self):
+        url = reverse("api-package-list")
+        etag = self.client.get(url)["ETag"]
+
+        package = Package.objects.get(title="Safari 0")
+        package.title = "Amboseli"
+        package.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Amboseli")
+
+    def test_deactivating_a_row_is_not_hidden_by_last_modified(self):
+        url = reverse("api-package-list")
+        self.assertFalse(self.client.get(url).has_header("Last-Modified"))
+
+        package = Package.objects.get(title="Safari 2")
+        package.active = False
+        package.save()
+        # The remaining rows are older than the client's copy of the list.
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Safari 2")
+
+    def test_blog_endpoints(self):
+        category = Category.objects.create(title="Safari Tips")
+        post = Post.objects.create(title="Packing list", content="<p>x</p>", status="published", category=category)
+        post.tags.add("gear")
+        Post.objects.create(title="Draft", content="<p>x</p>", status="draft")
+        Hotel.objects.create(name="Mara Lodge")
+
+        posts = self.client.get(reverse("api-post-list")).json()["results"]
+        self.assertEqual([(item["title"], item["category"], item["tags"]) for item in posts], [
+            ("Packing list", "safari-tips", ["gear"]),
+        ])
+        self.assertEqual(self.client.get(reverse("api-category-list")).json()["results"][0]["slug"], "safari-tips")
+        self.assertEqual(self.client.get(reverse("api-hotel-list")).json()["results"][0]["name"], "Mara Lodge")
@@ -0,0 +1,11 @@
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
+router = DefaultRouter()
+router.register("packages", views.PackageViewSet, basename="api-package")
+router.register("hotels", views.HotelViewSet, basename="api-hotel")
+router.register("categories", views.CategoryViewSet, basename="api-category")
+router.register("posts", views.PostViewSet, basename="api-post")
+
+urlpatterns = router.urls
@@ -0,0 +1,54 @@
+from adminside.models import Hotel, Package
+from blog.models import Category, Post
+
+from .caching import CachedReadOnlyViewSet
+from .pagination import BlogPagination, CataloguePagination, CategoryPagination
+from .serializers import CategorySerializer, HotelSerializer, PackageSerializer, PostSerializer
+
+
+class PackageViewSet(CachedReadOnlyViewSet):
+    queryset = Package.objects.filter(active=True).defer("description", "search_vector")
+    serializer_class = PackageSerializer
+    pagination_class = CataloguePagination
+    lookup_field = "slug"
+    listing = "packages"
+    updated_field = "updated_at"
+    deferrable_fields = {
+        "description": "description_html",
+        "features": "features",
+        "itinerary": "itinerary",
+    }
+
+
+class HotelViewSet(CachedReadOnlyViewSet):
+    queryset = Hotel.objects.filter(active=True).defer("search_vector")
+    serializer_class = HotelSerializer
+    pagination_class = CataloguePagination
+    lookup_field = "slug"
+    listing = "hotels"
+    updated_field = "updated_at"
+    deferrable_fields = {"amenities": "amenities"}
+
+
+class CategoryViewSet(CachedReadOnlyViewSet):
+    queryset = Category.objects.filter(active=True).defer("description")
+    serializer_class = CategorySerializer
+    pagination_class = CategoryPagination
+    lookup_field = "slug"
+    listing = "posts"
+    deferrable_fields = {"description": "description_html"}
+
+
+class PostViewSet(CachedReadOnlyViewSet):
+    queryset = (
+        Post.objects.filter(status="published")
+        .select_related("category")
+        .prefetch_related("tags")
+        .defer("content", "excerpt", "search_vector")
+    )
+    serializer_class = PostSerializer
+    pagination_class = BlogPagination
+    lookup_field = "slug"
+    listing = "posts"
+    updated_field = "updated"
+    deferrable_fields = {"content": "content_html", "excerpt": "excerpt_html"}
@@ -1,10 +1,13 @@
 from django.contrib import admin
 
+from adminside.admin import EstimatedCountAdminMixin
+from search.admin import SearchVectorAdminMixin
+
 from .models import Category, Post
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("title", "slug", "active", "created")
     list_filter = ("active", "created")
     search_fields = ("title", "slug")
@@ -12,12 +15,13 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(EstimatedCountAdminMixin, SearchVectorAdminMixin, admin.ModelAdmin):
     list_display = ("title", "slug", "status", "category", "user", "featured", "trending", "views", "created")
-    list_editable = ("status", "category", "featured", "trending")
+    list_editable = ("status", "category", "featured")
     list_filter = ("category", "status", "featured", "trending", "created", "updated")
     search_fields = ("title", "content", "excerpt", "slug")
     prepopulated_fields = {"slug": ("title",)}
+    readonly_fields = ("trending",)
     fieldsets = (
         ("Basic Info", {"fields": ("title", "slug", "excerpt", "category", "tags", "image")}),
         ("Content", {"fields": ("content",)}),
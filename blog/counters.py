@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+from .models import Post
+from .trending import record_hourly_views
+
+PENDING_VIEWS_KEY = "blog:pending-views"
+FLUSH_BATCH_SIZE = 500
+
+
+def get_redis_client():
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def add_pending_views(counts):
+    client = get_redis_client()
+    if client is not None:
+        from redis import RedisError
+
+        key = cache.make_key(PENDING_VIEWS_KEY)
+        try:
+            with client.pipeline() as pipe:
+                for post_id, count in counts.items():
+                    pipe.hincrby(key, post_id, count)
+                pipe.execute()
+        except RedisError:
+            pass
+        return
+
+    # Non-redis backends (locmem in dev, the DB cache as a fallback) only get
+    # a best-effort read-modify-write; concurrent readers may drop a view.
+    pending = cache.get(PENDING_VIEWS_KEY) or {}
+    for post_id, count in counts.items():
+        pending[post_id] = pending.get(post_id, 0) + count
+    cache.set(PENDING_VIEWS_KEY, pending, None)
+
+
+def record_view(post_id):
+    add_pending_views({post_id: 1})
+
+
+def drain_pending_views():
+    client = get_redis_client()
+    if client is not None:
+        key = cache.make_key(PENDING_VIEWS_KEY)
+        with client.pipeline() as pipe:
+            pipe.hgetall(key)
+            pipe.delete(key)
+            pending, _ = pipe.execute()
+        return {int(post_id): int(count) for post_id, count in pending.items()}
+
+    pending = cache.get(PENDING_VIEWS_KEY) or {}
+    cache.delete(PENDING_VIEWS_KEY)
+    return pending
+
+
+def apply_view_counts(counts):
+    increment = Case(
+        *[When(pk=post_id, then=Value(count)) for post_id, count in counts.items()],
+        default=Value(0),
+        output_field=PositiveIntegerField(),
+    )
+    return Post.objects.filter(pk__in=list(counts)).update(views=F("views") + increment)
+
+
+def flush_pending_views():
+    pending = drain_pending_views()
+    post_ids = sorted(pending)
+    for start in range(0, len(post_ids), FLUSH_BATCH_SIZE):
+        batch = post_ids[start:start + FLUSH_BATCH_SIZE]
+        try:
+            with transaction.atomic():
+                # Views of posts deleted since are dropped; their buckets would fail the foreign key.
+                existing = Post.objects.filter(pk__in=batch).values_list("pk", flat=True)
+                counts = {post_id: pending[post_id] for post_id in existing}
+                apply_view_counts(counts)
+                record_hourly_views(counts)
+        except Exception:
+            # The batch rolled back, so none of these counts has been applied yet.
+            add_pending_views({post_id: pending[post_id] for post_id in post_ids[start:]})
+            raise
+    return sum(pending.values())
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:20
+
+import html
+import re
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# Frozen copy of adminside.text.make_excerpt as of this migration.
+EXCERPT_WORDS = 30
+WHITESPACE_RE = re.compile(r'\s+')
+BLOCK_BOUNDARY_RE = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6]|/tr|/blockquote)\b[^>]*>', re.IGNORECASE)
+
+
+def make_excerpt(rich_html):
+    if not rich_html:
+        return ''
+    text = strip_tags(BLOCK_BOUNDARY_RE.sub(' ', rich_html))
+    text = WHITESPACE_RE.sub(' ', html.unescape(text)).strip()
+    return Truncator(text).words(EXCERPT_WORDS, truncate='…')
+
+
+def backfill_plain_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias).only('pk', 'excerpt', 'content')
+    batch = []
+    for post in posts.iterator(chunk_size=500):
+        post.plain_excerpt = make_excerpt(post.excerpt or post.content)
+        batch.append(post)
+        if len(batch) >= 500:
+            Post.objects.bulk_update(batch, ['plain_excerpt'])
+            batch = []
+    Post.objects.bulk_update(batch, ['plain_excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_trending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='plain_excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_plain_excerpts, migrations.RunPython.noop),
+    ]
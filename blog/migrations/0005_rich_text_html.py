@@ -0,0 +1,49 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+from adminside.richtext import recompile_rich_text
+
+
+def compile_rich_text_columns(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Category = apps.get_model('blog', 'Category')
+    Post = apps.get_model('blog', 'Post')
+    recompile_rich_text(Category.objects.using(alias), {'description': 'description_html'})
+    recompile_rich_text(Post.objects.using(alias), {'content': 'content_html', 'excerpt': 'excerpt_html'})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_plain_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='rich_text_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='rich_text_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(compile_rich_text_columns, migrations.RunPython.noop),
+    ]
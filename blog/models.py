@@ -1,10 +1,15 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 from django_ckeditor_5.fields import CKEditor5Field
 from taggit.managers import TaggableManager
 import shortuuid
 
+from adminside.richtext import compile_rich_text_fields
+from adminside.text import make_excerpt
+from search.indexes import SearchVectorIndex
+
 BLOG_PUBLISH_STATUS = (
     ("in_review", "In Review"),
     ("published", "Published"),
@@ -13,9 +18,13 @@ BLOG_PUBLISH_STATUS = (
 
 
 class Category(models.Model):
+    RICH_TEXT_FIELDS = {"description": "description_html"}
+
     title = models.CharField(max_length=100)
     slug = models.SlugField(max_length=100, unique=True)
     description = CKEditor5Field(config_name="default", blank=True, null=True)
+    description_html = models.TextField(blank=True, default="", editable=False)
+    rich_text_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     active = models.BooleanField(default=True)
     created = models.DateTimeField(auto_now_add=True)
 
@@ -25,6 +34,7 @@ class Category(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)[:100]
+        compile_rich_text_fields(self)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -32,29 +42,61 @@ class Category(models.Model):
 
 
 class Post(models.Model):
+    SEARCH_WEIGHTS = {"title": "A", "excerpt": "B", "content": "C"}
+    RICH_TEXT_FIELDS = {"content": "content_html", "excerpt": "excerpt_html"}
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     image = models.ImageField(upload_to="blog/", blank=True, null=True)
     title = models.CharField(max_length=1000)
     slug = models.SlugField(max_length=1000, unique=True, blank=True)
     excerpt = CKEditor5Field(config_name="default", blank=True, null=True)
     content = CKEditor5Field(config_name="default")
+    plain_excerpt = models.TextField(blank=True, default="", editable=False)
+    content_html = models.TextField(blank=True, default="", editable=False)
+    excerpt_html = models.TextField(blank=True, default="", editable=False)
+    rich_text_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
     tags = TaggableManager(blank=True)
     status = models.CharField(choices=BLOG_PUBLISH_STATUS, max_length=100, default="in_review")
     featured = models.BooleanField(default=False)
     trending = models.BooleanField(default=False)
     views = models.PositiveIntegerField(default=0)
+    trending_score = models.FloatField(default=0, editable=False)
     pid = models.CharField(max_length=25, unique=True, editable=False, default=shortuuid.uuid)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-created"]
+        indexes = [
+            SearchVectorIndex(fields=["search_vector"], name="post_search_idx"),
+            models.Index(fields=["status", "trending", "-created"], name="post_trending_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)[:1000]
+        self.plain_excerpt = make_excerpt(self.excerpt or self.content)
+        compile_rich_text_fields(self)
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
+
+
+class PostViewBucket(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="view_buckets")
+    hour = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["post", "hour"], name="post_view_bucket_unique_hour"),
+        ]
+        indexes = [
+            models.Index(fields=["hour"], name="post_view_bucket_hour_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} @ {self.hour:%Y-%m-%d %H:00}"
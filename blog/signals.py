@@ -0,0 +1,20 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from adminside.cache import bump_listing_version
+
+from .models import Category, Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_blog_listing(sender, **kwargs):
+    bump_listing_version("posts")
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_blog_tags(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_listing_version("posts")
@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from .counters import flush_pending_views
+from .trending import refresh_trending
+
+
+@shared_task
+def flush_post_views():
+    return flush_pending_views()
+
+
+@shared_task
+def update_trending_posts():
+    return refresh_trending()
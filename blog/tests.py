@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta, timezone
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .counters import flush_pending_views, record_view
+from .models import Category, Post, PostViewBucket
+from .trending import SCORED_THROUGH_KEY, record_hourly_views, recompute_scores, refresh_trending, update_scores
+
+
+class BlogViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(title="Safari Notes")
+        self.post = Post.objects.create(
+            title="Crossing the Mara",
+            content="<p>River crossings</p>",
+            category=self.category,
+            status="published",
+        )
+        self.post.tags.add("migration")
+        Post.objects.create(title="Unfinished draft", content="<p>Soon</p>", status="draft")
+
+    def test_list_shows_only_published_posts(self):
+        response = self.client.get(reverse("blog"))
+
+        self.assertContains(response, "Crossing the Mara")
+        self.assertNotContains(response, "Unfinished draft")
+
+    def test_list_shows_plain_excerpt_without_loading_rich_text(self):
+        response = self.client.get(reverse("blog"))
+
+        self.assertContains(response, "River crossings")
+        post = response.context["posts"].object_list[0]
+        self.assertTrue({"content", "excerpt"} <= post.get_deferred_fields())
+
+    def test_list_is_served_from_cache(self):
+        self.client.get(reverse("blog"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("blog"))
+
+        self.assertContains(response, "#migration")
+
+    def test_category_and_tag_pages(self):
+        category_response = self.client.get(reverse("blog-category", args=[self.category.slug]))
+        tag_response = self.client.get(reverse("blog-tag", args=["migration"]))
+
+        self.assertContains(category_response, "Crossing the Mara")
+        self.assertContains(tag_response, "Crossing the Mara")
+
+    def test_post_save_invalidates_cached_list(self):
+        self.client.get(reverse("blog"))
+
+        self.post.title = "Crossing the Grumeti"
+        self.post.save()
+
+        self.assertContains(self.client.get(reverse("blog")), "Crossing the Grumeti")
+
+    def test_detail_views_are_buffered_until_flushed(self):
+        for _ in range(3):
+            response = self.client.get(reverse("blog-detail", args=[self.post.slug]))
+            self.assertEqual(response.status_code, 200)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+
+        self.assertEqual(flush_pending_views(), 3)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 3)
+
+    def test_flush_updates_counters_and_hourly_buckets_in_bulk(self):
+        other = Post.objects.create(title="Diani tides", content="<p>Beach</p>", status="published")
+        record_view(self.post.pk)
+        record_view(other.pk)
+        record_view(other.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            flush_pending_views()
+
+        statements = [query["sql"].split()[0] for query in queries if "SAVEPOINT" not in query["sql"]]
+        self.assertEqual(statements, ["SELECT", "UPDATE", "INSERT", "UPDATE"])
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views, 1)
+        self.assertEqual(Post.objects.get(pk=other.pk).views, 2)
+        self.assertEqual(PostViewBucket.objects.get(post=other).views, 2)
+
+    def test_flush_drops_views_of_deleted_posts(self):
+        doomed = Post.objects.create(title="Gone soon", content="<p>Bye</p>", status="published")
+        record_view(self.post.pk)
+        record_view(doomed.pk)
+        doomed.delete()
+
+        flush_pending_views()
+        flush_pending_views()
+
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views, 1)
+        self.assertEqual(PostViewBucket.objects.get(post=self.post).views, 1)
+        self.assertFalse(PostViewBucket.objects.filter(post_id=doomed.pk).exists())
+
+    def test_flush_adds_to_a_bucket_created_concurrently(self):
+        hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        PostViewBucket.objects.create(post=self.post, hour=hour, views=4)
+        record_view(self.post.pk)
+
+        flush_pending_views()
+
+        self.assertEqual(PostViewBucket.objects.get(post=self.post).views, 5)
+
+    def test_draft_detail_is_not_found(self):
+        response = self.client.get(reverse("blog-detail", args=["unfinished-draft"]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(TRENDING_WINDOW_HOURS=72, TRENDING_HALF_LIFE_HOURS=12, TRENDING_POSTS_COUNT=2)
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+        self.old = Post.objects.create(title="Old favourite", content="<p>x</p>", status="published")
+        self.fresh = Post.objects.create(title="Fresh story", content="<p>x</p>", status="published")
+        self.steady = Post.objects.create(title="Steady read", content="<p>x</p>", status="published")
+        self.draft = Post.objects.create(title="Draft", content="<p>x</p>", status="draft")
+
+    def hours_ago(self, hours):
+        return self.now - timedelta(hours=hours)
+
+    def test_recent_views_outrank_older_views(self):
+        record_hourly_views({self.old.pk: 100}, now=self.hours_ago(48))
+        record_hourly_views({self.fresh.pk: 40, self.draft.pk: 500}, now=self.hours_ago(2))
+        record_hourly_views({self.steady.pk: 20}, now=self.hours_ago(3))
+
+        top = refresh_trending(now=self.now)
+
+        self.assertEqual(top, [self.fresh.pk, self.steady.pk])
+        self.assertEqual(
+            set(Post.objects.filter(trending=True).values_list("pk", flat=True)),
+            {self.fresh.pk, self.steady.pk},
+        )
+
+    def test_hourly_buckets_accumulate(self):
+        record_hourly_views({self.fresh.pk: 2}, now=self.now)
+        record_hourly_views({self.fresh.pk: 3}, now=self.now + timedelta(minutes=10))
+
+        self.assertEqual(PostViewBucket.objects.get().views, 5)
+
+    def test_incremental_update_matches_full_recompute(self):
+        record_hourly_views({self.old.pk: 30, self.fresh.pk: 5}, now=self.hours_ago(10))
+        recompute_scores(now=self.hours_ago(5))
+        record_hourly_views({self.fresh.pk: 25}, now=self.hours_ago(4))
+        record_hourly_views({self.old.pk: 3}, now=self.hours_ago(1))
+
+        update_scores(now=self.now)
+        incremental = dict(Post.objects.values_list("pk", "trending_score"))
+
+        cache.delete(SCORED_THROUGH_KEY)
+        update_scores(now=self.now)
+        full = dict(Post.objects.values_list("pk", "trending_score"))
+
+        for pk, score in full.items():
+            self.assertAlmostEqual(incremental[pk], score, places=6)
+
+    def test_old_buckets_are_pruned(self):
+        record_hourly_views({self.old.pk: 1}, now=self.hours_ago(100))
+
+        refresh_trending(now=self.now)
+
+        self.assertFalse(PostViewBucket.objects.exists())
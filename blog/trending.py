@@ -0,0 +1,142 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, FloatField, PositiveIntegerField, Q, Value, When
+from django.utils import timezone
+
+from adminside.cache import bump_listing_version
+
+from .models import Post, PostViewBucket
+
+SCORED_THROUGH_KEY = "blog:trending-scored-through"
+SCORE_FLOOR = 0.01
+BATCH_SIZE = 500
+
+
+def truncate_to_hour(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def hours_between(start, end):
+    return (end - start).total_seconds() / 3600
+
+
+def decay(hours):
+    return 0.5 ** (hours / settings.TRENDING_HALF_LIFE_HOURS)
+
+
+def record_hourly_views(counts, now=None):
+    if not counts:
+        return
+    hour = truncate_to_hour(now or timezone.now())
+    post_ids = sorted(counts)
+    # Make sure every (post, hour) row exists, then add to all of them in one
+    # UPDATE; a row a concurrent flush created first is incremented, not replaced.
+    PostViewBucket.objects.bulk_create(
+        [PostViewBucket(post_id=post_id, hour=hour, views=0) for post_id in post_ids],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    increment = Case(
+        *[When(post_id=post_id, then=Value(count)) for post_id, count in counts.items()],
+        default=Value(0),
+        output_field=PositiveIntegerField(),
+    )
+    PostViewBucket.objects.filter(hour=hour, post_id__in=post_ids).update(views=F("views") + increment)
+
+
+def weighted_bucket_views(since, until):
+    totals = defaultdict(float)
+    buckets = PostViewBucket.objects.filter(hour__gte=since, hour__lt=until).values_list(
+        "post_id", "hour", "views"
+    )
+    for post_id, hour, views in buckets.iterator(chunk_size=2000):
+        totals[post_id] += views * decay(hours_between(hour, until))
+    return totals
+
+
+def write_scores(scores):
+    post_ids = sorted(scores)
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        batch = post_ids[start:start + BATCH_SIZE]
+        score = Case(
+            *[When(pk=post_id, then=Value(scores[post_id])) for post_id in batch],
+            output_field=FloatField(),
+        )
+        Post.objects.filter(pk__in=batch).update(trending_score=score)
+
+
+def add_scores(increments):
+    post_ids = sorted(increments)
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        batch = post_ids[start:start + BATCH_SIZE]
+        increment = Case(
+            *[When(pk=post_id, then=Value(increments[post_id])) for post_id in batch],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        Post.objects.filter(pk__in=batch).update(trending_score=F("trending_score") + increment)
+
+
+def recompute_scores(now=None):
+    scored_through = truncate_to_hour(now or timezone.now())
+    window_start = scored_through - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+
+    scores = weighted_bucket_views(window_start, scored_through)
+    Post.objects.filter(trending_score__gt=0).exclude(pk__in=list(scores)).update(trending_score=0)
+    write_scores(scores)
+
+    cache.set(SCORED_THROUGH_KEY, scored_through, None)
+    return scored_through
+
+
+def update_scores(now=None):
+    scored_through = truncate_to_hour(now or timezone.now())
+    previous = cache.get(SCORED_THROUGH_KEY)
+
+    if previous is None or hours_between(previous, scored_through) > settings.TRENDING_WINDOW_HOURS:
+        return recompute_scores(now)
+    if previous >= scored_through:
+        return previous
+
+    Post.objects.filter(trending_score__gt=0).update(
+        trending_score=F("trending_score") * decay(hours_between(previous, scored_through))
+    )
+    Post.objects.filter(trending_score__gt=0, trending_score__lt=SCORE_FLOOR).update(trending_score=0)
+    add_scores(weighted_bucket_views(previous, scored_through))
+
+    cache.set(SCORED_THROUGH_KEY, scored_through, None)
+    return scored_through
+
+
+def prune_buckets(now=None):
+    cutoff = truncate_to_hour(now or timezone.now()) - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    return PostViewBucket.objects.filter(hour__lt=cutoff).delete()[0]
+
+
+def select_trending(limit=None):
+    limit = limit or settings.TRENDING_POSTS_COUNT
+    return list(
+        Post.objects.filter(status="published", trending_score__gt=0)
+        .order_by("-trending_score", "-created")
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+def apply_trending(post_ids):
+    return Post.objects.filter(Q(trending=True) | Q(pk__in=post_ids)).update(
+        trending=Case(When(pk__in=post_ids, then=Value(True)), default=Value(False))
+    )
+
+
+def refresh_trending(now=None):
+    update_scores(now)
+    prune_buckets(now)
+    top = select_trending()
+    current = set(Post.objects.filter(trending=True).values_list("pk", flat=True))
+    if current != set(top):
+        apply_trending(top)
+        bump_listing_version("posts")
+    return top
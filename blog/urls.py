@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('', views.post_list, name='blog'),
+    path('category/<slug:slug>/', views.category_posts, name='blog-category'),
+    path('tag/<slug:slug>/', views.tag_posts, name='blog-tag'),
+    path('<slug:slug>/', views.post_detail, name='blog-detail'),
+]
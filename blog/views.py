@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.shortcuts import aget_object_or_404, get_object_or_404, render
+from taggit.models import Tag
+
+from adminside.cache import aload_listing_page, alisting_cache_context, listing_cache_context
+from adminside.pagination import KeysetPage
+from adminside.views import arender
+
+from .counters import record_view
+from .models import Category, Post
+
+
+def published_posts():
+    return (
+        Post.objects.filter(status="published")
+        .select_related("user", "category")
+        .prefetch_related("tags")
+        .defer("content", "excerpt", "content_html", "excerpt_html", "search_vector")
+    )
+
+
+async def render_post_list(request, queryset, extra_context=None):
+    page = KeysetPage(
+        queryset,
+        settings.LISTING_PAGE_SIZE,
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+        field="created",
+    )
+    context = {"posts": page, **await alisting_cache_context("posts"), **(extra_context or {})}
+    await aload_listing_page(page, "post_grid", context["listing_version"], context["listing_key"])
+    return await arender(request, "pages/blog.html", context)
+
+
+async def post_list(request):
+    return await render_post_list(request, published_posts(), {"listing_key": "all"})
+
+
+async def category_posts(request, slug):
+    category = await aget_object_or_404(Category, slug=slug, active=True)
+    return await render_post_list(
+        request,
+        published_posts().filter(category=category),
+        {"category": category, "listing_key": f"category:{category.pk}"},
+    )
+
+
+async def tag_posts(request, slug):
+    tag = await aget_object_or_404(Tag, slug=slug)
+    return await render_post_list(
+        request,
+        published_posts().filter(tags__slug=tag.slug),
+        {"tag": tag, "listing_key": f"tag:{tag.pk}"},
+    )
+
+
+def post_detail(request, slug):
+    post = get_object_or_404(
+        Post.objects.select_related("user", "category").defer("content", "excerpt", "search_vector"),
+        slug=slug,
+        status="published",
+    )
+    record_view(post.pk)
+    context = {"post": post, **listing_cache_context("posts")}
+    return render(request, "pages/blog-detail.html", context)
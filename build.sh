@@ -3,6 +3,7 @@ set -euo pipefail
 
 python3 -m pip install --upgrade pip
 pip install -r requirements.txt
+TAILWINDCSS_VERSION="${TAILWINDCSS_VERSION:-v3.4.17}" tailwindcss -c tailwind.config.js -i assets/site.css -o static/css/site.css --minify
 python3 manage.py collectstatic --noinput --settings=tours_travels.settings_prod
 python3 manage.py migrate --settings=tours_travels.settings_prod
 python3 manage.py createcachetable --settings=tours_travels.settings_prod
\ No newline at end of file
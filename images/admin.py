@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from .models import ImageRendition, ImageSource
+from .tasks import process_image_source
+
+
+class ImageRenditionInline(admin.TabularInline):
+    model = ImageRendition
+    extra = 0
+    can_delete = False
+    fields = ("format", "width", "height", "file")
+    readonly_fields = fields
+
+
+@admin.register(ImageSource)
+class ImageSourceAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "status", "width", "height", "processed_at", "created_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("url", "file_name")
+    readonly_fields = ("key", "status", "width", "height", "error", "processed_at", "created_at")
+    inlines = (ImageRenditionInline,)
+    actions = ("reprocess",)
+
+    @admin.action(description="Regenerate renditions")
+    def reprocess(self, request, queryset):
+        for source in queryset:
+            process_image_source.delay(source.pk, ["packages", "hotels", "posts"])
+        self.message_user(request, f"Queued {queryset.count()} image(s).")
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ImagesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'images'
+    verbose_name = "Images"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,42 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from adminside.models import Hotel, Package
+from blog.models import Post
+from images.models import ImageSource
+from images.services import get_or_create_file_source, get_or_create_source, read_file, rendition_storage
+from images.tasks import process_image_source
+
+IMAGE_MODELS = (
+    (Package, "packages"),
+    (Hotel, "hotels"),
+)
+
+
+class Command(BaseCommand):
+    help = "Register listing and blog images and generate responsive renditions for them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true", help="Reprocess sources that failed before")
+
+    def handle(self, *args, **options):
+        if rendition_storage() is None:
+            self.stdout.write(self.style.WARNING("IMAGE_RENDITION_STORAGE is not set; no renditions to generate."))
+            return
+
+        for model, _ in IMAGE_MODELS:
+            urls = model.objects.exclude(image_url="").values_list("image_url", flat=True).distinct()
+            for url in urls.iterator():
+                get_or_create_source(url)
+        for name in Post.objects.exclude(image="").exclude(image=None).values_list("image", flat=True).iterator():
+            source, created = get_or_create_file_source(name)
+            if created and default_storage.exists(name):
+                source.data = read_file(default_storage.open(name))
+                source.save(update_fields=["data"])
+
+        statuses = ["pending", "failed"] if options["retry_failed"] else ["pending"]
+        listings = [listing for _, listing in IMAGE_MODELS] + ["posts"]
+        source_ids = list(ImageSource.objects.filter(status__in=statuses).values_list("pk", flat=True))
+        for source_id in source_ids:
+            process_image_source.delay(source_id, listings)
+        self.stdout.write(self.style.SUCCESS(f"Queued {len(source_ids)} image(s) for processing."))
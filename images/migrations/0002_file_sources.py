@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagesource',
+            name='file_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='imagesource',
+            name='url',
+            field=models.URLField(blank=True, default='', max_length=1000),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0002_file_sources'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagesource',
+            name='data',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+    ]
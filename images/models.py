@@ -0,0 +1,64 @@
+import hashlib
+
+from django.db import models
+
+IMAGE_SOURCE_STATUS = (
+    ("pending", "Pending"),
+    ("ready", "Ready"),
+    ("failed", "Failed"),
+)
+
+RENDITION_FORMATS = (
+    ("webp", "WebP"),
+    ("jpeg", "JPEG"),
+)
+
+
+def source_key(reference):
+    return hashlib.sha256(reference.encode()).hexdigest()
+
+
+def file_source_key(name):
+    return source_key(f"storage:{name}")
+
+
+class ImageSource(models.Model):
+    key = models.CharField(max_length=64, unique=True, editable=False)
+    url = models.URLField(max_length=1000, blank=True, default="")
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    # Uploaded bytes for the worker, which does not share the web disk; cleared once processed.
+    data = models.BinaryField(blank=True, default=b"", editable=False)
+    status = models.CharField(choices=IMAGE_SOURCE_STATUS, max_length=20, default="pending")
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = file_source_key(self.file_name) if self.file_name else source_key(self.url)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.file_name or self.url
+
+
+class ImageRendition(models.Model):
+    source = models.ForeignKey(ImageSource, on_delete=models.CASCADE, related_name="renditions")
+    format = models.CharField(choices=RENDITION_FORMATS, max_length=10)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    file = models.FileField(upload_to="renditions/", max_length=255)
+
+    class Meta:
+        ordering = ["width"]
+        constraints = [
+            models.UniqueConstraint(fields=["source", "format", "width"], name="image_rendition_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.format} {self.width}w"
@@ -0,0 +1,125 @@
+import io
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import ImageRendition
+from .services import rendition_storage
+
+RENDITION_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+RENDITION_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+
+class ImageSourceError(Exception):
+    pass
+
+
+def fetch_image(url):
+    content = bytearray()
+    with requests.get(url, timeout=settings.IMAGE_FETCH_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            content.extend(chunk)
+            if len(content) > settings.IMAGE_SOURCE_MAX_BYTES:
+                raise ImageSourceError(f"Source is larger than {settings.IMAGE_SOURCE_MAX_BYTES} bytes")
+    return bytes(content)
+
+
+def open_image(data):
+    image = Image.open(io.BytesIO(data))
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def rendition_widths(original_width):
+    widths = settings.IMAGE_RENDITION_WIDTHS
+    return sorted({width for width in widths if width < original_width} | {min(original_width, max(widths))})
+
+
+def encode_rendition(image, width, format):
+    height = max(1, round(image.height * width / image.width))
+    if width != image.width:
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    # Pillow only writes EXIF when passed explicitly, so renditions are stripped.
+    image.save(buffer, **RENDITION_OPTIONS[format])
+    return buffer.getvalue(), height
+
+
+def rendition_name(source, width, format):
+    return f"renditions/{source.key[:2]}/{source.key[:20]}-{width}.{RENDITION_EXTENSIONS[format]}"
+
+
+def store_rendition(name, content):
+    storage = rendition_storage()
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(content))
+
+
+def generate_renditions(source, image):
+    renditions = []
+    for width in rendition_widths(image.width):
+        for format in RENDITION_OPTIONS:
+            content, height = encode_rendition(image, width, format)
+            renditions.append(
+                ImageRendition(
+                    source=source,
+                    format=format,
+                    width=width,
+                    height=height,
+                    file=store_rendition(rendition_name(source, width, format), content),
+                )
+            )
+
+    with transaction.atomic():
+        source.renditions.all().delete()
+        ImageRendition.objects.bulk_create(renditions)
+        source.width, source.height = image.size
+        source.status = "ready"
+        source.error = ""
+        source.data = b""
+        source.processed_at = timezone.now()
+        source.save(update_fields=["width", "height", "status", "error", "data", "processed_at"])
+    return renditions
+
+
+def read_stored_image(name):
+    with default_storage.open(name) as stored:
+        return stored.read(settings.IMAGE_SOURCE_MAX_BYTES + 1)
+
+
+def load_source(source):
+    if source.data or source.file_name:
+        data = bytes(source.data) or read_stored_image(source.file_name)
+        if len(data) > settings.IMAGE_SOURCE_MAX_BYTES:
+            raise ImageSourceError(f"Source is larger than {settings.IMAGE_SOURCE_MAX_BYTES} bytes")
+        return data
+    return fetch_image(source.url)
+
+
+def process_source(source):
+    if rendition_storage() is None:
+        return False
+
+    try:
+        image = open_image(load_source(source))
+    except (requests.RequestException, ImageSourceError, OSError, Image.DecompressionBombError) as exc:
+        source.status = "failed"
+        source.error = f"{exc.__class__.__name__}: {exc}"
+        source.processed_at = timezone.now()
+        source.save(update_fields=["status", "error", "processed_at"])
+        return False
+
+    generate_renditions(source, image)
+    return True
@@ -0,0 +1,131 @@
+import functools
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import ImageRendition, ImageSource, file_source_key, source_key
+
+
+def renditions_cache_key(key):
+    return f"renditions:{key}"
+
+
+@functools.lru_cache(maxsize=None)
+def load_storage(path):
+    return import_string(path)()
+
+
+def rendition_storage():
+    """
+    Storage renditions are written to and served from, or None when there is
+    none the worker and the public site both reach; pages then keep the
+    original image.
+    """
+    path = settings.IMAGE_RENDITION_STORAGE
+    return load_storage(path) if path else None
+
+
+def get_or_create_source(url):
+    return ImageSource.objects.get_or_create(key=source_key(url), defaults={"url": url})
+
+
+def get_or_create_file_source(name):
+    return ImageSource.objects.get_or_create(key=file_source_key(name), defaults={"file_name": name})
+
+
+def queue_processing(source, listings=()):
+    from .tasks import process_image_source
+
+    if rendition_storage() is None:
+        return
+    transaction.on_commit(lambda: process_image_source.delay(source.pk, list(listings)))
+
+
+def register_image(url, listings=()):
+    if not url:
+        return None
+
+    source, created = get_or_create_source(url)
+    if created:
+        queue_processing(source, listings)
+    return source
+
+
+def read_file(content):
+    # One byte past the limit is enough for the worker to reject the file.
+    with content.open("rb") as opened:
+        return opened.read(settings.IMAGE_SOURCE_MAX_BYTES + 1)
+
+
+def register_file(name, listings=(), content=None):
+    # Without rendition storage nothing would ever process the upload or
+    # clear its bytes, so don't record it at all.
+    if not name or rendition_storage() is None:
+        return None
+
+    source, created = get_or_create_file_source(name)
+    if created:
+        if content is not None:
+            source.data = read_file(content)
+            source.save(update_fields=["data"])
+        queue_processing(source, listings)
+    return source
+
+
+def media_name(url):
+    """Storage name for a URL under MEDIA_URL, or None for anything else."""
+    if not url or not url.startswith(settings.MEDIA_URL):
+        return None
+    return unquote(url[len(settings.MEDIA_URL):])
+
+
+def load_renditions(keys):
+    renditions = {key: [] for key in keys}
+    storage = rendition_storage()
+    if storage is None:
+        return renditions
+    rows = ImageRendition.objects.filter(source__key__in=keys, source__status="ready").values_list(
+        "source__key", "format", "width", "height", "file"
+    )
+    for key, format, width, height, name in rows.order_by("width"):
+        renditions[key].append(
+            {"format": format, "width": width, "height": height, "url": storage.url(name)}
+        )
+    return renditions
+
+
+def get_renditions_for_keys(keys):
+    keys = list(dict.fromkeys(keys))
+    cached = cache.get_many([renditions_cache_key(key) for key in keys])
+    renditions = {key: cached[renditions_cache_key(key)] for key in keys if renditions_cache_key(key) in cached}
+
+    missing = [key for key in keys if key not in renditions]
+    if missing:
+        loaded = load_renditions(missing)
+        cache.set_many(
+            {renditions_cache_key(key): value for key, value in loaded.items()},
+            settings.IMAGE_RENDITION_CACHE_TIMEOUT,
+        )
+        renditions.update(loaded)
+    return renditions
+
+
+def get_renditions(url):
+    if not url:
+        return []
+    key = source_key(url)
+    return get_renditions_for_keys([key])[key]
+
+
+def get_file_renditions(name):
+    if not name:
+        return []
+    key = file_source_key(name)
+    return get_renditions_for_keys([key])[key]
+
+
+def forget_renditions(source):
+    cache.delete(renditions_cache_key(source.key))
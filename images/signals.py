@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from adminside.models import Hotel, Package
+from blog.models import Post
+
+from .services import register_file, register_image
+
+IMAGE_LISTINGS = {
+    Package: "packages",
+    Hotel: "hotels",
+}
+
+
+@receiver(post_save, sender=Package)
+@receiver(post_save, sender=Hotel)
+def register_listing_image(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    register_image(instance.image_url, listings=[IMAGE_LISTINGS[sender]])
+
+
+@receiver(post_save, sender=Post)
+def register_post_image(sender, instance, raw=False, **kwargs):
+    if raw or not instance.image:
+        return
+    register_file(instance.image.name, listings=["posts"], content=instance.image)
@@ -0,0 +1,76 @@
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from PIL import Image, features
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from .services import register_file
+
+PICTURE_FORMATS = {
+    "avif": {"format": "AVIF", "quality": 90, "speed": 4},
+    "webp": {"format": "WEBP", "lossless": True, "method": 6},
+    "png": {"format": "PNG", "optimize": True},
+}
+PICTURE_DENSITIES = (1, 2)
+
+
+def picture_formats():
+    return [format for format in PICTURE_FORMATS if format != "avif" or features.check("avif")]
+
+
+def picture_variant_name(name, height, format):
+    root, _ = os.path.splitext(name)
+    return f"{root}.{height}h.{format}"
+
+
+class CKEditorUploadStorage(FileSystemStorage):
+    """Stores editor uploads under ckeditor/ and queues their renditions."""
+
+    upload_prefix = "ckeditor/"
+
+    def save(self, name, content, max_length=None):
+        name = super().save(f"{self.upload_prefix}{name}", content, max_length=max_length)
+        register_file(name, listings=["posts"], content=content)
+        return name
+
+
+class PictureStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    Writes resized PNG, WebP and AVIF variants of the images listed in
+    STATIC_PICTURES before hashing, so they get fingerprinted and far-future
+    cached like every other static file.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name, heights in getattr(settings, "STATIC_PICTURES", {}).items():
+                if name in paths:
+                    for variant in self.write_picture_variants(paths[name], name, heights):
+                        paths[variant] = (self, variant)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def write_picture_variants(self, source, name, heights):
+        storage, path = source
+        with storage.open(path) as original:
+            image = Image.open(original)
+            image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+
+        variants = []
+        for height in sorted({height * density for height in heights for density in PICTURE_DENSITIES}):
+            height = min(height, image.height)
+            width = max(1, round(image.width * height / image.height))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            for format in picture_formats():
+                buffer = io.BytesIO()
+                resized.save(buffer, **PICTURE_FORMATS[format])
+                variant = picture_variant_name(name, height, format)
+                if self.exists(variant):
+                    self.delete(variant)
+                self.save(variant, ContentFile(buffer.getvalue()))
+                variants.append(variant)
+        return variants
@@ -0,0 +1,21 @@
+from celery import shared_task
+
+from adminside.cache import bump_listing_version
+
+from .models import ImageSource
+from .processing import process_source
+from .services import forget_renditions
+
+
+@shared_task
+def process_image_source(source_id, listings=()):
+    source = ImageSource.objects.filter(pk=source_id).first()
+    if source is None:
+        return False
+
+    processed = process_source(source)
+    forget_renditions(source)
+    # Rendered pages embed the srcset, so refresh the listings that show this image.
+    for name in listings:
+        bump_listing_version(name)
+    return processed
@@ -0,0 +1,134 @@
+import functools
+import re
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from PIL import Image
+
+from images.models import file_source_key
+from images.services import get_file_renditions, get_renditions, get_renditions_for_keys, media_name
+from images.storage import PICTURE_DENSITIES, picture_formats, picture_variant_name
+
+register = template.Library()
+
+IMG_TAG_RE = re.compile(r"<img\b(?P<attrs>[^>]*?)\s*/?>", re.IGNORECASE)
+SRC_ATTR_RE = re.compile(r"""\ssrc=(["'])(?P<src>[^"']+)\1""", re.IGNORECASE)
+
+
+def build_srcset(renditions):
+    return ", ".join(f"{rendition['url']} {rendition['width']}w" for rendition in renditions)
+
+
+def split_renditions(renditions):
+    webp = [rendition for rendition in renditions if rendition["format"] == "webp"]
+    jpeg = [rendition for rendition in renditions if rendition["format"] == "jpeg"]
+    return webp, jpeg
+
+
+def image_renditions(image):
+    # Accepts a remote URL or a stored file (e.g. Post.image).
+    if hasattr(image, "name"):
+        if not image:
+            return "", []
+        return image.url, get_file_renditions(image.name)
+    return image, get_renditions(image)
+
+
+@register.inclusion_tag("images/responsive_image.html")
+def responsive_image(image, alt="", sizes="100vw", **attrs):
+    attrs.setdefault("loading", "lazy")
+    attrs.setdefault("decoding", "async")
+    url, renditions = image_renditions(image)
+    webp, jpeg = split_renditions(renditions)
+    largest = jpeg[-1] if jpeg else None
+
+    return {
+        "src": largest["url"] if largest else url,
+        "alt": alt,
+        "sizes": sizes,
+        "webp_srcset": build_srcset(webp),
+        "jpeg_srcset": build_srcset(jpeg),
+        "width": largest["width"] if largest else None,
+        "height": largest["height"] if largest else None,
+        "attrs": attrs,
+    }
+
+
+@register.filter
+def responsive_images(html, sizes="100vw"):
+    """Point uploaded <img> tags in trusted rich text at their WebP renditions."""
+    if not html:
+        return mark_safe(html or "")
+
+    names = {}
+    for match in IMG_TAG_RE.finditer(html):
+        src = SRC_ATTR_RE.search(match.group("attrs"))
+        name = media_name(src.group("src")) if src else None
+        if name:
+            names[src.group("src")] = file_source_key(name)
+    if not names:
+        return mark_safe(html)
+
+    renditions = get_renditions_for_keys(names.values())
+
+    def rewrite(match):
+        attrs = match.group("attrs")
+        src = SRC_ATTR_RE.search(attrs)
+        webp, _ = split_renditions(renditions.get(names.get(src.group("src")) if src else None, []))
+        if not webp or "srcset=" in attrs.lower():
+            return match.group(0)
+        attrs = SRC_ATTR_RE.sub(f' src="{escape(webp[-1]["url"])}"', attrs, count=1)
+        extra = f' srcset="{escape(build_srcset(webp))}" sizes="{escape(sizes)}"'
+        if "loading=" not in attrs.lower():
+            extra += ' loading="lazy"'
+        if "width=" not in attrs.lower():
+            extra += f' width="{webp[-1]["width"]}" height="{webp[-1]["height"]}"'
+        return f"<img{attrs}{extra}>"
+
+    return mark_safe(IMG_TAG_RE.sub(rewrite, html))
+
+
+@functools.lru_cache(maxsize=None)
+def picture_variants(name, height):
+    """Width and per-format density srcsets written by PictureStaticFilesStorage."""
+    base = picture_variant_name(name, height, "png")
+    if settings.DEBUG or not staticfiles_storage.exists(base):
+        return None
+
+    with staticfiles_storage.open(base) as variant:
+        width = Image.open(variant).width
+    srcsets = {}
+    for format in picture_formats():
+        candidates = [
+            (density, picture_variant_name(name, height * density, format)) for density in PICTURE_DENSITIES
+        ]
+        srcsets[format] = ", ".join(
+            f"{static(variant)} {density}x"
+            for density, variant in candidates
+            if staticfiles_storage.exists(variant)
+        )
+    return width, srcsets
+
+
+@register.inclusion_tag("images/static_picture.html")
+def static_picture(name, height, alt="", **attrs):
+    variants = picture_variants(name, int(height))
+    if variants is None:
+        return {"src": static(name), "alt": alt, "attrs": attrs}
+
+    width, srcsets = variants
+    return {
+        "src": static(picture_variant_name(name, int(height), "png")),
+        "srcset": srcsets["png"],
+        "sources": [
+            (f"image/{format}", srcset) for format, srcset in srcsets.items() if format != "png" and srcset
+        ],
+        "width": width,
+        "height": height,
+        "alt": alt,
+        "attrs": attrs,
+    }
@@ -0,0 +1,300 @@
+import io
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from adminside.models import Package
+from blog.models import Post
+
+from .models import ImageSource
+from .storage import (
+    CKEditorUploadStorage,
+    PictureStaticFilesStorage,
+    picture_formats,
+    picture_variant_name,
+)
+from .templatetags.image_tags import picture_variants
+
+
+def make_jpeg(size=(1000, 500)):
+    image = Image.new("RGB", size, (243, 129, 32))
+    exif = Image.Exif()
+    exif[0x010F] = "Test Camera"
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+class StubImageServer:
+    """Serves canned responses on localhost so tests never touch the network."""
+
+    def __init__(self, routes):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, content_type, body = routes.get(self.path, (404, "text/plain", b"missing"))
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MediaRootMixin:
+    def use_temporary_media_root(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    IMAGE_RENDITION_WIDTHS=[320, 640, 1280],
+    IMAGE_RENDITION_STORAGE="django.core.files.storage.FileSystemStorage",
+)
+class RenditionTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.use_temporary_media_root()
+
+        self.stub = StubImageServer({
+            "/safari.jpg": (200, "image/jpeg", make_jpeg()),
+            "/broken.jpg": (200, "image/jpeg", b"not an image"),
+        })
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__)
+
+    def create_package(self, path):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Package.objects.create(title=f"Safari {path}", image_url=self.stub.url(path))
+
+    def test_saving_listing_generates_renditions(self):
+        self.create_package("/safari.jpg")
+
+        source = ImageSource.objects.get()
+        self.assertEqual(source.status, "ready")
+        self.assertEqual((source.width, source.height), (1000, 500))
+        self.assertEqual(
+            sorted(source.renditions.values_list("format", "width", "height")),
+            [
+                ("jpeg", 320, 160), ("jpeg", 640, 320), ("jpeg", 1000, 500),
+                ("webp", 320, 160), ("webp", 640, 320), ("webp", 1000, 500),
+            ],
+        )
+        for rendition in source.renditions.all():
+            with default_storage.open(rendition.file.name) as stored:
+                image = Image.open(stored)
+                self.assertEqual(image.width, rendition.width)
+                self.assertFalse(image.getexif())
+
+    def test_listing_renders_srcset(self):
+        self.create_package("/safari.jpg")
+
+        response = self.client.get(reverse("packages"))
+
+        self.assertContains(response, '<source type="image/webp" srcset="/media/renditions/')
+        self.assertContains(response, '640w')
+        self.assertContains(response, 'width="1000" height="500"')
+        self.assertContains(response, 'loading="lazy"')
+
+    def test_unprocessed_image_falls_back_to_source_url(self):
+        url = self.stub.url("/safari.jpg")
+        html = Template("{% load image_tags %}{% responsive_image url alt='Safari' %}").render(Context({"url": url}))
+
+        self.assertIn(f'src="{url}"', html)
+        self.assertNotIn("srcset", html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_unreadable_source_is_marked_failed(self):
+        self.create_package("/broken.jpg")
+        self.create_package("/missing.jpg")
+
+        self.assertEqual(ImageSource.objects.filter(status="failed").count(), 2)
+        self.assertFalse(ImageSource.objects.filter(renditions__isnull=False).exists())
+
+    @override_settings(IMAGE_RENDITION_STORAGE="")
+    def test_listing_keeps_source_url_without_rendition_storage(self):
+        self.create_package("/safari.jpg")
+
+        self.assertFalse(ImageSource.objects.filter(status="ready").exists())
+        response = self.client.get(reverse("packages"))
+        self.assertContains(response, f'src="{self.stub.url("/safari.jpg")}"')
+        self.assertNotContains(response, "/media/renditions/")
+
+    @override_settings(IMAGE_SOURCE_MAX_BYTES=100)
+    def test_oversized_source_is_rejected(self):
+        self.create_package("/safari.jpg")
+
+        source = ImageSource.objects.get()
+        self.assertEqual(source.status, "failed")
+        self.assertIn("larger than", source.error)
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    IMAGE_RENDITION_WIDTHS=[320, 640, 1280],
+    IMAGE_RENDITION_STORAGE="django.core.files.storage.FileSystemStorage",
+)
+class UploadRenditionTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.use_temporary_media_root()
+
+    def create_post(self, execute=True):
+        with self.captureOnCommitCallbacks(execute=execute):
+            return Post.objects.create(
+                title="Mara diary",
+                content="<p>x</p>",
+                status="published",
+                image=SimpleUploadedFile("mara.jpg", make_jpeg((2000, 1000)), content_type="image/jpeg"),
+            )
+
+    def render_image(self, post):
+        template = Template("{% load image_tags %}{% responsive_image post.image alt=post.title %}")
+        return template.render(Context({"post": post}))
+
+    def test_post_image_renditions_are_generated_off_the_request(self):
+        post = self.create_post()
+
+        source = ImageSource.objects.get(file_name=post.image.name)
+        self.assertEqual(source.status, "ready")
+        self.assertEqual(sorted(set(source.renditions.values_list("width", flat=True))), [320, 640, 1280])
+
+        html = self.render_image(post)
+        self.assertIn("1280w", html)
+        self.assertIn('width="1280" height="640"', html)
+
+    def test_post_image_falls_back_to_original_until_processed(self):
+        post = self.create_post(execute=False)
+
+        html = self.render_image(post)
+        self.assertIn(f'src="{post.image.url}"', html)
+        self.assertNotIn("srcset", html)
+
+    def test_editor_upload_renditions_are_used_in_content(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            name = CKEditorUploadStorage().save("photo.jpg", ContentFile(make_jpeg()))
+        self.assertTrue(name.startswith("ckeditor/"))
+
+        content = f'<p>Sunset</p><img src="/media/{name}" alt="Sunset">'
+        html = Template("{% load image_tags %}{{ content|responsive_images }}").render(Context({"content": content}))
+
+        self.assertIn('srcset="/media/renditions/', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertIn('alt="Sunset"', html)
+
+    def test_editor_upload_reaches_the_worker_through_the_database(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            name = CKEditorUploadStorage().save("photo.jpg", ContentFile(make_jpeg()))
+        # The worker runs on its own disk and never sees the web service's copy.
+        default_storage.delete(name)
+        for callback in callbacks:
+            callback()
+
+        source = ImageSource.objects.get(file_name=name)
+        self.assertEqual(source.status, "ready")
+        self.assertEqual(bytes(source.data), b"")
+        self.assertTrue(source.renditions.exists())
+
+    @override_settings(IMAGE_RENDITION_STORAGE="")
+    def test_uploads_are_not_kept_without_rendition_storage(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            CKEditorUploadStorage().save("photo.jpg", ContentFile(make_jpeg()))
+        post = self.create_post()
+
+        self.assertFalse(ImageSource.objects.exists())
+        self.assertIn(f'src="{post.image.url}"', self.render_image(post))
+
+    def test_content_without_uploads_is_unchanged(self):
+        content = '<p>Hello</p><img src="https://example.com/a.jpg">'
+        html = Template("{% load image_tags %}{{ content|responsive_images }}").render(Context({"content": content}))
+
+        self.assertEqual(html, content)
+
+
+class StaticPictureTests(TestCase):
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+        static = override_settings(
+            STATIC_ROOT=self.static_root,
+            STATIC_PICTURES={"ziada-logo.png": [80]},
+            STORAGES={
+                **settings.STORAGES,
+                "staticfiles": {"BACKEND": "images.storage.PictureStaticFilesStorage"},
+            },
+        )
+        static.enable()
+        self.addCleanup(static.disable)
+        picture_variants.cache_clear()
+        self.addCleanup(picture_variants.cache_clear)
+
+    def collect_logo(self):
+        storage = PictureStaticFilesStorage()
+        source = FileSystemStorage(location=settings.BASE_DIR / "static")
+        with source.open("ziada-logo.png") as logo:
+            storage.save("ziada-logo.png", logo)
+        list(storage.post_process({"ziada-logo.png": (source, "ziada-logo.png")}))
+        return storage
+
+    def test_collectstatic_writes_hashed_variants(self):
+        storage = self.collect_logo()
+
+        for height in (80, 160):
+            for format in picture_formats():
+                variant = picture_variant_name("ziada-logo.png", height, format)
+                self.assertIn(variant, storage.hashed_files)
+                self.assertNotEqual(storage.hashed_files[variant], variant)
+
+        with storage.open(picture_variant_name("ziada-logo.png", 80, "png")) as variant:
+            self.assertEqual(Image.open(variant).height, 80)
+
+    def test_static_picture_points_at_hashed_variants(self):
+        self.collect_logo()
+
+        html = Template("{% load image_tags %}{% static_picture 'ziada-logo.png' 80 alt='Logo' class='h-20' %}").render(Context())
+
+        self.assertIn('<source type="image/webp" srcset="/static/ziada-logo.80h.', html)
+        self.assertIn(" 2x", html)
+        self.assertRegex(html, r'<img src="/static/ziada-logo\.80h\.[0-9a-f]{12}\.png"')
+        self.assertIn('height="80"', html)
+        self.assertIn('class="h-20"', html)
+
+    @override_settings(STATIC_PICTURES={})
+    def test_static_picture_falls_back_without_variants(self):
+        self.collect_logo()
+
+        html = Template("{% load image_tags %}{% static_picture 'ziada-logo.png' 80 alt='Logo' %}").render(Context())
+
+        self.assertNotIn("<source", html)
+        self.assertRegex(html, r'<img src="/static/ziada-logo\.[0-9a-f]{12}\.png" alt="Logo">')
@@ -0,0 +1,8 @@
+from .services import filter_search, uses_postgres_search
+
+
+class SearchVectorAdminMixin:
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not uses_postgres_search(queryset.db):
+            return super().get_search_results(request, queryset, search_term)
+        return filter_search(queryset, search_term), False
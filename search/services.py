@@ -0,0 +1,63 @@
+import operator
+from functools import reduce
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, Func, Q, TextField, Value
+
+SEARCH_CONFIG = "english"
+
+
+def uses_postgres_search(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def strip_tags(field):
+    return Func(
+        F(field),
+        Value("<[^>]*>"),
+        Value(" "),
+        Value("g"),
+        function="regexp_replace",
+        output_field=TextField(),
+    )
+
+
+def build_search_vector(weights):
+    vectors = [
+        SearchVector(strip_tags(field), weight=weight, config=SEARCH_CONFIG)
+        for field, weight in weights.items()
+    ]
+    return reduce(operator.add, vectors)
+
+
+def update_search_vector(instance, using="default"):
+    if not uses_postgres_search(using):
+        return
+    model = type(instance)
+    model._default_manager.using(using).filter(pk=instance.pk).update(
+        search_vector=build_search_vector(model.SEARCH_WEIGHTS)
+    )
+
+
+def build_search_query(query):
+    return SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def filter_search(queryset, query):
+    if uses_postgres_search(queryset.db):
+        return queryset.filter(search_vector=build_search_query(query))
+
+    condition = reduce(
+        operator.or_,
+        (Q(**{f"{field}__icontains": query}) for field in queryset.model.SEARCH_WEIGHTS),
+    )
+    return queryset.filter(condition)
+
+
+def ranked_search(queryset, query):
+    results = filter_search(queryset, query)
+    if uses_postgres_search(queryset.db):
+        rank = SearchRank(F("search_vector"), build_search_query(query))
+        return results.annotate(rank=rank).order_by("-rank", "-pk")
+    return results
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from adminside.models import Hotel, Package
+from blog.models import Post
+
+from .services import update_search_vector
+
+
+@receiver(post_save, sender=Package)
+@receiver(post_save, sender=Hotel)
+@receiver(post_save, sender=Post)
+def refresh_search_vector(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    update_search_vector(instance, using=using)
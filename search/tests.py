@@ -0,0 +1,40 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from adminside.models import Hotel, Package
+from blog.models import Post
+
+from .services import ranked_search
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        Package.objects.create(title="Maasai Mara Migration", location="Maasai Mara", category="Safari")
+        Package.objects.create(title="Diani Escape", location="Diani", category="Beach", active=False)
+        Hotel.objects.create(name="Mara Serena", location="Maasai Mara")
+        Post.objects.create(title="Mara river crossings", content="<p>Wildebeest</p>", status="published")
+        Post.objects.create(title="Mara draft", content="<p>Unpublished</p>", status="draft")
+
+    def test_search_returns_matches_across_models(self):
+        response = self.client.get(reverse("search"), {"q": "mara"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([pkg.title for pkg in response.context["packages"]], ["Maasai Mara Migration"])
+        self.assertEqual([hotel.name for hotel in response.context["hotels"]], ["Mara Serena"])
+        self.assertEqual([post.title for post in response.context["posts"]], ["Mara river crossings"])
+
+    def test_search_ignores_inactive_packages(self):
+        response = self.client.get(reverse("search"), {"q": "diani"})
+
+        self.assertContains(response, "No results for")
+
+    def test_empty_query_runs_no_search(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("search"))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_fallback_matches_rich_text_fields(self):
+        results = ranked_search(Post.objects.all(), "wildebeest")
+
+        self.assertEqual([post.title for post in results], ["Mara river crossings"])
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.shortcuts import render
+
+from adminside.models import Hotel, Package
+from blog.models import Post
+
+from .services import ranked_search
+
+
+def search(request):
+    query = request.GET.get("q", "").strip()[:200]
+    limit = getattr(settings, "SEARCH_RESULTS_LIMIT", 10)
+    context = {"query": query, "packages": [], "hotels": [], "posts": []}
+
+    if query:
+        packages = Package.objects.filter(active=True).only(
+            "title", "slug", "price", "location", "category", "image_url"
+        )
+        hotels = Hotel.objects.filter(active=True).only(
+            "name", "slug", "rating", "price_per_night", "location", "image_url"
+        )
+        posts = Post.objects.filter(status="published").select_related("category").only(
+            "title", "slug", "created", "category__title", "category__slug"
+        )
+        context["packages"] = ranked_search(packages, query)[:limit]
+        context["hotels"] = ranked_search(hotels, query)[:limit]
+        context["posts"] = ranked_search(posts, query)[:limit]
+
+    return render(request, "pages/search.html", context)
@@ -5,3 +5,11 @@ class StatusConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'status'
     verbose_name = "System Status"
+
+    def ready(self):
+        from django.conf import settings
+
+        if settings.METRICS_ENABLED:
+            from .instrumentation import install
+
+            install()
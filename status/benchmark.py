@@ -0,0 +1,275 @@
+import http.cookiejar
+import io
+import re
+import socketserver
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.db import connections
+from django.db.models import Max
+
+from users.models import ContactInquiry, Outbox
+
+CSRF_TOKEN_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+CONTACT_FORM = {
+    "full_name": "Load Test",
+    "email": "load-test@example.com",
+    "phone": "",
+    "company": "",
+    "subject": "Safari Experience",
+    "message": "Benchmark inquiry.",
+    "privacy_consent": "on",
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies_ms, elapsed, errors):
+    count = len(latencies_ms)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies_ms), 2) if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+    }
+
+
+def get(base_url, path, timeout):
+    with urllib.request.urlopen(base_url + path, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def post_contact(base_url, timeout):
+    """GET the form for a CSRF token, then time only the POST."""
+    opener = urllib.request.build_opener(
+        urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+        NoRedirect,
+    )
+    with opener.open(base_url + "/contact/", timeout=timeout) as response:
+        token = CSRF_TOKEN_RE.search(response.read().decode()).group(1)
+
+    data = urllib.parse.urlencode({**CONTACT_FORM, "csrfmiddlewaretoken": token}).encode()
+    request = urllib.request.Request(base_url + "/contact/", data=data, headers={"Referer": base_url})
+    started = time.perf_counter()
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    return status, (time.perf_counter() - started) * 1000
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def run_load(base_url, paths, total, concurrency, contact_every=0, timeout=30):
+    """
+    Fire ``total`` requests from ``concurrency`` threads, cycling through
+    ``paths``; every ``contact_every``-th request is a contact form POST.
+    """
+
+    def one(index):
+        try:
+            if contact_every and index % contact_every == 0:
+                status, duration_ms = post_contact(base_url, timeout)
+            else:
+                started = time.perf_counter()
+                status = get(base_url, paths[index % len(paths)], timeout)
+                duration_ms = (time.perf_counter() - started) * 1000
+        except (OSError, AttributeError):
+            return None
+        return duration_ms if status < 400 else None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(1, total + 1)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [result for result in results if result is not None]
+    return summarize(latencies, elapsed, len(results) - len(latencies))
+
+
+class SlowSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept a message, with a delay before each reply to DATA."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 benchmark ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 benchmark")
+            elif command == "DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                time.sleep(self.server.delay)
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+class SlowSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port, delay):
+        super().__init__(("127.0.0.1", port), SlowSMTPHandler)
+        self.delay = delay
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class WSGIDriver:
+    """
+    Calls the WSGI application in-process, carrying cookies between requests
+    like a browser, and counts the SQL each request runs.
+    """
+
+    def __init__(self, application, host="localhost", secure=False):
+        self.application = application
+        self.host = host
+        self.secure = secure
+        self.cookies = {}
+
+    def environ(self, method, path, body=b"", content_type=""):
+        path, _, query = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": "443" if self.secure else "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": self.host,
+            "REMOTE_ADDR": "127.0.0.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.url_scheme": "https" if self.secure else "http",
+            "wsgi.version": (1, 0),
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        if content_type:
+            environ["CONTENT_TYPE"] = content_type
+        if self.cookies:
+            environ["HTTP_COOKIE"] = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+        if method == "POST":
+            environ["HTTP_REFERER"] = f"{environ['wsgi.url_scheme']}://{self.host}/"
+        return environ
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data else b""
+        content_type = "application/x-www-form-urlencoded" if data else ""
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured["status"] = int(status.split(" ", 1)[0])
+            captured["headers"] = headers
+
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count_query))
+            started = time.perf_counter()
+            result = self.application(self.environ(method, path, body, content_type), start_response)
+            try:
+                content = b"".join(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+            duration_ms = (time.perf_counter() - started) * 1000
+
+        for name, value in captured["headers"]:
+            if name.lower() == "set-cookie":
+                cookie_name, _, rest = value.partition("=")
+                self.cookies[cookie_name] = rest.split(";", 1)[0]
+        return captured["status"], content, duration_ms, queries[0]
+
+
+def outbox_mark():
+    return Outbox.objects.aggregate(mark=Max("pk"))["mark"] or 0
+
+
+def delete_contact_rows(since_outbox_pk):
+    """Remove the inquiries, inbox entries and emails the contact scenario wrote."""
+    email = CONTACT_FORM["email"]
+    ContactInquiry.objects.filter(email=email).delete()
+    # The admin notification is addressed to ADMIN_EMAIL but quotes the sender.
+    written = Outbox.objects.filter(pk__gt=since_outbox_pk).values_list("pk", "recipients", "html_body")
+    Outbox.objects.filter(
+        pk__in=[pk for pk, recipients, body in written if email in recipients or email in body]
+    ).delete()
+
+
+def contact_post(driver):
+    status, content, _duration_ms, _queries = driver.request("GET", "/contact/")
+    token = CSRF_TOKEN_RE.search(content.decode()).group(1)
+    return driver.request("POST", "/contact/", {**CONTACT_FORM, "csrfmiddlewaretoken": token})
+
+
+def run_scenario(driver, method, path, requests, warmup=0):
+    """Time ``requests`` sequential calls after ``warmup`` untimed ones."""
+
+    def call():
+        if method == "POST" and path == "/contact/":
+            return contact_post(driver)
+        return driver.request(method, path)
+
+    for _ in range(warmup):
+        call()
+
+    latencies = []
+    queries = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        status, _content, duration_ms, query_count = call()
+        if status >= 400:
+            errors += 1
+            continue
+        latencies.append(duration_ms)
+        queries.append(query_count)
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies, elapsed, errors)
+    summary["queries_per_request"] = round(statistics.fmean(queries), 2) if queries else 0.0
+    return summary
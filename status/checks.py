@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def check_database(timeout):
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL statement_timeout = %s", [int(timeout * 1000)])
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+
+
+def run_with_timeout(probe, timeout):
+    """Run ``probe`` on a daemon thread and give up on it after ``timeout`` seconds."""
+    outcome = {}
+
+    def target():
+        try:
+            probe()
+        except Exception as exc:
+            outcome["error"] = exc
+        finally:
+            # The database cache backend opens a connection on this thread.
+            connections.close_all()
+
+    worker = threading.Thread(target=target, name="health-check", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"no answer within {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+
+
+def probe_cache():
+    key = "health-check"
+    value = str(time.monotonic())
+    cache.set(key, value, timeout=30)
+    if cache.get(key) != value:
+        raise RuntimeError("cache did not return the value it was given")
+
+
+def check_cache(timeout):
+    # Cache clients have no per-call timeout; a hung server must not hang readiness.
+    run_with_timeout(probe_cache, timeout)
+
+
+def check_broker(timeout):
+    from tours_travels.celery import app
+
+    with app.connection_for_write() as conn:
+        conn.ensure_connection(max_retries=1, timeout=timeout)
+
+
+def broker_configured():
+    return bool(getattr(settings, "CELERY_BROKER_URL", ""))
+
+
+READINESS_CHECKS = {
+    "database": (check_database, lambda: True),
+    "cache": (check_cache, lambda: True),
+    "broker": (check_broker, broker_configured),
+}
+
+
+def run_checks(timeout):
+    results = {}
+    for name, (check, enabled) in READINESS_CHECKS.items():
+        if not enabled():
+            results[name] = {"ok": True, "skipped": True}
+            continue
+
+        started = time.perf_counter()
+        try:
+            check(timeout)
+        except Exception:
+            # The payload is public; hosts and credentials in the message are not.
+            logger.warning("readiness check %s failed", name, exc_info=True)
+            results[name] = {"ok": False, "status": "error"}
+        else:
+            results[name] = {"ok": True}
+        results[name]["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return results
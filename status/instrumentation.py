@@ -0,0 +1,114 @@
+import contextvars
+import functools
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import Template
+
+from tours_travels.db_pool.pool import connection_acquired
+from users.dispatch import email_provider_call
+
+from .metrics import current_timings, record_cache_lookup, timed
+
+# Backends implement get() with get_many() (or the reverse); count the outer call only.
+_in_cache_read = contextvars.ContextVar("in_cache_read", default=False)
+_MISSING = object()
+
+
+def query_timer(execute, sql, params, many, context):
+    timings = current_timings.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if timings is not None:
+            timings.queries += 1
+            timings.db_ms += (time.perf_counter() - started) * 1000
+
+
+def add_query_timer(sender, connection, **kwargs):
+    # Every connection, whichever thread opened it: sync views under ASGI and
+    # sync_to_async(thread_sensitive=False) calls query from worker threads.
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def instrument_cache_get(get):
+    @functools.wraps(get)
+    def wrapper(self, key, default=None, *args, **kwargs):
+        if _in_cache_read.get():
+            return get(self, key, default, *args, **kwargs)
+        token = _in_cache_read.set(True)
+        try:
+            value = get(self, key, _MISSING, *args, **kwargs)
+        finally:
+            _in_cache_read.reset(token)
+        record_cache_lookup(value is not _MISSING)
+        return default if value is _MISSING else value
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def instrument_cache_get_many(get_many):
+    @functools.wraps(get_many)
+    def wrapper(self, keys, *args, **kwargs):
+        if _in_cache_read.get():
+            return get_many(self, keys, *args, **kwargs)
+        keys = list(keys)
+        token = _in_cache_read.set(True)
+        try:
+            values = get_many(self, keys, *args, **kwargs)
+        finally:
+            _in_cache_read.reset(token)
+        for key in keys:
+            record_cache_lookup(key in values)
+        return values
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def instrument_template_render(render):
+    @functools.wraps(render)
+    def wrapper(self, *args, **kwargs):
+        with timed("template_ms"):
+            return render(self, *args, **kwargs)
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def add_email_time(sender, duration_ms, **kwargs):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.email_ms += duration_ms
+
+
+def add_pool_wait(sender, wait_ms, **kwargs):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.pool_wait_ms += wait_ms
+
+
+def install():
+    """Hook queries, template rendering, cache reads and provider signals into RequestTimings."""
+    connection_created.connect(add_query_timer, dispatch_uid="status.metrics.queries")
+    for connection in connections.all(initialized_only=True):
+        add_query_timer(None, connection)
+
+    if not getattr(Template.render, "instrumented", False):
+        Template.render = instrument_template_render(Template.render)
+
+    for alias in settings.CACHES:
+        backend = type(caches[alias])
+        if not getattr(backend.get, "instrumented", False):
+            backend.get = instrument_cache_get(backend.get)
+        if not getattr(backend.get_many, "instrumented", False):
+            backend.get_many = instrument_cache_get_many(backend.get_many)
+
+    email_provider_call.connect(add_email_time, dispatch_uid="status.metrics.email")
+    connection_acquired.connect(add_pool_wait, dispatch_uid="status.metrics.pool")
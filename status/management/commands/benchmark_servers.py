@@ -0,0 +1,123 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from status.benchmark import SlowSMTPServer, run_load
+
+PROFILES = {
+    "wsgi": ("tours_travels.wsgi:application", "sync"),
+    "asgi": ("tours_travels.asgi:application", "uvicorn_worker.UvicornWorker"),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare request concurrency of the WSGI and ASGI gunicorn profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=["wsgi", "asgi"])
+        parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+        parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="URL path to GET (repeatable; default: the public listing pages)",
+        )
+        parser.add_argument("--workers", type=int, default=2, help="gunicorn workers per profile")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--contact-every",
+            type=int,
+            default=0,
+            help="Make every Nth request a contact form POST (0 disables)",
+        )
+        parser.add_argument(
+            "--smtp-delay",
+            type=float,
+            default=0.5,
+            help="Seconds the local SMTP sink waits before accepting each message",
+        )
+        parser.add_argument("--page-cache", action="store_true", help="Leave the anonymous page cache on")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or ["/", "/packages/", "/hotels/", "/blog/"]
+        smtp = SlowSMTPServer(options["port"] + 1, options["smtp_delay"]).start()
+        results = []
+        try:
+            for profile in options["profiles"]:
+                with GunicornServer(profile, options) as base_url:
+                    for concurrency in options["concurrency"]:
+                        summary = run_load(
+                            base_url,
+                            paths,
+                            options["requests"],
+                            concurrency,
+                            contact_every=options["contact_every"],
+                        )
+                        results.append({"profile": profile, "concurrency": concurrency, **summary})
+                        self.report(results[-1])
+        finally:
+            smtp.shutdown()
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as handle:
+                json.dump(results, handle, indent=2)
+
+    def report(self, row):
+        self.stdout.write(
+            f"{row['profile']:>5} c={row['concurrency']:<4} {row['throughput']:>8.1f} req/s  "
+            f"p50={row['p50_ms']:.1f}ms p95={row['p95_ms']:.1f}ms p99={row['p99_ms']:.1f}ms "
+            f"errors={row['errors']}"
+        )
+
+
+class GunicornServer:
+    def __init__(self, profile, options):
+        app, worker_class = PROFILES[profile]
+        port = options["port"]
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.command = [
+            sys.executable, "-m", "gunicorn", app,
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(options["workers"]),
+            "--worker-class", worker_class,
+            "--log-level", "warning",
+        ]
+        self.env = {
+            **os.environ,
+            "SERVER_PROFILE": profile,
+            "PAGE_CACHE_ENABLED": str(options["page_cache"]),
+            # Contact emails go to the local slow SMTP sink, never a real relay.
+            "EMAIL_PROVIDER": "smtp",
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": str(port + 1),
+            "EMAIL_USE_TLS": "False",
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",
+            "CELERY_BROKER_URL": "",
+            "CELERY_TASK_ALWAYS_EAGER": "True",
+        }
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.command, env=self.env)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {self.process.returncode}")
+            try:
+                urllib.request.urlopen(self.base_url + "/health/", timeout=1).close()
+                return self.base_url
+            except OSError:
+                time.sleep(0.2)
+        self.process.terminate()
+        raise CommandError("gunicorn did not become healthy within 30s")
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait(timeout=30)
@@ -0,0 +1,139 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from adminside.models import Hotel, Package
+from blog.models import Category, Post
+from status.benchmark import WSGIDriver, delete_contact_rows, outbox_mark, run_scenario
+from users.models import ContactInquiry
+
+LOCAL_EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+
+def default_scenarios():
+    scenarios = [
+        ("home", "GET", reverse("home")),
+        ("packages", "GET", reverse("packages")),
+        ("hotels", "GET", reverse("hotels")),
+        ("blog", "GET", reverse("blog")),
+        ("search", "GET", reverse("search") + "?q=safari"),
+        ("api-packages", "GET", reverse("api-package-list")),
+    ]
+    package = Package.objects.filter(active=True).order_by("-created_at", "-pk").only("slug").first()
+    if package:
+        scenarios.append(("package-detail", "GET", reverse("package-detail", args=[package.slug])))
+    post = Post.objects.filter(status="published").order_by("-created").only("slug").first()
+    if post:
+        scenarios.append(("blog-detail", "GET", reverse("blog-detail", args=[post.slug])))
+    category = Category.objects.filter(active=True).only("slug").first()
+    if category:
+        scenarios.append(("blog-category", "GET", reverse("blog-category", args=[category.slug])))
+    scenarios.append(("contact", "POST", reverse("contact")))
+    return scenarios
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=settings.BASE_DIR
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+class Command(BaseCommand):
+    help = "Drive the public pages and contact form through the WSGI app in-process"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Timed requests per scenario")
+        parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per scenario")
+        parser.add_argument("--only", nargs="+", help="Run only these scenario names")
+        parser.add_argument("--no-page-cache", action="store_true", help="Disable the anonymous page cache")
+        parser.add_argument("--output", help="Write the results as JSON to this path")
+        parser.add_argument("--compare", help="Print the change against an earlier JSON result")
+
+    def handle(self, *args, **options):
+        overrides = {
+            # Contact emails must never leave the machine during a benchmark.
+            "EMAIL_BACKEND": LOCAL_EMAIL_BACKEND,
+            "EMAIL_PROVIDER": "smtp",
+            "CELERY_TASK_ALWAYS_EAGER": True,
+            # Measure the request, not the provider throttle.
+            "OUTBOX_RATE_LIMITS": {"default": {"rate": 1_000_000, "burst": 1_000_000}},
+        }
+        if options["no_page_cache"]:
+            overrides["PAGE_CACHE_ENABLED"] = False
+
+        with override_settings(**overrides):
+            host = next((host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"), "localhost")
+            driver = WSGIDriver(
+                get_wsgi_application(),
+                host=host,
+                secure=getattr(settings, "SECURE_SSL_REDIRECT", False),
+            )
+            scenarios = default_scenarios()
+            if options["only"]:
+                scenarios = [scenario for scenario in scenarios if scenario[0] in options["only"]]
+
+            results = {}
+            mark = outbox_mark()
+            try:
+                for name, method, path in scenarios:
+                    results[name] = {
+                        "method": method,
+                        "path": path,
+                        **run_scenario(driver, method, path, options["requests"], options["warmup"]),
+                    }
+                    self.report(name, results[name])
+            finally:
+                # The benchmark runs against the real database; leave no inquiries behind.
+                delete_contact_rows(mark)
+
+        payload = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "page_cache": not options["no_page_cache"],
+            "rows": {
+                "packages": Package.objects.count(),
+                "hotels": Hotel.objects.count(),
+                "posts": Post.objects.count(),
+                "contact_inquiries": ContactInquiry.objects.count(),
+            },
+            "scenarios": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(payload, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        if options["compare"]:
+            with open(options["compare"]) as handle:
+                self.compare(json.load(handle)["scenarios"], results)
+
+    def report(self, name, row):
+        self.stdout.write(
+            f"{name:<15} {row['throughput']:>8.1f} req/s  p50={row['p50_ms']:.1f}ms "
+            f"p95={row['p95_ms']:.1f}ms p99={row['p99_ms']:.1f}ms "
+            f"queries={row['queries_per_request']:.1f} errors={row['errors']}"
+        )
+
+    def compare(self, before, after):
+        self.stdout.write("\nChange against baseline (p95, queries):")
+        for name, row in after.items():
+            previous = before.get(name)
+            if not previous or not previous["p95_ms"]:
+                continue
+            change = (row["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            self.stdout.write(
+                f"{name:<15} p95 {previous['p95_ms']:.1f} -> {row['p95_ms']:.1f}ms ({change:+.0f}%)  "
+                f"queries {previous['queries_per_request']:.1f} -> {row['queries_per_request']:.1f}"
+            )
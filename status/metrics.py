@@ -0,0 +1,274 @@
+"""
+Per-request timings and histograms shared by every worker process.
+
+Each process keeps its own cumulative histograms in memory and writes them to
+``METRICS_DIR/metrics-<pid>.json`` at most once per ``METRICS_FLUSH_INTERVAL``.
+The /metrics view merges every file it finds, folding processes that have
+exited into ``metrics-archive.json`` so recycled gunicorn workers never lose
+their counts.
+"""
+
+import contextvars
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+HISTOGRAMS = {
+    "ziada_request_duration_seconds": ("Time spent handling a request.", TIME_BUCKETS),
+    "ziada_request_db_queries": ("SQL queries run per request.", COUNT_BUCKETS),
+    "ziada_request_db_seconds": ("Time spent in SQL per request.", TIME_BUCKETS),
+    "ziada_request_template_seconds": ("Time spent rendering templates per request.", TIME_BUCKETS),
+    "ziada_request_email_seconds": ("Time spent in email provider calls per request.", TIME_BUCKETS),
+    "ziada_request_db_pool_wait_seconds": ("Time spent waiting for a pooled connection.", TIME_BUCKETS),
+}
+COUNTERS = {
+    "ziada_cache_lookups_total": "Cache reads made while handling requests.",
+}
+
+ARCHIVE_NAME = "metrics-archive.json"
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.email_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms):
+        parts = [
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f"tpl;dur={self.template_ms:.1f}",
+            f'cache;desc="{self.cache_hits} hit, {self.cache_misses} miss"',
+        ]
+        if self.email_ms:
+            parts.append(f"email;dur={self.email_ms:.1f}")
+        if self.pool_wait_ms:
+            parts.append(f"pool;dur={self.pool_wait_ms:.1f}")
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+
+current_timings = contextvars.ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def timed(attribute):
+    timings = current_timings.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            elapsed = (time.perf_counter() - started) * 1000
+            setattr(timings, attribute, getattr(timings, attribute) + elapsed)
+
+
+def record_cache_lookup(hit):
+    timings = current_timings.get()
+    if timings is not None:
+        if hit:
+            timings.cache_hits += 1
+        else:
+            timings.cache_misses += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.flushed = 0.0
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            sample = self.histograms.get(key)
+            if sample is None:
+                sample = self.histograms[key] = {"buckets": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+            index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+            sample["buckets"][index] += 1
+            sample["sum"] += value
+            sample["count"] += 1
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "histograms": [
+                    [name, dict(labels), list(sample["buckets"]), sample["sum"], sample["count"]]
+                    for (name, labels), sample in self.histograms.items()
+                ],
+                "counters": [[name, dict(labels), value] for (name, labels), value in self.counters.items()],
+            }
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.flushed < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self.flushed = now
+        directory = metrics_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        write_json(directory / f"metrics-{os.getpid()}.json", self.snapshot())
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.flushed = 0.0
+
+
+registry = Registry()
+
+
+def metrics_dir():
+    return Path(settings.METRICS_DIR)
+
+
+def write_json(path, data):
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {"histograms": [], "counters": []}
+
+
+def record_request(view, timings, total_ms):
+    labels = {"view": view}
+    registry.observe("ziada_request_duration_seconds", labels, total_ms / 1000)
+    registry.observe("ziada_request_db_queries", labels, timings.queries)
+    registry.observe("ziada_request_db_seconds", labels, timings.db_ms / 1000)
+    registry.observe("ziada_request_template_seconds", labels, timings.template_ms / 1000)
+    if timings.email_ms:
+        registry.observe("ziada_request_email_seconds", labels, timings.email_ms / 1000)
+    if timings.pool_wait_ms:
+        registry.observe("ziada_request_db_pool_wait_seconds", labels, timings.pool_wait_ms / 1000)
+    if timings.cache_hits:
+        registry.inc("ziada_cache_lookups_total", {**labels, "result": "hit"}, timings.cache_hits)
+    if timings.cache_misses:
+        registry.inc("ziada_cache_lookups_total", {**labels, "result": "miss"}, timings.cache_misses)
+    registry.flush()
+
+
+def empty_totals():
+    return {"histograms": {}, "counters": {}}
+
+
+def merge(totals, data):
+    for name, labels, buckets, total, count in data["histograms"]:
+        key = (name, tuple(sorted(labels.items())))
+        sample = totals["histograms"].setdefault(key, {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0})
+        sample["buckets"] = [a + b for a, b in zip(sample["buckets"], buckets)]
+        sample["sum"] += total
+        sample["count"] += count
+    for name, labels, value in data["counters"]:
+        key = (name, tuple(sorted(labels.items())))
+        totals["counters"][key] = totals["counters"].get(key, 0) + value
+    return totals
+
+
+def as_data(totals):
+    return {
+        "histograms": [
+            [name, dict(labels), sample["buckets"], sample["sum"], sample["count"]]
+            for (name, labels), sample in totals["histograms"].items()
+        ],
+        "counters": [[name, dict(labels), value] for (name, labels), value in totals["counters"].items()],
+    }
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect():
+    registry.flush(force=True)
+    directory = metrics_dir()
+    with open(directory / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = directory / ARCHIVE_NAME
+        archived_data = read_json(archive_path)
+        archive = merge(empty_totals(), archived_data)
+        totals = merge(empty_totals(), archived_data)
+        archived = False
+
+        for path in directory.glob("metrics-*.json"):
+            if path.name == ARCHIVE_NAME:
+                continue
+            data = read_json(path)
+            merge(totals, data)
+            pid = int(path.stem.split("-", 1)[1])
+            if not process_alive(pid):
+                merge(archive, data)
+                path.unlink(missing_ok=True)
+                archived = True
+
+        if archived:
+            write_json(archive_path, as_data(archive))
+    return totals
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def render_metrics(totals):
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (sample_name, labels), sample in sorted(totals["histograms"].items()):
+            if sample_name != name:
+                continue
+            cumulative = 0
+            for bound, count in zip([*buckets, "+Inf"], sample["buckets"]):
+                cumulative += count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{name}_bucket{format_labels(labels, le=le)} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {sample['sum']}")
+            lines.append(f"{name}_count{format_labels(labels)} {sample['count']}")
+    for name, help_text in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (sample_name, labels), value in sorted(totals["counters"].items()):
+            if sample_name == name:
+                lines.append(f"{name}{format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+from . import views
+from .metrics import RequestTimings, current_timings, record_request
+
+HEALTH_VIEWS = {
+    "/health/": views.liveness,
+    "/health/ready/": views.readiness,
+    "/metrics": views.metrics,
+}
+
+
+class HealthCheckMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        view = HEALTH_VIEWS.get(request.path_info)
+        if view is not None and request.method in ("GET", "HEAD"):
+            return view(request)
+        return None
+
+
+def metrics_view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or "unnamed"
+
+
+class MetricsMiddleware:
+    """Times each request and feeds the per-view histograms behind /metrics."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.measure() as timings:
+            response = self.get_response(request)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        with self.measure() as timings:
+            response = await self.get_response(request)
+        return self.finish(request, response, timings)
+
+    @contextmanager
+    def measure(self):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            yield timings
+        finally:
+            current_timings.reset(token)
+
+    def finish(self, request, response, timings):
+        total_ms = timings.total_ms
+        if settings.SERVER_TIMING_ENABLED:
+            response["Server-Timing"] = timings.server_timing(total_ms)
+        record_request(metrics_view_name(request), timings, total_ms)
+        return response
@@ -0,0 +1,14 @@
+from celery import shared_task
+from django.db import connection
+
+from .checks import check_database
+
+
+@shared_task
+def keep_database_warm():
+    """Touch the database so a scale-to-zero Postgres compute never suspends."""
+    try:
+        check_database(timeout=5)
+    finally:
+        # Hand the connection back (to the pool, when enabled) between pings.
+        connection.close()
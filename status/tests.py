@@ -0,0 +1,296 @@
+import contextvars
+import json
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from adminside.models import Package
+from tours_travels.db_pool.pool import ConnectionPool, PoolTimeout, connection_acquired
+from users.models import ContactInquiry, InquiryIndex, Outbox
+
+from .metrics import RequestTimings, current_timings, registry
+
+
+class HealthCheckTests(TestCase):
+    def test_liveness_skips_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("health"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+        self.assertNotIn("Set-Cookie", response.headers)
+
+    @override_settings(ALLOWED_HOSTS=["example.com"])
+    def test_liveness_answers_before_host_validation(self):
+        response = self.client.get("/health/", HTTP_HOST="10.0.0.12:10000")
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(CELERY_BROKER_URL="")
+    def test_readiness_reports_each_dependency(self):
+        response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 200)
+        checks = response.json()["checks"]
+        self.assertTrue(checks["database"]["ok"])
+        self.assertIn("latency_ms", checks["database"])
+        self.assertTrue(checks["cache"]["ok"])
+        self.assertTrue(checks["broker"]["skipped"])
+
+    @override_settings(CELERY_BROKER_URL="")
+    def test_readiness_fails_when_a_dependency_is_down(self):
+        with mock.patch.object(LocMemCache, "get", return_value=None):
+            with self.assertLogs("status.checks", "WARNING") as logs:
+                response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 503)
+        payload = response.json()
+        self.assertEqual(payload["status"], "error")
+        self.assertEqual(payload["checks"]["cache"]["ok"], False)
+        self.assertEqual(payload["checks"]["cache"]["status"], "error")
+        self.assertNotIn("did not return", response.content.decode())
+        self.assertIn("did not return", logs.output[0])
+
+    @override_settings(CELERY_BROKER_URL="", HEALTH_CHECK_TIMEOUT=0.1)
+    def test_hung_cache_fails_readiness_within_the_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        with mock.patch.object(LocMemCache, "set", side_effect=lambda *args, **kwargs: release.wait(5)):
+            with self.assertLogs("status.checks", "WARNING"):
+                response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertLess(response.json()["checks"]["cache"]["latency_ms"], 2000)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def make_pool(self, **kwargs):
+        self.clock = FakeClock()
+        options = {
+            "max_size": 2,
+            "timeout": 0.01,
+            "max_idle": 240,
+            "max_lifetime": 1800,
+            "check_after": 30,
+            **kwargs,
+        }
+        return ConnectionPool("default", clock=self.clock, **options)
+
+    def test_released_connection_is_reused(self):
+        pool = self.make_pool()
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+
+        self.assertIs(pool.acquire(FakeConnection), first)
+        self.assertEqual(first.rollbacks, 1)
+        snapshot = pool.snapshot()
+        self.assertEqual((snapshot["acquired"], snapshot["created"], snapshot["in_use"]), (2, 1, 1))
+
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        pool = self.make_pool(max_size=1)
+        pool.acquire(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+        self.assertEqual(pool.snapshot()["timeouts"], 1)
+
+    def test_connections_idle_past_the_limit_are_replaced(self):
+        pool = self.make_pool()
+        stale = pool.acquire(FakeConnection)
+        pool.release(stale)
+        self.clock.now += 300
+
+        fresh = pool.acquire(FakeConnection)
+
+        self.assertIsNot(fresh, stale)
+        self.assertTrue(stale.closed)
+
+    def test_failed_health_check_discards_connection(self):
+        pool = self.make_pool()
+        broken = pool.acquire(FakeConnection)
+        pool.release(broken)
+        self.clock.now += 60
+
+        def check(connection):
+            raise OSError("server closed the connection")
+
+        self.assertIsNot(pool.acquire(FakeConnection, check), broken)
+        self.assertTrue(broken.closed)
+
+    def test_closed_connections_are_not_returned_to_the_pool(self):
+        pool = self.make_pool()
+        connection = pool.acquire(FakeConnection)
+        connection.close()
+        pool.release(connection)
+
+        snapshot = pool.snapshot()
+        self.assertEqual((snapshot["idle"], snapshot["in_use"], snapshot["discarded"]), (0, 0, 1))
+
+    def test_checkout_sends_wait_metrics(self):
+        pool = self.make_pool()
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append(kwargs)
+
+        connection_acquired.connect(receiver)
+        self.addCleanup(connection_acquired.disconnect, receiver)
+        pool.acquire(FakeConnection)
+
+        self.assertEqual(received[0]["alias"], "default")
+        self.assertTrue(received[0]["created"])
+        self.assertGreaterEqual(received[0]["wait_ms"], 0)
+
+
+def run_query():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        connection.close()
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.metrics_dir = Path(directory.name)
+        settings_override = override_settings(
+            METRICS_DIR=directory.name, METRICS_TOKEN="secret", SERVER_TIMING_ENABLED=True
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        Package.objects.create(title="Mara Safari", location="Maasai Mara", price=1000)
+
+    def get_metrics(self):
+        return self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+    def test_server_timing_breaks_down_the_request(self):
+        response = self.client.get(reverse("packages"))
+
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("tpl;dur=", timing)
+        self.assertRegex(timing, r'cache;desc="\d+ hit, [1-9]\d* miss"')
+        self.assertIn("total;dur=", timing)
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_server_timing_is_optional(self):
+        response = self.client.get(reverse("packages"))
+
+        self.assertNotIn("Server-Timing", response)
+
+    def test_metrics_report_histograms_per_url_name(self):
+        self.client.get(reverse("packages"))
+        self.client.get(reverse("packages"))
+        self.client.get(reverse("about"))
+
+        response = self.get_metrics()
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("# TYPE ziada_request_duration_seconds histogram", body)
+        self.assertIn('ziada_request_duration_seconds_count{view="packages"} 2', body)
+        self.assertIn('ziada_request_duration_seconds_bucket{view="packages",le="+Inf"} 2', body)
+        self.assertIn('ziada_request_db_queries_count{view="about"} 1', body)
+        self.assertIn('ziada_cache_lookups_total{result="miss",view="packages"}', body)
+
+    def test_metrics_merge_other_workers_and_archive_exited_ones(self):
+        self.client.get(reverse("packages"))
+        worker = {
+            "histograms": [
+                ["ziada_request_db_queries", {"view": "packages"}, [0, 3, 0, 0, 0, 0, 0, 0, 0, 0], 3, 3]
+            ],
+            "counters": [],
+        }
+        (self.metrics_dir / "metrics-999999999.json").write_text(json.dumps(worker))
+
+        body = self.get_metrics().content.decode()
+        self.assertIn('ziada_request_db_queries_count{view="packages"} 4', body)
+        self.assertFalse((self.metrics_dir / "metrics-999999999.json").exists())
+
+        body = self.get_metrics().content.decode()
+        self.assertIn('ziada_request_db_queries_count{view="packages"} 4', body)
+
+    def test_metrics_token_is_required_when_set(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.get_metrics().status_code, 200)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_metrics_are_closed_without_a_token_outside_debug(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+    def test_queries_from_worker_threads_are_counted(self):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            # As sync_to_async does: a fresh thread, and so a fresh connection, with the request's context.
+            worker = threading.Thread(target=contextvars.copy_context().run, args=(run_query,))
+            worker.start()
+            worker.join()
+        finally:
+            current_timings.reset(token)
+
+        self.assertEqual(timings.queries, 1)
+
+
+class RunBenchmarkTests(TestCase):
+    def test_results_are_written_as_json(self):
+        Package.objects.create(title="Mara Safari", location="Maasai Mara", price=1000)
+        ContactInquiry.objects.create(full_name="Real", email="real@example.com", subject="S", message="M")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        output = Path(directory.name) / "run.json"
+
+        call_command(
+            "run_benchmark",
+            requests=3,
+            warmup=0,
+            only=["packages", "package-detail", "contact"],
+            output=str(output),
+            stdout=StringIO(),
+        )
+
+        result = json.loads(output.read_text())
+        self.assertEqual(set(result["scenarios"]), {"packages", "package-detail", "contact"})
+        contact = result["scenarios"]["contact"]
+        self.assertEqual((contact["requests"], contact["errors"]), (3, 0))
+        self.assertGreater(contact["queries_per_request"], 0)
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput"):
+            self.assertIn(key, result["scenarios"]["packages"])
+        self.assertEqual(result["rows"]["contact_inquiries"], 1)
+        self.assertEqual(list(ContactInquiry.objects.values_list("email", flat=True)), ["real@example.com"])
+        self.assertEqual(list(InquiryIndex.objects.values_list("email", flat=True)), ["real@example.com"])
+        self.assertFalse(Outbox.objects.exists())
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('', views.liveness, name='health'),
+    path('ready/', views.readiness, name='health-ready'),
+]
@@ -0,0 +1,45 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+
+from tours_travels.db_pool.pool import get_pool_stats
+
+from .checks import run_checks
+from .metrics import collect, render_metrics
+
+
+def liveness(request):
+    response = JsonResponse({"status": "ok"})
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def readiness(request):
+    timeout = getattr(settings, "HEALTH_CHECK_TIMEOUT", 2.0)
+    checks = run_checks(timeout)
+    healthy = all(result["ok"] for result in checks.values())
+
+    payload = {"status": "ok" if healthy else "error", "checks": checks}
+    pools = get_pool_stats()
+    if pools:
+        payload["database_pools"] = pools
+
+    response = JsonResponse(payload, status=200 if healthy else 503)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        # Per-view latencies and query counts are not for the public.
+        return HttpResponseForbidden()
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied, token):
+            return HttpResponseForbidden()
+
+    response = HttpResponse(render_metrics(collect()), content_type="text/plain; version=0.0.4")
+    response["Cache-Control"] = "no-store"
+    return response
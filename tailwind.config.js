@@ -0,0 +1,22 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+    content: [
+        './templates/**/*.html',
+        './*/templates/**/*.html',
+        './*/forms.py',
+    ],
+    theme: {
+        extend: {
+            colors: {
+                primary: '#f38120',
+                secondary: '#1a1a1a',
+                accent: '#f97316',
+            },
+            fontFamily: {
+                sans: ['Montserrat', 'sans-serif'],
+                serif: ['Playfair Display', 'serif'],
+            },
+        }
+    },
+    plugins: [],
+}
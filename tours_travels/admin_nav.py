@@ -17,6 +17,10 @@ def blog_category_list(request=None):
     return reverse("admin:blog_category_changelist")
 
 
+def users_inbox(request=None):
+    return reverse("admin:users_inquiryindex_changelist")
+
+
 def users_contact_list(request=None):
     return reverse("admin:users_contactinquiry_changelist")
 
@@ -0,0 +1,9 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tours_travels.settings')
+
+app = Celery('tours_travels')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
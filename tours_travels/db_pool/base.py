@@ -0,0 +1,35 @@
+"""
+PostgreSQL backend that checks connections out of a per-process pool.
+
+Django 5.0 has no built-in pool for psycopg2, and CONN_MAX_AGE keeps one
+connection pinned to each thread. With this backend CONN_MAX_AGE stays 0:
+Django "closes" the connection at the end of every request or task, which
+returns it to the pool, and the next request reuses it without paying for
+TLS setup or a serverless compute wake-up.
+"""
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import get_pool
+
+
+def ping(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = IsolationLevel(
+            options.get("isolation_level", IsolationLevel.READ_COMMITTED)
+        )
+        connect = super().get_new_connection
+        return get_pool(self.alias, self.settings_dict).acquire(lambda: connect(conn_params), ping)
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                get_pool(self.alias, self.settings_dict).release(self.connection)
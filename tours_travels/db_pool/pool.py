@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+import time
+
+from django.db.utils import OperationalError
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+# Sent on every checkout with alias, wait_ms and created.
+connection_acquired = Signal()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class PoolStats:
+    def __init__(self):
+        self.acquired = 0
+        self.created = 0
+        self.discarded = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def record_wait(self, wait_ms, created):
+        self.acquired += 1
+        self.created += int(created)
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+
+class ConnectionPool:
+    """
+    Bounded per-process pool of raw DB-API connections.
+
+    Checkouts block for up to ``timeout`` seconds when ``max_size``
+    connections are already in use. Idle connections are handed out most
+    recently used first and dropped once they pass ``max_idle`` or
+    ``max_lifetime``, so a suspended server never gets a dead socket back.
+    """
+
+    def __init__(self, alias, max_size, timeout, max_idle, max_lifetime, check_after,
+                 clock=time.monotonic):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.clock = clock
+        self.pid = os.getpid()
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.lock = threading.Lock()
+        self.idle = []
+        self.born = {}
+        self.in_use = 0
+        self.stats = PoolStats()
+
+    def acquire(self, connect, check=None):
+        started = self.clock()
+        if not self.slots.acquire(timeout=self.timeout):
+            with self.lock:
+                self.stats.timeouts += 1
+            raise PoolTimeout(
+                f"No connection to {self.alias!r} became free within {self.timeout}s "
+                f"({self.max_size} in use)."
+            )
+        wait_ms = (self.clock() - started) * 1000
+
+        try:
+            connection = self.take_idle(check)
+            created = connection is None
+            if created:
+                connection = connect()
+                self.born[id(connection)] = self.clock()
+        except BaseException:
+            self.slots.release()
+            raise
+
+        with self.lock:
+            self.in_use += 1
+            self.stats.record_wait(wait_ms, created)
+        connection_acquired.send(
+            sender=self.__class__, alias=self.alias, wait_ms=wait_ms, created=created
+        )
+        return connection
+
+    def take_idle(self, check=None):
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                connection, released = self.idle.pop()
+            now = self.clock()
+            if self.expired(connection, now) or now - released > self.max_idle:
+                self.discard(connection)
+                continue
+            if check is not None and now - released > self.check_after:
+                try:
+                    check(connection)
+                except Exception:
+                    logger.info("dropping unusable pooled connection for %r", self.alias)
+                    self.discard(connection)
+                    continue
+            return connection
+
+    def release(self, connection):
+        if id(connection) not in self.born:
+            # Checked out before a fork or from another pool; it never held a slot here.
+            connection.close()
+            return
+        try:
+            if self.reusable(connection):
+                with self.lock:
+                    self.idle.append((connection, self.clock()))
+            else:
+                self.discard(connection)
+        finally:
+            with self.lock:
+                self.in_use -= 1
+            self.slots.release()
+
+    def reusable(self, connection):
+        if connection.closed or self.expired(connection, self.clock()):
+            return False
+        try:
+            # Never hand out a connection with an open or failed transaction.
+            connection.rollback()
+        except Exception:
+            return False
+        return True
+
+    def expired(self, connection, now):
+        return now - self.born.get(id(connection), now) > self.max_lifetime
+
+    def discard(self, connection):
+        self.born.pop(id(connection), None)
+        with self.lock:
+            self.stats.discarded += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection, _released in idle:
+            self.discard(connection)
+
+    def snapshot(self):
+        with self.lock:
+            stats = self.stats
+            return {
+                "max_size": self.max_size,
+                "in_use": self.in_use,
+                "idle": len(self.idle),
+                "acquired": stats.acquired,
+                "created": stats.created,
+                "discarded": stats.discarded,
+                "timeouts": stats.timeouts,
+                "wait_ms_total": round(stats.wait_ms_total, 3),
+                "wait_ms_max": round(stats.wait_ms_max, 3),
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    pool = _pools.get(alias)
+    # A pool inherited across fork() shares sockets with the parent; start over.
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+
+    options = settings_dict.get("POOL", {})
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[alias] = ConnectionPool(
+                alias,
+                max_size=options.get("MAX_SIZE", 4),
+                timeout=options.get("TIMEOUT", 10.0),
+                max_idle=options.get("MAX_IDLE", 240),
+                max_lifetime=options.get("MAX_LIFETIME", 1800),
+                check_after=options.get("CHECK_AFTER", 30),
+            )
+    return pool
+
+
+def get_pool_stats():
+    return {alias: pool.snapshot() for alias, pool in _pools.items() if pool.pid == os.getpid()}
@@ -1,5 +1,7 @@
+import tempfile
 from pathlib import Path
 
+from celery.schedules import crontab
 from decouple import config
 import dj_database_url
 from . import admin_nav
@@ -32,20 +34,27 @@ INSTALLED_APPS = [
     'users',
     'blog',
     'status',
+    'search',
+    'images',
+    'api',
 ]
 
 MIDDLEWARE = [
+    'status.middleware.HealthCheckMiddleware',
+    'status.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'tours_travels.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'adminside.middleware.PageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'tours_travels.urls'
+TEST_RUNNER = 'tours_travels.test_runner.TestRunner'
 
 TEMPLATES = [
     {
@@ -64,16 +73,59 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'tours_travels.wsgi.application'
+ASGI_APPLICATION = 'tours_travels.asgi.application'
+# "wsgi" (gunicorn sync workers) or "asgi" (gunicorn with uvicorn workers); see render.yaml.
+SERVER_PROFILE = config('SERVER_PROFILE', default='wsgi')
 
 DATABASE_URL = config('DATABASE_URL', default='')
-if DATABASE_URL:
-    DATABASES = {
-        'default': dj_database_url.parse(
-            DATABASE_URL,
-            conn_max_age=600,
-            conn_health_checks=True,
-        )
+# Per-process connection pool (tours_travels.db_pool) instead of one pinned connection per worker.
+DB_POOL_ENABLED = config('DB_POOL_ENABLED', default=False, cast=bool)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=4, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10.0, cast=float)
+# Neon suspends an idle compute after five minutes; drop pooled connections before that.
+DB_POOL_MAX_IDLE = config('DB_POOL_MAX_IDLE', default=240, cast=int)
+DB_POOL_MAX_LIFETIME = config('DB_POOL_MAX_LIFETIME', default=1800, cast=int)
+DB_POOL_CHECK_AFTER = config('DB_POOL_CHECK_AFTER', default=30, cast=int)
+DB_CONNECT_TIMEOUT = config('DB_CONNECT_TIMEOUT', default=10, cast=int)
+# Neon's "-pooler" hosts run PgBouncer in transaction mode.
+DB_PGBOUNCER = config('DB_PGBOUNCER', default='-pooler.' in DATABASE_URL, cast=bool)
+DB_KEEP_WARM_INTERVAL = config('DB_KEEP_WARM_INTERVAL', default=0, cast=int)
+
+
+def database_settings(url):
+    database = dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True)
+    if database['ENGINE'] != 'django.db.backends.postgresql':
+        return database
+
+    database['OPTIONS'] = {
+        'connect_timeout': DB_CONNECT_TIMEOUT,
+        'keepalives': 1,
+        'keepalives_idle': 30,
+        'keepalives_interval': 10,
+        'keepalives_count': 3,
+        **database.get('OPTIONS', {}),
     }
+    if DB_PGBOUNCER:
+        # Named cursors do not survive transaction pooling.
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    if DB_POOL_ENABLED:
+        database.update({
+            'ENGINE': 'tours_travels.db_pool',
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False,
+            'POOL': {
+                'MAX_SIZE': DB_POOL_MAX_SIZE,
+                'TIMEOUT': DB_POOL_TIMEOUT,
+                'MAX_IDLE': DB_POOL_MAX_IDLE,
+                'MAX_LIFETIME': DB_POOL_MAX_LIFETIME,
+                'CHECK_AFTER': DB_POOL_CHECK_AFTER,
+            },
+        })
+    return database
+
+
+if DATABASE_URL:
+    DATABASES = {'default': database_settings(DATABASE_URL)}
 else:
     DATABASES = {
         'default': {
@@ -82,6 +134,8 @@ else:
         }
     }
 
+REDIS_URL = config('REDIS_URL', default='')
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -97,7 +151,85 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STATICFILES_STORAGE = 'images.storage.PictureStaticFilesStorage'
+# Images written as resized PNG/WebP/AVIF variants at collectstatic, by CSS pixel height.
+STATIC_PICTURES = {
+    'ziada-logo.png': [80, 96],
+}
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='redis' if REDIS_URL else 'locmem')
+CACHE_BACKENDS = {
+    'redis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': REDIS_URL,
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SOCKET_CONNECT_TIMEOUT': 2,
+            'SOCKET_TIMEOUT': 2,
+            'IGNORE_EXCEPTIONS': True,
+        },
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ziada',
+    },
+}
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'KEY_PREFIX': 'ziada',
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+    }
+}
+HEALTH_CHECK_TIMEOUT = config('HEALTH_CHECK_TIMEOUT', default=2.0, cast=float)
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# Every worker writes its histograms here; /metrics merges them.
+METRICS_DIR = config('METRICS_DIR', default=str(Path(tempfile.gettempdir()) / 'ziada-metrics'))
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=1.0, cast=float)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=DEBUG, cast=bool)
+SEARCH_RESULTS_LIMIT = config('SEARCH_RESULTS_LIMIT', default=10, cast=int)
+LISTING_PAGE_SIZE = config('LISTING_PAGE_SIZE', default=12, cast=int)
+INBOX_PAGE_SIZE = config('INBOX_PAGE_SIZE', default=50, cast=int)
+# Admin changelists above this many (estimated) rows show the planner's estimate, not COUNT(*).
+ADMIN_EXACT_COUNT_LIMIT = config('ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+EXCERPT_WORDS = config('EXCERPT_WORDS', default=30, cast=int)
+LISTING_CACHE_TIMEOUT = config('LISTING_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+IMPORT_BATCH_SIZE = config('IMPORT_BATCH_SIZE', default=500, cast=int)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Catalogue uploads above this size are imported by a worker, not inside the admin request.
+IMPORT_BACKGROUND_BYTES = config('IMPORT_BACKGROUND_BYTES', default=256 * 1024, cast=int)
+IMAGE_RENDITION_WIDTHS = [320, 640, 960, 1280]
+# Storage class shared by the web service and the worker and publicly served
+# (e.g. an S3 backend from django-storages). Production does not serve /media/,
+# so without one no renditions are made and pages keep the original image.
+IMAGE_RENDITION_STORAGE = config(
+    'IMAGE_RENDITION_STORAGE',
+    default='django.core.files.storage.FileSystemStorage' if DEBUG else '',
+)
+CKEDITOR_5_FILE_STORAGE = 'images.storage.CKEditorUploadStorage'
+IMAGE_RENDITION_CACHE_TIMEOUT = config('IMAGE_RENDITION_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+IMAGE_FETCH_TIMEOUT = config('IMAGE_FETCH_TIMEOUT', default=10, cast=int)
+IMAGE_SOURCE_MAX_BYTES = config('IMAGE_SOURCE_MAX_BYTES', default=20 * 1024 * 1024, cast=int)
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=60 * 60, cast=int)
+API_CACHE_MAX_AGE = config('API_CACHE_MAX_AGE', default=60, cast=int)
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'UNAUTHENTICATED_USER': None,
+}
+PAGE_CACHE_ENABLED = config('PAGE_CACHE_ENABLED', default=True, cast=bool)
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=60 * 60, cast=int)
+# Render sets RENDER_GIT_COMMIT per deploy, so template changes never serve stale pages.
+PAGE_CACHE_BUILD = config('RENDER_GIT_COMMIT', default='')
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -121,6 +253,62 @@ EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
 EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
+EMAIL_TIMEOUT = config("EMAIL_TIMEOUT", default=30, cast=int)
+# Send contact emails from the request's event loop (aiosmtplib) instead of the Celery outbox drain.
+ASYNC_EMAIL_DELIVERY = config("ASYNC_EMAIL_DELIVERY", default=SERVER_PROFILE == "asgi", cast=bool)
+
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", default=REDIS_URL)
+# Without a broker (local dev, tests) tasks run inline in the calling process.
+CELERY_TASK_ALWAYS_EAGER = config(
+    "CELERY_TASK_ALWAYS_EAGER", default=not CELERY_BROKER_URL, cast=bool
+)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_SERIALIZER = "json"
+CELERY_ACCEPT_CONTENT = ["json"]
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    "flush-post-views": {
+        "task": "blog.tasks.flush_post_views",
+        "schedule": config("POST_VIEWS_FLUSH_INTERVAL", default=60, cast=int),
+    },
+    "drain-outbox": {
+        "task": "users.tasks.drain_outbox_task",
+        "schedule": config("OUTBOX_DRAIN_INTERVAL", default=30, cast=int),
+    },
+    "update-trending-posts": {
+        "task": "blog.tasks.update_trending_posts",
+        "schedule": crontab(minute=5),
+    },
+}
+if DB_KEEP_WARM_INTERVAL:
+    CELERY_BEAT_SCHEDULE["keep-database-warm"] = {
+        "task": "status.tasks.keep_database_warm",
+        "schedule": DB_KEEP_WARM_INTERVAL,
+    }
+OUTBOX_BATCH_SIZE = config("OUTBOX_BATCH_SIZE", default=50, cast=int)
+OUTBOX_MAX_BATCHES_PER_RUN = config("OUTBOX_MAX_BATCHES_PER_RUN", default=20, cast=int)
+OUTBOX_MAX_ATTEMPTS = config("OUTBOX_MAX_ATTEMPTS", default=6, cast=int)
+OUTBOX_RETRY_BASE_SECONDS = config("OUTBOX_RETRY_BASE_SECONDS", default=30, cast=int)
+OUTBOX_RETRY_MAX_SECONDS = config("OUTBOX_RETRY_MAX_SECONDS", default=3600, cast=int)
+OUTBOX_CLAIM_TIMEOUT = config("OUTBOX_CLAIM_TIMEOUT", default=600, cast=int)
+# Messages per second and burst size, enforced per worker process.
+OUTBOX_RATE_LIMITS = {
+    "smtp": {
+        "rate": config("OUTBOX_SMTP_RATE", default=2, cast=float),
+        "burst": config("OUTBOX_SMTP_BURST", default=10, cast=int),
+    },
+    "mailtrap_api": {
+        "rate": config("OUTBOX_MAILTRAP_RATE", default=5, cast=float),
+        "burst": config("OUTBOX_MAILTRAP_BURST", default=20, cast=int),
+    },
+    "default": {"rate": 1, "burst": 5},
+}
+TRENDING_WINDOW_HOURS = config("TRENDING_WINDOW_HOURS", default=72, cast=int)
+TRENDING_HALF_LIFE_HOURS = config("TRENDING_HALF_LIFE_HOURS", default=12, cast=float)
+TRENDING_POSTS_COUNT = config("TRENDING_POSTS_COUNT", default=3, cast=int)
 
 CKEDITOR_5_CONFIGS = {
     "default": {
@@ -182,6 +370,7 @@ UNFOLD = {
             {
                 "title": "Clients & Messages",
                 "items": [
+                    {"title": "Inbox", "link": admin_nav.users_inbox},
                     {"title": "Contact Inquiries", "link": admin_nav.users_contact_list},
                     {"title": "MICE Inquiries", "link": admin_nav.users_mice_list},
                     {"title": "Student Travel", "link": admin_nav.users_student_list},
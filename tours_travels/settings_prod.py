@@ -1,16 +1,13 @@
 from .settings import *
 import os
-import dj_database_url
 
 DEBUG = False
+# settings.py derives these from the DEBUG it read from the environment, and
+# not every service exports DEBUG; web and worker must agree on them.
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'False').lower() == 'true'
+IMAGE_RENDITION_STORAGE = os.getenv('IMAGE_RENDITION_STORAGE', '')
 
-DATABASES = {
-    'default': dj_database_url.parse(
-        os.getenv('DATABASE_URL'),
-        conn_max_age=600,
-        conn_health_checks=True,
-    )
-}
+DATABASES = {'default': database_settings(os.getenv('DATABASE_URL'))}
 
 MAILTRAP_API_TOKEN = os.getenv('MAILTRAP_API_TOKEN', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', DEFAULT_FROM_EMAIL)
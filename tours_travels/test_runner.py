@@ -0,0 +1,20 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+# Tests must not depend on a collectstatic manifest; images.tests opts back in
+# to PictureStaticFilesStorage where it exercises the hashed variants.
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.storages = override_settings(STORAGES=TEST_STORAGES)
+        self.storages.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.storages.disable()
+        super().teardown_test_environment(**kwargs)
@@ -3,9 +3,18 @@ from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from status.views import metrics
+from users.views import export_inquiries
+
 urlpatterns = [
+    path('admin/inquiries/export/', export_inquiries, name='inquiry-export'),
     path('admin/', admin.site.urls),
     path('ckeditor5/', include('django_ckeditor_5.urls')),
+    path('health/', include('status.urls')),
+    path('metrics', metrics, name='metrics'),
+    path('search/', include('search.urls')),
+    path('blog/', include('blog.urls')),
+    path('api/v1/', include('api.urls')),
     path('', include('adminside.urls')),
 ]
 
@@ -1,28 +1,129 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.utils import timezone
+
+from adminside.admin import EstimatedCountAdminMixin
+from adminside.pagination import KeysetPage
 
-from .models import ContactInquiry, MICEInquiry, StudentTravelInquiry, NGOTravelInquiry
+from .inbox import source_admin_url
+from .models import (
+    INQUIRY_STATUS,
+    INQUIRY_TYPES,
+    ContactInquiry,
+    InquiryIndex,
+    MICEInquiry,
+    NGOTravelInquiry,
+    Outbox,
+    StudentTravelInquiry,
+)
 
 
 @admin.register(ContactInquiry)
-class ContactInquiryAdmin(admin.ModelAdmin):
+class ContactInquiryAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("full_name", "email", "subject", "is_resolved", "created_at")
     list_filter = ("is_resolved", "created_at")
     search_fields = ("full_name", "email", "subject")
 
 
 @admin.register(MICEInquiry)
-class MICEInquiryAdmin(admin.ModelAdmin):
+class MICEInquiryAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("company_name", "contact_person", "email", "event_type", "created_at")
     search_fields = ("company_name", "contact_person", "email")
 
 
 @admin.register(StudentTravelInquiry)
-class StudentTravelInquiryAdmin(admin.ModelAdmin):
+class StudentTravelInquiryAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("school_name", "contact_person", "email", "program_stage", "created_at")
     search_fields = ("school_name", "contact_person", "email")
 
 
 @admin.register(NGOTravelInquiry)
-class NGOTravelInquiryAdmin(admin.ModelAdmin):
+class NGOTravelInquiryAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("organization_name", "contact_person", "email", "organization_type", "created_at")
     search_fields = ("organization_name", "contact_person", "email")
+
+
+@admin.register(Outbox)
+class OutboxAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ("subject", "status", "provider", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("status", "provider", "created_at")
+    search_fields = ("subject", "recipients")
+    readonly_fields = ("attempts", "locked_at", "last_error", "sent_at", "created_at")
+    actions = ("requeue",)
+
+    @admin.action(description="Requeue selected messages")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status="sent").update(
+            status="pending", attempts=0, next_attempt_at=timezone.now(), locked_at=None
+        )
+        self.message_user(request, f"Requeued {updated} message(s).")
+
+
+@admin.register(InquiryIndex)
+class InquiryIndexAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    """All four inquiry types in one list, paged by (created_at, id) keyset."""
+
+    inbox_template = "admin/users/inquiryindex/inbox.html"
+    filter_choices = {"type": INQUIRY_TYPES, "status": INQUIRY_STATUS}
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def get_filters(self, request):
+        return {
+            name: request.GET[name]
+            for name, choices in self.filter_choices.items()
+            if request.GET.get(name) in dict(choices)
+        }
+
+    def get_filter_links(self, filters):
+        """(label, query, active) triples per filter, led by an "All" link that drops it."""
+        links = {}
+        for name, choices in self.filter_choices.items():
+            others = {key: value for key, value in filters.items() if key != name}
+            links[name] = [("All", urlencode(others), name not in filters)] + [
+                (label, urlencode({**others, name: value}), filters.get(name) == value)
+                for value, label in choices
+            ]
+        return links
+
+    def changelist_view(self, request, extra_context=None):
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+
+        filters = self.get_filters(request)
+        queryset = InquiryIndex.objects.all()
+        if "type" in filters:
+            queryset = queryset.filter(inquiry_type=filters["type"])
+        if "status" in filters:
+            queryset = queryset.filter(status=filters["status"])
+        page = KeysetPage(
+            queryset,
+            settings.INBOX_PAGE_SIZE,
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+        )
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Inbox",
+            "opts": self.model._meta,
+            "page": page,
+            "entries": [(entry, source_admin_url(entry)) for entry in page],
+            "filters": filters,
+            "filter_query": urlencode(filters),
+            "filter_links": self.get_filter_links(filters),
+            **(extra_context or {}),
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, self.inbox_template, context)
@@ -0,0 +1,265 @@
+import logging
+import time
+from email.utils import parseaddr
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.dispatch import Signal
+from django.template.loader import get_template
+
+try:
+    from mailtrap import Mail, Address, MailtrapClient
+except Exception:
+    Mail = None
+    Address = None
+    MailtrapClient = None
+
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+logger = logging.getLogger(__name__)
+
+# Sent once per provider call with provider, message, duration_ms and error.
+email_provider_call = Signal()
+
+_template_cache = {}
+_mailtrap_senders = {}
+
+
+def get_email_template(name):
+    if settings.DEBUG:
+        return get_template(name)
+    template = _template_cache.get(name)
+    if template is None:
+        template = _template_cache[name] = get_template(name)
+    return template
+
+
+def render_email(template_name, context):
+    return get_email_template(template_name).render(context)
+
+
+def build_email(subject, html_message, recipient_list, from_email=None):
+    message = EmailMessage(
+        subject,
+        html_message,
+        from_email or settings.DEFAULT_FROM_EMAIL,
+        [email.strip() for email in recipient_list],
+    )
+    message.content_subtype = "html"
+    return message
+
+
+class DeliveryResult:
+    def __init__(self, message, provider, duration_ms, error=None):
+        self.message = message
+        self.provider = provider
+        self.duration_ms = duration_ms
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"<DeliveryResult {self.provider} {self.duration_ms:.1f}ms {status}>"
+
+
+class BackendTransport:
+    name = "smtp"
+
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    def open(self):
+        self.connection = get_connection(self.backend, fail_silently=False)
+        self.connection.open()
+
+    def send(self, message):
+        self.connection.send_messages([message])
+
+    def close(self):
+        self.connection.close()
+
+
+def get_mailtrap_sender(token):
+    if MailtrapClient is None:
+        raise RuntimeError("Mailtrap client is not available. Install mailtrap package.")
+
+    # MailtrapClient.sending_api builds a new HTTP session on every access, so
+    # keep one per token to reuse its keep-alive connections across batches.
+    sender = _mailtrap_senders.get(token)
+    if sender is None:
+        sender = _mailtrap_senders[token] = MailtrapClient(token=token).sending_api
+    return sender
+
+
+def to_mailtrap_mail(message):
+    from_name, from_email = parseaddr(message.from_email)
+    return Mail(
+        sender=Address(email=from_email, name=from_name or "Ziada Travel"),
+        to=[Address(email=email) for email in message.to],
+        subject=message.subject,
+        html=message.body,
+    )
+
+
+class MailtrapTransport:
+    name = "mailtrap_api"
+
+    def __init__(self, backend=None):
+        pass
+
+    def open(self):
+        self.sender = get_mailtrap_sender(settings.MAILTRAP_API_TOKEN)
+
+    def send(self, message):
+        self.sender.send(to_mailtrap_mail(message))
+
+    def close(self):
+        pass
+
+
+class AsyncSMTPTransport:
+    """SMTP over aiosmtplib, so a slow relay only suspends the calling coroutine."""
+
+    name = "smtp"
+
+    async def open(self):
+        self.client = aiosmtplib.SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            start_tls=settings.EMAIL_USE_TLS,
+            use_tls=getattr(settings, "EMAIL_USE_SSL", False),
+            timeout=getattr(settings, "EMAIL_TIMEOUT", None) or 30,
+        )
+        await self.client.connect()
+        if settings.EMAIL_HOST_USER:
+            await self.client.login(settings.EMAIL_HOST_USER, settings.EMAIL_HOST_PASSWORD)
+
+    async def send(self, message):
+        await self.client.send_message(
+            message.message(), sender=message.from_email, recipients=message.recipients()
+        )
+
+    async def close(self):
+        try:
+            await self.client.quit()
+        except aiosmtplib.SMTPException:
+            self.client.close()
+
+
+TRANSPORTS = {
+    "smtp": BackendTransport,
+    "mailtrap_api": MailtrapTransport,
+}
+
+
+def get_provider():
+    return getattr(settings, "EMAIL_PROVIDER", "mailtrap_api")
+
+
+def get_transport(provider=None, backend=None):
+    return TRANSPORTS.get(provider or get_provider(), BackendTransport)(backend)
+
+
+def get_async_transport(provider=None, backend=None):
+    if aiosmtplib is None or (provider or get_provider()) != "smtp":
+        return None
+    if (backend or settings.EMAIL_BACKEND) != SMTP_BACKEND:
+        return None
+    return AsyncSMTPTransport()
+
+
+def record_delivery(transport, message, duration_ms, error):
+    result = DeliveryResult(message, transport.name, duration_ms, error)
+    email_provider_call.send(
+        sender=transport.__class__,
+        provider=transport.name,
+        message=message,
+        duration_ms=duration_ms,
+        error=error,
+    )
+    logger.info(
+        "email provider=%s subject=%r recipients=%d duration_ms=%.1f ok=%s",
+        transport.name,
+        message.subject,
+        len(message.to),
+        duration_ms,
+        result.ok,
+    )
+    return result
+
+
+def log_close_error(transport):
+    # The batch has already been sent; a failed QUIT must not turn it into retries.
+    logger.warning("email provider=%s close failed", transport.name, exc_info=True)
+
+
+def close_transport(transport):
+    try:
+        transport.close()
+    except Exception:
+        log_close_error(transport)
+
+
+def dispatch(messages, provider=None, backend=None, rate_limiter=None):
+    transport = get_transport(provider, backend)
+    results = []
+
+    transport.open()
+    try:
+        for message in messages:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                transport.send(message)
+            except Exception as exc:
+                error = exc
+            else:
+                error = None
+            duration_ms = (time.perf_counter() - started) * 1000
+            results.append(record_delivery(transport, message, duration_ms, error))
+    finally:
+        close_transport(transport)
+
+    return results
+
+
+async def adispatch(messages, provider=None, backend=None, rate_limiter=None):
+    transport = get_async_transport(provider, backend)
+    if transport is None:
+        # No async client for this provider; keep the blocking calls off the event loop.
+        return await sync_to_async(dispatch, thread_sensitive=False)(
+            messages, provider, backend, rate_limiter
+        )
+
+    results = []
+    await transport.open()
+    try:
+        for message in messages:
+            if rate_limiter is not None:
+                await rate_limiter.aacquire()
+            started = time.perf_counter()
+            try:
+                await transport.send(message)
+            except Exception as exc:
+                error = exc
+            else:
+                error = None
+            duration_ms = (time.perf_counter() - started) * 1000
+            results.append(record_delivery(transport, message, duration_ms, error))
+    finally:
+        try:
+            await transport.close()
+        except Exception:
+            log_close_error(transport)
+
+    return results
@@ -0,0 +1,147 @@
+"""
+Streaming exports of the inquiry tables.
+
+Rows are read as ``values_list`` tuples in ``EXPORT_CHUNK_SIZE`` batches and
+serialized one batch at a time, so memory stays flat however many rows an
+export covers. The same generators back the admin endpoint and the
+``export_inquiries`` command.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.utils import timezone
+
+from .models import INQUIRY_MODELS
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def export_kinds(kind):
+    return list(INQUIRY_MODELS) if kind == "all" else [kind]
+
+
+def export_fields(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_inquiries(model, since=None, until=None, resolved=None):
+    """``since`` and ``until`` are inclusive dates; only contact inquiries can be resolved."""
+    queryset = model.objects.order_by("pk")
+    if since:
+        queryset = queryset.filter(created_at__gte=day_start(since))
+    if until:
+        queryset = queryset.filter(created_at__lt=day_start(until + timedelta(days=1)))
+    if resolved is not None:
+        if any(field.name == "is_resolved" for field in model._meta.fields):
+            queryset = queryset.filter(is_resolved=resolved)
+        elif resolved:
+            queryset = queryset.none()
+    return queryset
+
+
+def iter_values(queryset, fields, chunk_size):
+    if not connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+        return
+
+    # Behind pgbouncer there is no server-side cursor and iterator() would pull
+    # the whole result into the client, so walk the primary key instead.
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page.values_list(*fields)[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
+
+
+def iter_records(kinds, since=None, until=None, resolved=None, chunk_size=None):
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    for kind in kinds:
+        model = INQUIRY_MODELS[kind]
+        fields = export_fields(model)
+        queryset = filter_inquiries(model, since, until, resolved)
+        for values in iter_values(queryset, fields, chunk_size):
+            yield kind, dict(zip(fields, values))
+
+
+def csv_columns(kinds):
+    columns = ["type"]
+    for kind in kinds:
+        columns += [name for name in export_fields(INQUIRY_MODELS[kind]) if name not in columns]
+    return columns
+
+
+# Spreadsheets run cells starting with these as formulas; DDE payloads arrive in inquiry text.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def flush(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def stream_csv(kinds, records, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=csv_columns(kinds), restval="")
+    writer.writeheader()
+    for count, (kind, record) in enumerate(records, 1):
+        writer.writerow({"type": kind, **{name: csv_safe(value) for name, value in record.items()}})
+        if count % chunk_size == 0:
+            yield flush(buffer)
+    yield flush(buffer)
+
+
+def stream_jsonl(kinds, records, chunk_size):
+    buffer = io.StringIO()
+    for count, (kind, record) in enumerate(records, 1):
+        buffer.write(json.dumps({"type": kind, **record}, cls=DjangoJSONEncoder))
+        buffer.write("\n")
+        if count % chunk_size == 0:
+            yield flush(buffer)
+    yield flush(buffer)
+
+
+STREAMERS = {
+    "csv": stream_csv,
+    "jsonl": stream_jsonl,
+}
+
+
+def stream_export(kind="all", export_format="csv", since=None, until=None, resolved=None, chunk_size=None):
+    """Yield the export as text, one chunk of rows at a time."""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    kinds = export_kinds(kind)
+    records = iter_records(kinds, since, until, resolved, chunk_size)
+    return STREAMERS[export_format](kinds, records, chunk_size)
+
+
+def export_filename(kind, export_format, since=None, until=None):
+    parts = ["inquiries", kind]
+    if since:
+        parts.append(f"from-{since.isoformat()}")
+    if until:
+        parts.append(f"to-{until.isoformat()}")
+    return f"{'-'.join(parts)}.{export_format}"
@@ -1,6 +1,7 @@
 from django import forms
 
-from .models import ContactInquiry
+from .exports import EXPORT_FORMATS
+from .models import INQUIRY_MODELS, ContactInquiry
 
 
 TRAVEL_CATEGORY_CHOICES = (
@@ -79,3 +80,21 @@ class ContactForm(forms.ModelForm):
 
         self.fields["privacy_consent"].required = False
         self.fields["privacy_consent"].widget = forms.HiddenInput()
+
+
+class InquiryExportForm(forms.Form):
+    type = forms.ChoiceField(choices=[("all", "All")], required=False)
+    format = forms.ChoiceField(choices=[(name, name) for name in EXPORT_FORMATS], required=False)
+    since = forms.DateField(required=False)
+    until = forms.DateField(required=False)
+    resolved = forms.NullBooleanField(required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["type"].choices += [(kind, kind) for kind in INQUIRY_MODELS]
+
+    def clean_type(self):
+        return self.cleaned_data["type"] or "all"
+
+    def clean_format(self):
+        return self.cleaned_data["format"] or "csv"
@@ -0,0 +1,67 @@
+"""
+Maintenance of InquiryIndex, the single table the admin inbox pages through.
+
+Writes are upserts on (inquiry_type, object_id), so a save is one query
+whether or not the inquiry was indexed before.
+"""
+
+from itertools import islice
+
+from django.urls import reverse
+
+from .models import INQUIRY_MODELS, InquiryIndex
+
+INQUIRY_KINDS = {model._meta.model_name: kind for kind, model in INQUIRY_MODELS.items()}
+NAME_FIELDS = {
+    "contact": "full_name",
+    "mice": "contact_person",
+    "student": "contact_person",
+    "ngo": "contact_person",
+}
+INDEXED_FIELDS = ["name", "email", "status", "created_at"]
+
+
+def inquiry_kind(model):
+    return INQUIRY_KINDS[model._meta.model_name]
+
+
+def index_entry(kind, inquiry):
+    return InquiryIndex(
+        inquiry_type=kind,
+        object_id=inquiry.pk,
+        name=getattr(inquiry, NAME_FIELDS[kind]),
+        email=inquiry.email,
+        status="resolved" if getattr(inquiry, "is_resolved", False) else "open",
+        created_at=inquiry.created_at,
+    )
+
+
+def index_inquiries(model, inquiries, batch_size=1000, using=None):
+    kind = inquiry_kind(model)
+    entries = [index_entry(kind, inquiry) for inquiry in inquiries]
+    InquiryIndex.objects.using(using).bulk_create(
+        entries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["inquiry_type", "object_id"],
+        update_fields=INDEXED_FIELDS,
+    )
+    return len(entries)
+
+
+def unindex_inquiry(inquiry, using=None):
+    InquiryIndex.objects.using(using).filter(inquiry_type=inquiry_kind(type(inquiry)), object_id=inquiry.pk).delete()
+
+
+def rebuild_inquiry_index(models=None, batch_size=1000, using=None):
+    indexed = 0
+    for model in models or INQUIRY_MODELS.values():
+        rows = model.objects.using(using).order_by("pk").iterator(chunk_size=batch_size)
+        while batch := list(islice(rows, batch_size)):
+            indexed += index_inquiries(model, batch, batch_size, using)
+    return indexed
+
+
+def source_admin_url(entry):
+    model = INQUIRY_MODELS[entry.inquiry_type]
+    return reverse(f"admin:users_{model._meta.model_name}_change", args=[entry.object_id])
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import drain_outbox
+
+BACKENDS = {
+    "console": "django.core.mail.backends.console.EmailBackend",
+    "locmem": "django.core.mail.backends.locmem.EmailBackend",
+}
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox messages in rate-limited batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Messages claimed per batch")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+        parser.add_argument(
+            "--backend",
+            choices=sorted(BACKENDS),
+            default=None,
+            help="Deliver through a local Django email backend instead of the configured provider",
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new messages")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        backend = BACKENDS.get(options["backend"])
+        provider = "smtp" if backend else None
+
+        while True:
+            sent = drain_outbox(
+                batch_size=options["batch_size"],
+                max_batches=options["max_batches"],
+                backend=backend,
+                provider=provider,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Delivered {sent} message(s)."))
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,43 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from users.exports import EXPORT_FORMATS, stream_export
+from users.models import INQUIRY_MODELS
+
+
+class Command(BaseCommand):
+    help = "Stream inquiries as CSV or JSON lines without loading the tables into memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", choices=["all", *INQUIRY_MODELS], default="all")
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--since", type=date.fromisoformat, help="First day to include (YYYY-MM-DD)")
+        parser.add_argument("--until", type=date.fromisoformat, help="Last day to include (YYYY-MM-DD)")
+        status = parser.add_mutually_exclusive_group()
+        status.add_argument("--resolved", action="store_true", help="Only resolved inquiries")
+        status.add_argument("--unresolved", action="store_true", help="Only unresolved inquiries")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows fetched and written per batch")
+        parser.add_argument("--output", help="Write to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        resolved = None
+        if options["resolved"] or options["unresolved"]:
+            resolved = options["resolved"]
+        chunks = stream_export(
+            options["type"],
+            options["format"],
+            since=options["since"],
+            until=options["until"],
+            resolved=resolved,
+            chunk_size=options["chunk_size"],
+        )
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:28
+
+from itertools import islice
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+# Model name -> (inquiry_type, name field), as the index was defined in this migration.
+SOURCES = {
+    'ContactInquiry': ('contact', 'full_name'),
+    'MICEInquiry': ('mice', 'contact_person'),
+    'StudentTravelInquiry': ('student', 'contact_person'),
+    'NGOTravelInquiry': ('ngo', 'contact_person'),
+}
+
+
+def backfill_index(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    InquiryIndex = apps.get_model('users', 'InquiryIndex')
+    for model_name, (kind, name_field) in SOURCES.items():
+        model = apps.get_model('users', model_name)
+        rows = model.objects.using(alias).order_by('pk').iterator(chunk_size=BATCH_SIZE)
+        while batch := list(islice(rows, BATCH_SIZE)):
+            InquiryIndex.objects.using(alias).bulk_create([
+                InquiryIndex(
+                    inquiry_type=kind,
+                    object_id=inquiry.pk,
+                    name=getattr(inquiry, name_field),
+                    email=inquiry.email,
+                    status='resolved' if getattr(inquiry, 'is_resolved', False) else 'open',
+                    created_at=inquiry.created_at,
+                )
+                for inquiry in batch
+            ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InquiryIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inquiry_type', models.CharField(choices=[('contact', 'Contact'), ('mice', 'MICE'), ('student', 'Student Travel'), ('ngo', 'NGO Travel')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('name', models.CharField(max_length=200)),
+                ('email', models.EmailField(max_length=254)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('resolved', 'Resolved')], default='open', max_length=20)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Inbox Entry',
+                'verbose_name_plural': 'Inbox',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='inquiry_index_created_idx'), models.Index(fields=['status', '-created_at', '-id'], name='inquiry_index_status_idx'), models.Index(fields=['inquiry_type', '-created_at', '-id'], name='inquiry_index_type_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='inquiryindex',
+            constraint=models.UniqueConstraint(fields=('inquiry_type', 'object_id'), name='inquiry_index_source_uniq'),
+        ),
+        migrations.RunPython(backfill_index, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class ContactInquiry(models.Model):
@@ -70,3 +71,84 @@ class NGOTravelInquiry(models.Model):
 
     def __str__(self):
         return self.organization_name
+
+
+INQUIRY_MODELS = {
+    "contact": ContactInquiry,
+    "mice": MICEInquiry,
+    "student": StudentTravelInquiry,
+    "ngo": NGOTravelInquiry,
+}
+
+INQUIRY_TYPES = (
+    ("contact", "Contact"),
+    ("mice", "MICE"),
+    ("student", "Student Travel"),
+    ("ngo", "NGO Travel"),
+)
+
+INQUIRY_STATUS = (
+    ("open", "Open"),
+    ("resolved", "Resolved"),
+)
+
+
+class InquiryIndex(models.Model):
+    """One row per inquiry of any type, kept in step by users.signals."""
+
+    inquiry_type = models.CharField(choices=INQUIRY_TYPES, max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    name = models.CharField(max_length=200)
+    email = models.EmailField()
+    status = models.CharField(choices=INQUIRY_STATUS, max_length=20, default="open")
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        verbose_name = "Inbox Entry"
+        verbose_name_plural = "Inbox"
+        constraints = [
+            models.UniqueConstraint(fields=["inquiry_type", "object_id"], name="inquiry_index_source_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="inquiry_index_created_idx"),
+            models.Index(fields=["status", "-created_at", "-id"], name="inquiry_index_status_idx"),
+            models.Index(fields=["inquiry_type", "-created_at", "-id"], name="inquiry_index_type_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_inquiry_type_display()})"
+
+
+OUTBOX_STATUS = (
+    ("pending", "Pending"),
+    ("sending", "Sending"),
+    ("sent", "Sent"),
+    ("dead", "Dead Letter"),
+)
+
+
+class Outbox(models.Model):
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    provider = models.CharField(max_length=50, blank=True, default="")
+    status = models.CharField(choices=OUTBOX_STATUS, max_length=20, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Outbox Message"
+        verbose_name_plural = "Outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.get_status_display()})"
@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .dispatch import DeliveryResult, adispatch, build_email, dispatch, get_provider
+from .models import Outbox
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        with self.lock:
+            self.refill()
+            if self.tokens < 1:
+                self.sleep((1 - self.tokens) / self.rate)
+                self.refill()
+            self.tokens -= 1
+
+    async def aacquire(self):
+        with self.lock:
+            self.refill()
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_buckets = {}
+
+
+def get_rate_limiter(provider):
+    bucket = _buckets.get(provider)
+    if bucket is None:
+        limits = settings.OUTBOX_RATE_LIMITS.get(provider, settings.OUTBOX_RATE_LIMITS["default"])
+        bucket = _buckets[provider] = TokenBucket(limits["rate"], limits["burst"])
+    return bucket
+
+
+def outbox_entry(message, provider="", claimed=False):
+    entry = Outbox(
+        subject=message.subject,
+        html_body=message.body,
+        from_email=message.from_email,
+        recipients=list(message.to),
+        provider=provider,
+    )
+    if claimed:
+        # Delivered by the caller; the drain only retries it once the claim goes stale.
+        entry.status = "sending"
+        entry.locked_at = timezone.now()
+    return entry
+
+
+def enqueue_email(message, provider="", claimed=False):
+    entry = outbox_entry(message, provider, claimed)
+    entry.save()
+    return entry
+
+
+async def aenqueue_email(message, provider="", claimed=False):
+    entry = outbox_entry(message, provider, claimed)
+    await entry.asave()
+    return entry
+
+
+def retry_delay(attempts):
+    delay = settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+    return timedelta(seconds=min(delay, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim_batch(batch_size, now=None):
+    now = now or timezone.now()
+    stale = now - timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+    due = Q(status="pending", next_attempt_at__lte=now) | Q(status="sending", locked_at__lt=stale)
+
+    with transaction.atomic():
+        rows = list(
+            Outbox.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("next_attempt_at", "pk")
+            .values_list("pk", "status")[:batch_size]
+        )
+        ids = [pk for pk, _ in rows]
+        Outbox.objects.filter(pk__in=ids).update(status="sending", locked_at=now)
+
+        # A stale claim is a delivery that never reported back; count it, so a
+        # message that keeps killing its sender is dead-lettered, not retried forever.
+        reclaimed = [pk for pk, status in rows if status == "sending"]
+        if reclaimed:
+            Outbox.objects.filter(pk__in=reclaimed).update(attempts=F("attempts") + 1)
+            Outbox.objects.filter(pk__in=reclaimed, attempts__gte=settings.OUTBOX_MAX_ATTEMPTS).update(
+                status="dead", locked_at=None, last_error="Claim went stale before delivery finished"
+            )
+    return list(Outbox.objects.filter(pk__in=ids, status="sending").order_by("next_attempt_at", "pk"))
+
+
+def record_results(entries, results, now=None):
+    now = now or timezone.now()
+    sent_ids = [entry.pk for entry, result in zip(entries, results) if result.ok]
+    if sent_ids:
+        Outbox.objects.filter(pk__in=sent_ids).update(
+            status="sent", sent_at=now, locked_at=None, attempts=F("attempts") + 1, last_error=""
+        )
+
+    for entry, result in zip(entries, results):
+        if result.ok:
+            continue
+        attempts = entry.attempts + 1
+        dead = attempts >= settings.OUTBOX_MAX_ATTEMPTS
+        Outbox.objects.filter(pk=entry.pk).update(
+            status="dead" if dead else "pending",
+            attempts=attempts,
+            locked_at=None,
+            next_attempt_at=now if dead else now + retry_delay(attempts),
+            last_error=f"{result.error.__class__.__name__}: {result.error}",
+        )
+    return len(sent_ids)
+
+
+def entry_messages(entries):
+    return [
+        build_email(entry.subject, entry.html_body, entry.recipients, from_email=entry.from_email)
+        for entry in entries
+    ]
+
+
+def deliver(entries, provider, backend=None):
+    messages = entry_messages(entries)
+    try:
+        results = dispatch(
+            messages,
+            provider=provider,
+            backend=backend,
+            rate_limiter=get_rate_limiter(provider),
+        )
+    except Exception as exc:
+        # The transport could not even open; every message in the batch failed.
+        results = [DeliveryResult(message, provider, 0, exc) for message in messages]
+    return record_results(entries, results)
+
+
+async def adeliver(entries, provider, backend=None):
+    messages = entry_messages(entries)
+    try:
+        results = await adispatch(
+            messages,
+            provider=provider,
+            backend=backend,
+            rate_limiter=get_rate_limiter(provider),
+        )
+    except Exception as exc:
+        results = [DeliveryResult(message, provider, 0, exc) for message in messages]
+    return await sync_to_async(record_results)(entries, results)
+
+
+def drain_outbox(batch_size=None, max_batches=None, backend=None, provider=None):
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    sent = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        entries = claim_batch(batch_size)
+        if not entries:
+            break
+        batches += 1
+
+        by_provider = {}
+        for entry in entries:
+            by_provider.setdefault(provider or entry.provider or get_provider(), []).append(entry)
+        for group_provider, group in by_provider.items():
+            sent += deliver(group, group_provider, backend=backend)
+
+    return sent
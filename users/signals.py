@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .inbox import index_inquiries, unindex_inquiry
+from .models import ContactInquiry, MICEInquiry, NGOTravelInquiry, StudentTravelInquiry
+
+
+@receiver(post_save, sender=ContactInquiry)
+@receiver(post_save, sender=MICEInquiry)
+@receiver(post_save, sender=StudentTravelInquiry)
+@receiver(post_save, sender=NGOTravelInquiry)
+def index_saved_inquiry(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    index_inquiries(sender, [instance], using=using)
+
+
+@receiver(post_delete, sender=ContactInquiry)
+@receiver(post_delete, sender=MICEInquiry)
+@receiver(post_delete, sender=StudentTravelInquiry)
+@receiver(post_delete, sender=NGOTravelInquiry)
+def unindex_deleted_inquiry(sender, instance, using, **kwargs):
+    unindex_inquiry(instance, using=using)
@@ -1,77 +1,90 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from celery import shared_task
 from django.conf import settings
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
+from django.db import transaction
+
+from .dispatch import build_email, dispatch, get_provider, render_email
+from .outbox import adeliver, aenqueue_email, drain_outbox, enqueue_email
 
-try:
-    from mailtrap import Mail, Address, MailtrapClient
-except Exception:
-    Mail = None
-    Address = None
-    MailtrapClient = None
+CONTACT_USER_SUBJECT = "We received your request"
+CONTACT_ADMIN_SUBJECT = "New contact inquiry"
 
+# Strong references to in-flight deliveries so the event loop cannot drop them.
+background_deliveries = set()
 
-def send_email_via_mailtrap(subject, html_message, from_email, recipient_list):
-    if MailtrapClient is None:
-        raise RuntimeError("Mailtrap client is not available. Install mailtrap package.")
+CONTACT_EMAILS = {
+    "confirmation": (CONTACT_USER_SUBJECT, "users/emails/user_confirmation.html"),
+    "admin": (CONTACT_ADMIN_SUBJECT, "users/emails/admin_notification.html"),
+}
 
-    client = MailtrapClient(token=settings.MAILTRAP_API_TOKEN)
 
-    if "<" in from_email and ">" in from_email:
-        from_name = from_email.split("<")[0].strip()
-        from_email_addr = from_email.split("<")[1].split(">")[0].strip()
-    else:
-        from_name = "Ziada Travel"
-        from_email_addr = from_email.strip()
+@shared_task
+def drain_outbox_task():
+    return drain_outbox(max_batches=settings.OUTBOX_MAX_BATCHES_PER_RUN)
 
-    mail = Mail(
-        sender=Address(email=from_email_addr, name=from_name),
-        to=[Address(email=email.strip()) for email in recipient_list],
-        subject=subject,
-        html=html_message,
-    )
 
-    client.send(mail)
-    return True
+def schedule_outbox_drain():
+    transaction.on_commit(drain_outbox_task.delay)
 
 
 def send_email(subject, html_message, recipient_list):
-    provider = getattr(settings, "EMAIL_PROVIDER", "mailtrap_api")
-    from_email = settings.DEFAULT_FROM_EMAIL
+    entry = enqueue_email(build_email(subject, html_message, recipient_list))
+    schedule_outbox_drain()
+    return entry
 
-    if provider == "mailtrap_api":
-        return send_email_via_mailtrap(subject, html_message, from_email, recipient_list)
 
-    email = EmailMessage(subject, html_message, from_email, recipient_list)
-    email.content_subtype = "html"
-    email.send(fail_silently=False)
-    return True
+def get_extra_recipients():
+    return [
+        email.strip()
+        for email in getattr(settings, "EXTRA_EMAIL_RECIPIENTS", [])
+        if email.strip()
+    ]
+
+
+def build_contact_emails(inquiry):
+    context = {
+        "inquiry": inquiry,
+        "site_url": getattr(settings, "SITE_URL", "").rstrip("/"),
+    }
+    extra_recipients = get_extra_recipients()
+    recipients = {
+        "confirmation": [inquiry.email] + extra_recipients,
+        "admin": [settings.ADMIN_EMAIL] + extra_recipients,
+    }
+    return [
+        build_email(subject, render_email(template_name, context), recipients[kind])
+        for kind, (subject, template_name) in CONTACT_EMAILS.items()
+    ]
 
 
 def send_contact_emails(inquiry):
-    user_subject = "We received your request"
-    admin_subject = "New contact inquiry"
+    for result in dispatch(build_contact_emails(inquiry)):
+        if not result.ok:
+            raise result.error
 
-    extra_recipients = [
-        email.strip()
-        for email in getattr(settings, "EXTRA_EMAIL_RECIPIENTS", [])
-        if email.strip()
+
+def queue_contact_emails(inquiry):
+    for message in build_contact_emails(inquiry):
+        enqueue_email(message)
+    schedule_outbox_drain()
+
+
+async def aenqueue_contact_emails(inquiry):
+    return [
+        await aenqueue_email(message, claimed=True) for message in build_contact_emails(inquiry)
     ]
 
-    site_url = getattr(settings, "SITE_URL", "").rstrip("/")
-    user_html = render_to_string(
-        "users/emails/user_confirmation.html",
-        {
-            "inquiry": inquiry,
-            "site_url": site_url,
-        },
-    )
-    admin_html = render_to_string(
-        "users/emails/admin_notification.html",
-        {
-            "inquiry": inquiry,
-            "site_url": site_url,
-        },
-    )
-
-    send_email(user_subject, user_html, [inquiry.email] + extra_recipients)
-    send_email(admin_subject, admin_html, [settings.ADMIN_EMAIL] + extra_recipients)
+
+async def aqueue_contact_emails(inquiry):
+    if not settings.ASYNC_EMAIL_DELIVERY:
+        return await sync_to_async(queue_contact_emails)(inquiry)
+
+    # Rows are written before the response; if this process dies mid-send the
+    # outbox drain picks them up again once their claim times out.
+    entries = await aenqueue_contact_emails(inquiry)
+    task = asyncio.create_task(adeliver(entries, get_provider()))
+    background_deliveries.add(task)
+    task.add_done_callback(background_deliveries.discard)
+    return task
@@ -1,11 +1,37 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
 from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.core.mail.backends.locmem import EmailBackend
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
-from .models import ContactInquiry
+from .dispatch import build_email, email_provider_call
+from .exports import iter_values
+from .inbox import rebuild_inquiry_index
+from .models import (
+    ContactInquiry,
+    InquiryIndex,
+    MICEInquiry,
+    NGOTravelInquiry,
+    Outbox,
+    StudentTravelInquiry,
+)
+from .outbox import TokenBucket, drain_outbox, enqueue_email, retry_delay
+from .tasks import aqueue_contact_emails, background_deliveries, queue_contact_emails
 
 
 @override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
     EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
     EMAIL_PROVIDER="smtp",
     DEFAULT_FROM_EMAIL="Ziada Tours and Travel <info@ziadatoursandtravel.com>",
@@ -23,7 +49,8 @@ class ContactInquiryEmailTests(TestCase):
             "privacy_consent": "on",
         }
 
-        response = self.client.post(reverse("contact"), data=payload, follow=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("contact"), data=payload, follow=True)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(ContactInquiry.objects.count(), 1)
@@ -43,3 +70,361 @@ class ContactInquiryEmailTests(TestCase):
 
         for email in mail.outbox:
             self.assertEqual(email.from_email, "Ziada Tours and Travel <info@ziadatoursandtravel.com>")
+
+    def test_contact_emails_wait_for_commit(self):
+        payload = {
+            "full_name": "Test User",
+            "email": "user@example.com",
+            "subject": "Safari Experience",
+            "message": "I want to plan a safari.",
+        }
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(reverse("contact"), data=payload)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(Outbox.objects.filter(status="pending").count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(ASYNC_EMAIL_DELIVERY=True)
+    async def test_async_profile_delivers_from_the_event_loop(self):
+        payload = {
+            "full_name": "Test User",
+            "email": "user@example.com",
+            "subject": "Safari Experience",
+            "message": "I want to plan a safari.",
+        }
+
+        response = await self.async_client.post(reverse("contact"), data=payload)
+        await asyncio.gather(*background_deliveries)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 2)
+        statuses = [status async for status in Outbox.objects.values_list("status", flat=True)]
+        self.assertEqual(statuses, ["sent", "sent"])
+
+    @override_settings(ASYNC_EMAIL_DELIVERY=True)
+    async def test_async_profile_writes_outbox_rows_before_responding(self):
+        inquiry = await ContactInquiry.objects.acreate(
+            full_name="Test User", email="user@example.com", subject="Safari", message="Hi"
+        )
+
+        task = await aqueue_contact_emails(inquiry)
+        # A recycled worker cancels the delivery; the claimed rows stay for the drain.
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        statuses = [status async for status in Outbox.objects.values_list("status", flat=True)]
+        self.assertEqual(statuses, ["sending", "sending"])
+
+    def create_inquiry(self):
+        return ContactInquiry.objects.create(
+            full_name="Test User",
+            email="user@example.com",
+            subject="Safari Experience",
+            message="I want to plan a safari.",
+        )
+
+    def test_contact_emails_are_queued_in_outbox(self):
+        with self.captureOnCommitCallbacks():
+            queue_contact_emails(self.create_inquiry())
+
+        self.assertEqual(
+            sorted(Outbox.objects.values_list("subject", "status")),
+            [("New contact inquiry", "pending"), ("We received your request", "pending")],
+        )
+
+    def test_batch_shares_one_connection_and_reports_timings(self):
+        with self.captureOnCommitCallbacks():
+            queue_contact_emails(self.create_inquiry())
+        calls = []
+
+        def record(sender, **kwargs):
+            calls.append(kwargs)
+
+        email_provider_call.connect(record)
+        self.addCleanup(email_provider_call.disconnect, record)
+
+        with mock.patch.object(EmailBackend, "open", autospec=True, return_value=True) as opened:
+            self.assertEqual(drain_outbox(), 2)
+
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual([call["provider"] for call in calls], ["smtp", "smtp"])
+        self.assertTrue(all(call["duration_ms"] >= 0 and call["error"] is None for call in calls))
+        self.assertFalse(Outbox.objects.exclude(status="sent").exists())
+
+    def test_failed_message_is_retried_with_backoff(self):
+        with self.captureOnCommitCallbacks():
+            queue_contact_emails(self.create_inquiry())
+        original = EmailBackend.send_messages
+
+        def flaky_send(backend, messages):
+            if messages[0].subject == "New contact inquiry":
+                raise ConnectionError("provider unavailable")
+            return original(backend, messages)
+
+        with mock.patch.object(EmailBackend, "send_messages", autospec=True, side_effect=flaky_send):
+            self.assertEqual(drain_outbox(), 1)
+
+        failed = Outbox.objects.get(subject="New contact inquiry")
+        self.assertEqual(failed.status, "pending")
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn("provider unavailable", failed.last_error)
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+
+        # Not due yet, so a second drain leaves it alone.
+        self.assertEqual(drain_outbox(), 0)
+
+        Outbox.objects.filter(pk=failed.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(drain_outbox(), 1)
+        self.assertEqual(
+            sorted(email.subject for email in mail.outbox),
+            ["New contact inquiry", "We received your request"],
+        )
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_message_is_dead_lettered_after_max_attempts(self):
+        entry = enqueue_email(build_email("Hello", "<p>Hi</p>", ["user@example.com"]))
+
+        with mock.patch.object(EmailBackend, "send_messages", side_effect=ConnectionError("down")):
+            drain_outbox()
+            Outbox.objects.filter(pk=entry.pk).update(next_attempt_at=timezone.now())
+            drain_outbox()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, "dead")
+        self.assertEqual(entry.attempts, 2)
+        self.assertEqual(drain_outbox(), 0)
+
+    def test_each_batch_delivers_rows_through_their_own_provider(self):
+        for provider in ("mailtrap_api", "smtp", "mailtrap_api", "smtp"):
+            enqueue_email(build_email(provider, "<p>Hi</p>", ["user@example.com"]), provider=provider)
+        calls = []
+
+        def record(sender, provider, message, **kwargs):
+            calls.append((message.subject, provider))
+
+        email_provider_call.connect(record)
+        self.addCleanup(email_provider_call.disconnect, record)
+
+        with mock.patch("users.dispatch.MailtrapTransport.open"), mock.patch(
+            "users.dispatch.MailtrapTransport.send"
+        ):
+            self.assertEqual(drain_outbox(batch_size=2, max_batches=2), 4)
+
+        self.assertEqual(calls, [(subject, subject) for subject in ("mailtrap_api", "smtp") * 2])
+
+        with self.settings(OUTBOX_RETRY_BASE_SECONDS=30, OUTBOX_RETRY_MAX_SECONDS=100):
+            self.assertEqual(
+                [retry_delay(attempts).total_seconds() for attempts in (1, 2, 3, 4)],
+                [30, 60, 100, 100],
+            )
+
+    def test_stale_claims_are_reclaimed(self):
+        entry = enqueue_email(build_email("Hello", "<p>Hi</p>", ["user@example.com"]))
+        Outbox.objects.filter(pk=entry.pk).update(
+            status="sending", locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(drain_outbox(), 1)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, "sent")
+        self.assertEqual(entry.attempts, 2)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_repeatedly_stale_claim_is_dead_lettered(self):
+        entry = enqueue_email(build_email("Hello", "<p>Hi</p>", ["user@example.com"]))
+        Outbox.objects.filter(pk=entry.pk).update(
+            status="sending", attempts=1, locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(drain_outbox(), 0)
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ("dead", 2))
+        self.assertEqual(mail.outbox, [])
+
+    def test_close_error_does_not_fail_a_sent_batch(self):
+        enqueue_email(build_email("Hello", "<p>Hi</p>", ["user@example.com"]))
+
+        with mock.patch.object(EmailBackend, "close", side_effect=ConnectionError("reset")):
+            with self.assertLogs("users.dispatch", "WARNING"):
+                self.assertEqual(drain_outbox(), 1)
+
+        self.assertEqual(Outbox.objects.get().status, "sent")
+
+
+class TokenBucketTests(TestCase):
+    def test_waits_for_tokens_once_burst_is_spent(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, burst=3, clock=lambda: now[0], sleep=sleep)
+        for _ in range(5):
+            bucket.acquire()
+
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+    def test_refills_over_time_up_to_burst(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=1, burst=2, clock=lambda: now[0], sleep=self.fail)
+        bucket.acquire()
+        bucket.acquire()
+
+        now[0] = 10.0
+        bucket.acquire()
+        self.assertEqual(bucket.tokens, 1)
+
+
+class InquiryExportTests(TestCase):
+    def setUp(self):
+        self.old = ContactInquiry.objects.create(
+            full_name="Old", email="old@example.com", subject="Safari", message="Hi", is_resolved=True
+        )
+        ContactInquiry.objects.filter(pk=self.old.pk).update(created_at=timezone.now() - timedelta(days=30))
+        self.new = ContactInquiry.objects.create(
+            full_name="New", email="new@example.com", subject="Beach", message="Hello"
+        )
+        MICEInquiry.objects.create(
+            company_name="Acme", contact_person="Ann", email="ann@example.com", phone_number="0700",
+            event_type="Retreat", attendees=40, event_details="Offsite",
+        )
+        self.staff = get_user_model().objects.create_user("staff", password="pw", is_staff=True)
+
+    def export(self, **params):
+        response = self.client.get(reverse("inquiry-export"), params)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def grant(self, *models):
+        for model in models:
+            self.staff.user_permissions.add(
+                Permission.objects.get(codename=f"view_{model._meta.model_name}")
+            )
+
+    def test_csv_export_streams_filtered_rows(self):
+        self.grant(ContactInquiry)
+        self.client.force_login(self.staff)
+        since = (timezone.localdate() - timedelta(days=1)).isoformat()
+
+        rows = list(csv.DictReader(io.StringIO(self.export(type="contact", since=since))))
+
+        self.assertEqual([row["full_name"] for row in rows], ["New"])
+        self.assertEqual(rows[0]["type"], "contact")
+        self.assertEqual(rows[0]["is_resolved"], "False")
+
+    def test_csv_export_neutralises_formulas(self):
+        self.grant(ContactInquiry)
+        self.client.force_login(self.staff)
+        ContactInquiry.objects.filter(pk=self.new.pk).update(
+            full_name="=HYPERLINK(\"http://evil.example\")", message="@SUM(A1)", subject="-2+3"
+        )
+
+        rows = list(csv.DictReader(io.StringIO(self.export(type="contact"))))
+        record = next(row for row in rows if row["email"] == "new@example.com")
+
+        self.assertEqual(record["full_name"], "'=HYPERLINK(\"http://evil.example\")")
+        self.assertEqual(record["message"], "'@SUM(A1)")
+        self.assertEqual(record["subject"], "'-2+3")
+        self.assertEqual(record["id"], str(self.new.pk))
+        jsonl = json.loads(self.export(type="contact", format="jsonl").splitlines()[-1])
+        self.assertEqual(jsonl["message"], "@SUM(A1)")
+
+    def test_jsonl_export_covers_every_table_and_resolved_filter(self):
+        self.grant(ContactInquiry, MICEInquiry, StudentTravelInquiry, NGOTravelInquiry)
+        self.client.force_login(self.staff)
+
+        records = [json.loads(line) for line in self.export(format="jsonl").splitlines()]
+        resolved = [json.loads(line) for line in self.export(format="jsonl", resolved="true").splitlines()]
+
+        self.assertEqual(sorted(record["type"] for record in records), ["contact", "contact", "mice"])
+        self.assertEqual([record["full_name"] for record in resolved], ["Old"])
+
+    def test_export_requires_view_permission_on_every_table(self):
+        self.grant(ContactInquiry)
+        self.client.force_login(self.staff)
+
+        self.assertEqual(self.client.get(reverse("inquiry-export"), {"type": "all"}).status_code, 403)
+        self.assertEqual(self.client.get(reverse("inquiry-export"), {"format": "xml"}).status_code, 400)
+
+    def test_keyset_batches_without_server_side_cursors(self):
+        for index in range(3):
+            NGOTravelInquiry.objects.create(
+                organization_name=f"Org {index}", contact_person="Bo", email="bo@example.com",
+                phone_number="0700", organization_type="Health", travel_purpose="Visit",
+                number_of_travelers=3, travel_details="Trip",
+            )
+        queryset = NGOTravelInquiry.objects.order_by("pk")
+
+        with mock.patch.dict(connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}):
+            rows = list(iter_values(queryset, ["id", "organization_name"], chunk_size=2))
+
+        self.assertEqual([name for _, name in rows], ["Org 0", "Org 1", "Org 2"])
+
+    def test_command_writes_export(self):
+        stdout = io.StringIO()
+
+        call_command("export_inquiries", "--type", "contact", "--unresolved", stdout=stdout)
+
+        self.assertEqual([row["full_name"] for row in csv.DictReader(io.StringIO(stdout.getvalue()))], ["New"])
+
+
+class InquiryInboxTests(TestCase):
+    def create_mice(self, name):
+        return MICEInquiry.objects.create(
+            company_name="Acme", contact_person=name, email=f"{name.lower()}@example.com",
+            phone_number="0700", event_type="Retreat", attendees=40, event_details="Offsite",
+        )
+
+    def test_index_follows_saves_and_deletes(self):
+        inquiry = ContactInquiry.objects.create(
+            full_name="Ann", email="ann@example.com", subject="Safari", message="Hi"
+        )
+        mice = self.create_mice("Bo")
+
+        entry = InquiryIndex.objects.get(inquiry_type="contact", object_id=inquiry.pk)
+        self.assertEqual((entry.name, entry.status, entry.created_at), ("Ann", "open", inquiry.created_at))
+
+        inquiry.is_resolved = True
+        inquiry.save()
+        mice.delete()
+
+        self.assertEqual(InquiryIndex.objects.get(inquiry_type="contact").status, "resolved")
+        self.assertFalse(InquiryIndex.objects.filter(inquiry_type="mice").exists())
+
+    def test_rebuild_restores_rows_written_in_bulk(self):
+        ContactInquiry.objects.bulk_create(
+            [ContactInquiry(full_name=f"Guest {i}", email="g@example.com", subject="S", message="M") for i in range(3)]
+        )
+        self.create_mice("Bo")
+
+        self.assertEqual(rebuild_inquiry_index(batch_size=2), 4)
+        self.assertEqual(InquiryIndex.objects.count(), 4)
+
+    @override_settings(INBOX_PAGE_SIZE=2)
+    def test_inbox_pages_all_types_newest_first(self):
+        staff = get_user_model().objects.create_superuser("staff", "staff@example.com", "pw")
+        self.client.force_login(staff)
+        first = ContactInquiry.objects.create(full_name="Ann", email="ann@example.com", subject="S", message="M")
+        for name in ("Bo", "Cy"):
+            self.create_mice(name)
+        url = reverse("admin:users_inquiryindex_changelist")
+
+        # Session, user, and one query against the index for every inquiry type.
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual([entry.name for entry, _ in response.context["entries"]], ["Cy", "Bo"])
+        older = self.client.get(url, {"after": response.context["page"].next_cursor})
+        self.assertEqual(
+            older.context["entries"],
+            [(InquiryIndex.objects.get(object_id=first.pk, inquiry_type="contact"),
+              reverse("admin:users_contactinquiry_change", args=[first.pk]))],
+        )
+        contact_only = self.client.get(url, {"type": "contact", "status": "bogus"})
+        self.assertEqual(contact_only.context["filters"], {"type": "contact"})
+        self.assertEqual(len(contact_only.context["entries"]), 1)
@@ -1,19 +1,60 @@
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.shortcuts import redirect, render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils.http import content_disposition_header
 
-from .forms import ContactForm
-from .tasks import send_contact_emails
+from adminside.views import arender
 
+from .exports import EXPORT_FORMATS, export_filename, export_kinds, stream_export
+from .forms import ContactForm, InquiryExportForm
+from .models import INQUIRY_MODELS
+from .tasks import aqueue_contact_emails
 
-def contact_view(request):
+
+async def contact_view(request):
     if request.method == "POST":
         form = ContactForm(request.POST)
         if form.is_valid():
-            inquiry = form.save()
-            send_contact_emails(inquiry)
+            inquiry = await sync_to_async(form.save)()
+            await aqueue_contact_emails(inquiry)
             messages.success(request, "Thank you! We received your request.")
             return redirect("contact")
     else:
         form = ContactForm()
 
-    return render(request, "pages/contact.html", {"form": form})
+    return await arender(request, "pages/contact.html", {"form": form})
+
+
+async def aiter_chunks(chunks):
+    # Django would drain a sync iterator into a list before serving it over
+    # ASGI; pull one chunk at a time instead, on the thread holding the cursor.
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+@staff_member_required
+def export_inquiries(request):
+    form = InquiryExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text(), content_type="text/plain")
+
+    options = form.cleaned_data
+    for kind in export_kinds(options["type"]):
+        if not request.user.has_perm(f"users.view_{INQUIRY_MODELS[kind]._meta.model_name}"):
+            raise PermissionDenied
+
+    chunks = stream_export(
+        options["type"], options["format"], options["since"], options["until"], options["resolved"]
+    )
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[options["format"]])
+    response["Content-Disposition"] = content_disposition_header(
+        True, export_filename(options["type"], options["format"], options["since"], options["until"])
+    )
+    return response